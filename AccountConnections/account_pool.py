@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Multi-Account Scraping
+Spreads search page fetches across several authorized LinkedIn sessions,
+each with its own connection pool, adaptive pacer (rate budget) and health:
+
+1. Every page goes to the healthy session with the fewest fetches in flight
+2. A session whose fetches keep getting throttled (SCRAPER_ACCOUNT_DRAIN_AFTER
+   pages in a row), or that exhausts its retries, is drained: it takes no
+   pages for SCRAPER_ACCOUNT_DRAIN_SECONDS, and the page it failed is
+   retried on another session. So is a session LinkedIn answers with
+   another error status, and one whose empty page (the end of the
+   results) another session contradicts
+3. Results are merged by profile_url: each person is listed once, in the
+   order first seen, with the strongest connection any session has to them
+
+With N sessions up to N pages are fetched at once, so throughput scales
+with the number of accounts until LinkedIn (or the parser) is the limit.
+
+SCRAPER_EXTRA_ACCOUNTS_FILE names a JSON file holding a list of cookie
+dicts for extra authorized sessions. When it is set, build_scraper() (the
+ScraperPool default) spreads every user's searches over their own session
+plus these; the extra sessions' scrapers, and so their rate budgets, are
+shared by every user in the process. Degree, mutual connections and
+strength are relative to whoever is looking, so people on pages an extra
+session fetched carry none (as if 3rd+ with no mutual connections) and
+rank by the user's own view of them where there is one.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from parse_pool import ParsePool
+from rate_limit import CircuitOpenError, ThrottledError
+from ranking import TopKRanker
+from records import Employee
+from scraping import (
+    LinkedInCompanyConnectionScraper,
+    ProfileFetch,
+    cookie_fingerprint,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_BURST,
+)
+
+DEFAULT_WORKERS_PER_ACCOUNT = int(os.environ.get('SCRAPER_WORKERS_PER_ACCOUNT', '1'))
+DEFAULT_DRAIN_AFTER = int(os.environ.get('SCRAPER_ACCOUNT_DRAIN_AFTER', '2'))
+DEFAULT_DRAIN_SECONDS = float(os.environ.get('SCRAPER_ACCOUNT_DRAIN_SECONDS', '300'))
+DEFAULT_EXTRA_ACCOUNTS_FILE = os.environ.get('SCRAPER_EXTRA_ACCOUNTS_FILE', '')
+
+# Viewer-relative fields of a person seen by someone else's session
+UNKNOWN_CONNECTION = {
+    'mutual_connections': 0,
+    'connection_degree': '3rd+',
+    'connection_strength': 0,
+    'can_message': False,
+    'can_connect': False,
+}
+
+logger = logging.getLogger(__name__)
+
+
+class SessionAccount:
+    """One LinkedIn session in the pool and its health."""
+
+    def __init__(self, scraper: LinkedInCompanyConnectionScraper, fingerprint: str, shared: bool = False):
+        self.scraper = scraper
+        self.fingerprint = fingerprint
+        # Shared by every user's scraper, so its view of people is not the user's
+        self.shared = shared
+        self.in_flight = 0
+        self.pages = 0
+        self.failed_pages = 0
+        self.throttled_streak = 0
+        self.drains = 0
+        self.drained_until = 0.0
+        self.last_used = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.drained_until and not self.scraper.rate_limiter.stats()['circuit_open']
+
+    def to_status(self, now: float) -> Dict[str, Any]:
+        return dict(
+            self.scraper.rate_limiter.stats(),
+            session=self.fingerprint[:12],
+            healthy=self.healthy(now),
+            drained_for=round(max(0.0, self.drained_until - now), 1),
+            in_flight=self.in_flight,
+            pages=self.pages,
+            failed_pages=self.failed_pages,
+            drains=self.drains
+        )
+
+
+class MultiAccountScraper(LinkedInCompanyConnectionScraper):
+    """Company connection scraper over a pool of LinkedIn sessions.
+
+    Searches, streams and batch searches work as on the single-session
+    scraper; only page fetches are routed to the pool's sessions.
+    """
+
+    def __init__(self, cookie_sets: List[Dict[str, str]], workers_per_account: int = DEFAULT_WORKERS_PER_ACCOUNT,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST,
+                 parser_backend: Optional[str] = None, restricted_parsing: Optional[bool] = None,
+                 parse_pool: Optional[ParsePool] = None, stream_parsing: Optional[bool] = None,
+                 drain_after: int = DEFAULT_DRAIN_AFTER, drain_seconds: float = DEFAULT_DRAIN_SECONDS,
+                 shared_accounts: Optional[Dict[str, LinkedInCompanyConnectionScraper]] = None):
+        """Initialize with one cookie dict per LinkedIn session.
+
+        requests_per_second/burst is each session's starting budget;
+        workers_per_account pages may be in flight per session.
+        shared_accounts adds sessions whose scrapers (keyed by cookie
+        fingerprint) are also used by other MultiAccountScrapers.
+        """
+        # Sessions with the same cookies would share one account's budget
+        shared_accounts = dict(shared_accounts or {})
+        cookie_sets = {cookie_fingerprint(cookies): cookies for cookies in cookie_sets
+                       if cookies and cookie_fingerprint(cookies) not in shared_accounts}
+        if not cookie_sets and not shared_accounts:
+            raise ValueError('At least one set of LinkedIn cookies is required')
+
+        # The base scraper's own session carries no cookies: every page is fetched on an account
+        workers_per_account = max(1, int(workers_per_account))
+        super().__init__({}, workers_per_account * (len(cookie_sets) + len(shared_accounts)), requests_per_second,
+                         burst, parser_backend, restricted_parsing, parse_pool, stream_parsing)
+        self.drain_after = max(1, drain_after)
+        self.drain_seconds = drain_seconds
+        self.accounts = [
+            SessionAccount(LinkedInCompanyConnectionScraper(
+                cookies, workers_per_account, requests_per_second, burst, parser_backend, restricted_parsing,
+                self.parse_pool, stream_parsing
+            ), fingerprint)
+            for fingerprint, cookies in cookie_sets.items()
+        ] + [SessionAccount(scraper, fingerprint, shared=True) for fingerprint, scraper in shared_accounts.items()]
+        self._lock = threading.Lock()
+
+    def resolve_viewer(self) -> Optional[str]:
+        """The first session's member; each session's results reach the intro graph under its own member."""
+        return self.accounts[0].scraper.resolve_viewer()
+
+    def fetch_user_company(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> ProfileFetch:
+        """The first session's profile (see LinkedInCompanyConnectionScraper.fetch_user_company)."""
+        return self.accounts[0].scraper.fetch_user_company(etag, last_modified)
+
+    def account_stats(self) -> List[Dict[str, Any]]:
+        """Health, pacing and page counts per session."""
+        now = time.monotonic()
+        with self._lock:
+            return [account.to_status(now) for account in self.accounts]
+
+    def _new_ranker(self, limit: int, top_k: Optional[int], stop_after_weak_pages: Optional[int],
+                    stop_after_stable_pages: Optional[int]) -> TopKRanker:
+        """Ranker that merges the sessions' views of each person by profile_url."""
+        return TopKRanker(top_k or limit, limit, stop_after_weak_pages, stop_after_stable_pages,
+                          dedupe_by='profile_url')
+
+    def _fetch_search_page(self, company_name: str, page: int) -> List[Dict[str, Any]]:
+        """Fetch and parse one page on a healthy session, moving to another if it is throttled out or
+        refused, and confirming an empty page on a second session when there is one."""
+        tried = set()
+        error = None
+        empty_on = None
+        while True:
+            account = self._checkout(tried)
+            if account is None:
+                if empty_on is not None:
+                    return []
+                raise ThrottledError(f'Search page {page}: every LinkedIn session is drained'
+                                     + (f' (last error: {error})' if error else ''))
+            tried.add(account)
+
+            throttled_before = account.scraper.rate_limiter.throttled
+            try:
+                employees = account.scraper._fetch_search_page(company_name, page)
+            except (ThrottledError, CircuitOpenError) as e:
+                error = e
+                self._checkin(account, throttled=True, failed=True)
+                continue
+            except Exception:
+                self._checkin(account, throttled=False, failed=True)
+                raise
+
+            if employees is None:
+                # Signed out, restricted or otherwise refused: no use for this or the next pages
+                error = f'session {account.fingerprint[:12]} got an error status'
+                self._checkin(account, throttled=True, failed=True)
+                continue
+
+            self._checkin(account, throttled=account.scraper.rate_limiter.throttled > throttled_before)
+            if not employees and empty_on is None:
+                # A session LinkedIn has signed out also gets empty pages
+                empty_on = account
+                continue
+            if employees and empty_on is not None:
+                with self._lock:
+                    self._drain(empty_on, time.monotonic())
+            if account.shared:
+                return [Employee.from_dict(dict(employee, **UNKNOWN_CONNECTION)) for employee in employees]
+            return employees
+
+    def _checkout(self, exclude: set) -> Optional[SessionAccount]:
+        """Reserve the least busy healthy session not in `exclude`."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [account for account in self.accounts if account not in exclude and account.healthy(now)]
+            if not candidates:
+                return None
+            account = min(candidates, key=lambda candidate: (candidate.in_flight, candidate.last_used))
+            account.in_flight += 1
+            account.last_used = now
+            return account
+
+    def _checkin(self, account: SessionAccount, throttled: bool, failed: bool = False) -> None:
+        """Release a session after a fetch, draining it if it keeps getting throttled."""
+        with self._lock:
+            account.in_flight -= 1
+            account.pages += 1
+            account.failed_pages += failed
+            account.throttled_streak = account.throttled_streak + 1 if throttled else 0
+
+            if account.throttled_streak >= self.drain_after or (failed and throttled):
+                self._drain(account, time.monotonic())
+
+    def _drain(self, account: SessionAccount, now: float) -> None:
+        """Take a session out of rotation for drain_seconds (called with the lock held)."""
+        if not account.healthy(now):
+            return
+        account.drained_until = now + self.drain_seconds
+        account.throttled_streak = 0
+        account.drains += 1
+        logger.warning("Draining LinkedIn session %s for %.0fs", account.fingerprint[:12], self.drain_seconds)
+
+
+_extra_accounts = None
+_extra_accounts_lock = threading.Lock()
+
+
+def get_extra_accounts(path: str = DEFAULT_EXTRA_ACCOUNTS_FILE) -> Dict[str, LinkedInCompanyConnectionScraper]:
+    """Process-wide scrapers for the sessions in SCRAPER_EXTRA_ACCOUNTS_FILE, keyed by cookie fingerprint."""
+    global _extra_accounts
+    if _extra_accounts is None:
+        with _extra_accounts_lock:
+            if _extra_accounts is None:
+                cookie_sets = []
+                if path:
+                    with open(path) as f:
+                        cookie_sets = json.load(f)
+                _extra_accounts = {
+                    cookie_fingerprint(cookies): LinkedInCompanyConnectionScraper(cookies, DEFAULT_WORKERS_PER_ACCOUNT)
+                    for cookies in cookie_sets if cookies
+                }
+    return _extra_accounts
+
+
+def build_scraper(cookies: Dict[str, str]) -> LinkedInCompanyConnectionScraper:
+    """ScraperPool factory: a scraper over this user's session and any extra accounts."""
+    extra_accounts = get_extra_accounts()
+    if not extra_accounts or not cookies:
+        return LinkedInCompanyConnectionScraper(cookies)
+    return MultiAccountScraper([cookies], shared_accounts=extra_accounts)
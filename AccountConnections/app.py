@@ -6,11 +6,25 @@ Handles LinkedIn OAuth and triggers company connection scraping
 
 from flask import Flask, render_template, request, redirect, session, jsonify
 import requests
-from scraping import LinkedInCompanyConnectionScraper
+from result_cache import ResultCache
+from profile_cache import ProfileCache
+from intro_graph import get_intro_graph
+from scraper_pool import ScraperPool
+from contextlib import nullcontext
+import metrics
+import profiling
+import records
 import os
 
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
+app.json = records.FastJSONProvider(app)
+app.secret_key = os.environ.get('FLASK_SECRET_KEY') or os.urandom(24)
+metrics.instrument_flask(app, 'app')
+profiling.instrument_flask(app, 'app')
+
+result_cache = ResultCache()
+profile_cache = ProfileCache()
+scraper_pool = ScraperPool()
 
 @app.route('/')
 def home():
@@ -43,11 +57,11 @@ def dashboard():
     if 'linkedin_cookies' not in session:
         return redirect('/')
     
-    # Initialize scraper with user's LinkedIn cookies
-    scraper = LinkedInCompanyConnectionScraper(session['linkedin_cookies'])
+    # Reuse the scraper (and open connections) for user's LinkedIn cookies
+    scraper = scraper_pool.get(session['linkedin_cookies'])
     
-    # Get user's company
-    user_company = scraper.get_user_company()
+    # Get user's company (cached per session, refreshed in the background when stale)
+    user_company, _ = profile_cache.get_company(session['linkedin_cookies'], scraper)
     
     return render_template('dashboard.html', 
                          user_company=user_company,
@@ -61,26 +75,64 @@ def search_company():
     
     company_name = request.json.get('company_name')
     limit = request.json.get('limit', 50)
+    cookies = session['linkedin_cookies']
     
-    # Initialize scraper
-    scraper = LinkedInCompanyConnectionScraper(session['linkedin_cookies'])
+    # Reuse the scraper (and open connections) for user's LinkedIn cookies
+    scraper = scraper_pool.get(cookies)
     
-    # Search for employees
-    results = scraper.search_company_employees(company_name, limit)
+    # Search for employees (or serve a recent result for this session)
+    with (metrics.request_timings() if request.json.get('debug') else nullcontext()) as timings:
+        results, cache_status = result_cache.get_or_search(
+            cookies, company_name, limit,
+            lambda: scraper.search_company_employees(company_name, limit),
+            request.json.get('cache_control')
+        )
     
     # Generate UI mockup for both states
     logged_out_ui = scraper.generate_ui_mockup(results, user_logged_in=False)
     logged_in_ui = scraper.generate_ui_mockup(results, user_logged_in=True)
     
-    return jsonify({
+    response = {
         'results': results,
         'logged_out_ui': logged_out_ui,
-        'logged_in_ui': logged_in_ui
+        'logged_in_ui': logged_in_ui,
+        'cache': dict(result_cache.stats(), status=cache_status)
+    }
+    if timings is not None:
+        response['timings'] = timings.to_dict()
+    return jsonify(response)
+
+@app.route('/intro-paths', methods=['POST'])
+def intro_paths():
+    """Who on the user's team can introduce them to people at a company."""
+    if 'linkedin_cookies' not in session:
+        return jsonify({'error': 'Not authenticated'})
+    
+    data = request.get_json(silent=True)
+    company_name = data.get('company_name') if isinstance(data, dict) else None
+    if not company_name:
+        return jsonify({'error': 'company_name is required'}), 400
+    try:
+        limit = int(data.get('limit', 20))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid limit: {e}'}), 400
+    
+    viewer = scraper_pool.get(session['linkedin_cookies']).resolve_viewer()
+    if viewer is None:
+        return jsonify({'error': 'Could not identify your LinkedIn profile'})
+    
+    paths = get_intro_graph().intro_paths(viewer, company_name, limit)
+    return jsonify({
+        'company': company_name,
+        'total_found': len(paths),
+        'paths': paths
     })
 
 @app.route('/logout')
 def logout():
     """Logout and clear session."""
+    if 'linkedin_cookies' in session:
+        profile_cache.discard(session['linkedin_cookies'])
     session.clear()
     return redirect('/')
 
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Async LinkedIn Company Connection Scraper
+
+asyncio counterpart of scraping.LinkedInCompanyConnectionScraper:
+1. Same public methods, awaited instead of blocking a worker
+2. One aiohttp connection pool shared by every scraper on the event loop
+3. Token-bucket pacing that yields to the loop instead of sleeping
+4. Parsing runs in a thread so the loop keeps serving other scrapes
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from collections import deque
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+import aiohttp
+
+import metrics
+from rate_limit import AsyncAdaptivePacer, CircuitOpenError, ThrottledError
+from parse_pool import ParsePool, get_shared_parse_pool
+from intro_graph import get_intro_graph
+from scraping import (
+    LinkedInResultParser,
+    profile_id,
+    SEARCH_URL,
+    PROFILE_URL,
+    DEFAULT_HEADERS,
+    MAX_SEARCH_PAGES,
+    RESULTS_PER_PAGE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_BURST,
+    DEFAULT_MAX_RETRIES,
+    VIEWER_RETRY_SECONDS,
+    build_pacer,
+)
+
+CONNECTION_LIMIT = int(os.environ.get('ASYNC_SCRAPER_CONNECTION_LIMIT', '100'))
+
+# One connector per running event loop; aiohttp connectors are loop-bound
+_shared_connectors = weakref.WeakKeyDictionary()
+
+
+def get_shared_connector() -> aiohttp.TCPConnector:
+    """Return the connection pool shared by all scrapers on the running loop."""
+    loop = asyncio.get_running_loop()
+    connector = _shared_connectors.get(loop)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT, limit_per_host=CONNECTION_LIMIT)
+        _shared_connectors[loop] = connector
+    return connector
+
+
+async def close_shared_connector() -> None:
+    """Close the running loop's shared connection pool (call on shutdown)."""
+    connector = _shared_connectors.pop(asyncio.get_running_loop(), None)
+    if connector is not None:
+        await connector.close()
+
+
+class AsyncLinkedInCompanyConnectionScraper(LinkedInResultParser):
+    """Scrape LinkedIn for company connections without blocking the event loop."""
+
+    def __init__(self, session_cookies: Dict[str, str], max_workers: int = DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST,
+                 connector: Optional[aiohttp.BaseConnector] = None,
+                 parser_backend: Optional[str] = None, restricted_parsing: Optional[bool] = None,
+                 parse_pool: Optional[ParsePool] = None):
+        """Initialize with LinkedIn session cookies after auth.
+
+        The HTTP session is created lazily on first use so the scraper can be
+        built outside a running loop. Pass connector to use a private pool.
+        """
+        self._configure_parser(parser_backend, restricted_parsing)
+        self.parse_pool = parse_pool or get_shared_parse_pool()
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = build_pacer(requests_per_second, burst, AsyncAdaptivePacer)
+        self.max_retries = DEFAULT_MAX_RETRIES
+        self._cookies = dict(session_cookies)
+        # The member's public profile id, for the intro graph (see LinkedInCompanyConnectionScraper)
+        self.viewer = None
+        self._viewer_checked_at = None
+        self._viewer_lock = asyncio.Lock()
+        self._connector = connector
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """HTTP session carrying this user's cookies over the shared pool."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=self._connector or get_shared_connector(),
+                connector_owner=False,
+                headers=DEFAULT_HEADERS,
+                cookies=self._cookies
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Release the HTTP session; the shared pool stays open."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'AsyncLinkedInCompanyConnectionScraper':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def get_user_company(self) -> str:
+        """Extract the logged-in user's current company."""
+        try:
+            started = time.perf_counter()
+            async with self.session.get(PROFILE_URL) as response:
+                response.raise_for_status()
+                html = await response.text()
+            self.viewer = self.viewer or profile_id(response.url)
+            metrics.observe_fetch(response.status, len(html), time.perf_counter() - started)
+
+            return await asyncio.to_thread(self._parse_user_company, html)
+
+        except Exception:
+            return 'Unknown Company'
+
+    async def resolve_viewer(self) -> Optional[str]:
+        """The public profile id of the member these cookies belong to (see the blocking scraper)."""
+        if self.viewer is not None or not self._cookies:
+            return self.viewer
+        async with self._viewer_lock:
+            checked_at = self._viewer_checked_at
+            if self.viewer is None and (checked_at is None or time.monotonic() - checked_at >= VIEWER_RETRY_SECONDS):
+                self._viewer_checked_at = time.monotonic()
+                try:
+                    metrics.observe_sleep(await self.rate_limiter.acquire())
+                    started = time.perf_counter()
+                    async with self.session.get(PROFILE_URL, allow_redirects=False) as response:
+                        body = await response.read()
+                    metrics.observe_fetch(response.status, len(body), time.perf_counter() - started)
+                    self.rate_limiter.record_response(response.status, response.headers.get('Retry-After'))
+                    if response.status in (301, 302, 303, 307, 308) and 'Location' in response.headers:
+                        self.viewer = profile_id(response.headers['Location'])
+                except (aiohttp.ClientError, CircuitOpenError):
+                    pass
+        return self.viewer
+
+    async def search_company_employees(self, company_name: str, limit: int = 150, top_k: Optional[int] = None,
+                                       stop_after_weak_pages: Optional[int] = None,
+                                       stop_after_stable_pages: Optional[int] = None) -> Dict[str, Any]:
+        """Search for employees at a company with mutual connections (see the blocking scraper)."""
+        try:
+            ranker = self._new_ranker(limit, top_k, stop_after_weak_pages, stop_after_stable_pages)
+            outcome = {}
+            pages = self._iter_search_pages(company_name, limit, outcome)
+            try:
+                async for employees in pages:
+                    with metrics.stage_timer('rank'):
+                        ranker.add_page(employees)
+                    if ranker.stop_reason:
+                        break
+            finally:
+                await pages.aclose()
+
+            # Ranking and company-index learning (an SQLite write) run off the event loop
+            return await asyncio.to_thread(self._build_paged_response, company_name, ranker, outcome)
+
+        except Exception as e:
+            return self._build_error_response(company_name, e)
+
+    async def _iter_search_pages(self, company_name: str, limit: int,
+                                 outcome: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield parsed result pages in order, stopping at the first empty or failed page (see the
+        blocking scraper for `outcome`)."""
+        if outcome is None:
+            outcome = {}
+        outcome.update(exhausted=False, failed_page=None)
+        pending = deque()
+        next_page = 0
+        collected = 0
+
+        try:
+            while collected < limit:
+                while (len(pending) < self.max_workers and next_page < MAX_SEARCH_PAGES
+                       and collected + len(pending) * RESULTS_PER_PAGE < limit):
+                    pending.append(asyncio.ensure_future(self._fetch_search_page(company_name, next_page)))
+                    next_page += 1
+
+                if not pending:
+                    outcome['exhausted'] = True
+                    return
+
+                page = next_page - len(pending)
+                try:
+                    employees = await pending.popleft()
+                except (ThrottledError, CircuitOpenError) as e:
+                    self._record_page_end(outcome, page, None, e)
+                    return
+                if not employees:
+                    self._record_page_end(outcome, page, employees)
+                    return
+                collected += len(employees)
+                yield employees
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_search_page(self, company_name: str, page: int) -> Optional[List[Dict[str, Any]]]:
+        """Fetch and parse one page of search results; None on a non-200 status other than throttling.
+
+        Throttled (429/999), 5xx and failed requests are retried with jitter
+        up to max_retries times, then raise ThrottledError.
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = self.rate_limiter.retry_delay(attempt - 1)
+                metrics.observe_sleep(delay)
+                await asyncio.sleep(delay)
+
+            metrics.observe_sleep(await self.rate_limiter.acquire())
+            started = time.perf_counter()
+            try:
+                async with self.session.get(SEARCH_URL, params=self._search_params(company_name, page)) as response:
+                    body = await response.read()
+            except aiohttp.ClientError as e:
+                self.rate_limiter.record_failure()
+                outcome = str(e) or type(e).__name__
+                continue
+            metrics.observe_fetch(response.status, len(body), time.perf_counter() - started)
+
+            if not self.rate_limiter.record_response(response.status, response.headers.get('Retry-After')):
+                break
+            outcome = f'status {response.status}'
+        else:
+            raise ThrottledError(f'Search page {page} failed after {self.max_retries} retries ({outcome})')
+
+        if response.status != 200:
+            return None
+        html = body.decode(response.get_encoding(), errors='replace')
+
+        employees = await asyncio.to_thread(self._parse_page, html)
+        viewer = await self.resolve_viewer()
+        if viewer:
+            # The graph's lock would block the event loop
+            await asyncio.to_thread(get_intro_graph().observe, viewer, company_name, employees)
+        return employees
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Multi-Account Scaling Benchmark
+Pages per second for searches of `--companies` companies, each spread
+over 1..`--accounts` LinkedIn sessions (account_pool.MultiAccountScraper),
+against the mock LinkedIn server throttling each session above
+`--session-rps`, like LinkedIn's per-account limits. Reports throughput, speedup over one
+session and how close it is to linear.
+
+Before timing, a multi-session search is checked to return the same
+people, in the same order, as a single-session search, and a session that
+is being throttled is checked to be drained while the search completes
+on the others.
+
+Usage:
+    python benchmarks/bench_accounts.py
+    python benchmarks/bench_accounts.py --accounts 8 --session-rps 4 --companies 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_linkedin import MockLinkedInServer
+
+
+def cookie_sets(count):
+    return [{'li_at': f'bench-session-{i}', 'JSESSIONID': f'ajax:{i}'} for i in range(count)]
+
+
+def check_parity(scraper_class, multi_class, limit):
+    single = scraper_class(cookie_sets(1)[0], requests_per_second=1000, burst=1000)
+    multi = multi_class(cookie_sets(3), requests_per_second=1000, burst=1000)
+    expected = single.search_company_employees('AllCode', limit=limit)['employees']
+    found = multi.search_company_employees('AllCode', limit=limit)['employees']
+    if [e['profile_url'] for e in found] != [e['profile_url'] for e in expected] or found != expected:
+        sys.exit('Parity failure: multi-session search differs from single-session search')
+
+
+def check_drain(multi_class, server, limit):
+    """With one session over its limit, it is drained and the search still completes on the others."""
+    multi = multi_class(cookie_sets(3), requests_per_second=1000, burst=1000, drain_after=1)
+    server.max_rps = 1
+    server.throttled_sessions = {cookie_sets(1)[0]['li_at']}
+    try:
+        result = multi.search_company_employees('AllCode', limit=limit)
+    finally:
+        server.max_rps = None
+        server.throttled_sessions = None
+    drained = sum(account['drains'] for account in multi.account_stats())
+    if not drained or len(result['employees']) != limit:
+        sys.exit(f"Drain failure: {drained} drains, {len(result['employees'])} of {limit} employees")
+    return drained
+
+
+def measure(multi_class, accounts, session_rps, companies):
+    """Pages per second searching every company over `accounts` sessions."""
+    scraper = multi_class(cookie_sets(accounts), requests_per_second=session_rps, burst=1, drain_seconds=0)
+    found = 0
+    started = time.perf_counter()
+    for company in companies:
+        found += len(scraper.search_company_employees(company)['employees'])
+    elapsed = time.perf_counter() - started
+    fetched = sum(account['pages'] for account in scraper.account_stats())
+    return fetched / elapsed, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=4)
+    parser.add_argument('--session-rps', type=float, default=5, help='per-session rate the mock allows')
+    parser.add_argument('--companies', type=int, default=3)
+    parser.add_argument('--items-per-page', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    server = MockLinkedInServer(latency=args.latency, results_per_page=args.items_per_page, padding_kb=20).start()
+    companies = [f'Company {i}' for i in range(args.companies)]
+    try:
+        # scraping reads LINKEDIN_BASE_URL at import
+        os.environ['LINKEDIN_BASE_URL'] = server.url
+        from scraping import LinkedInCompanyConnectionScraper
+        from account_pool import MultiAccountScraper
+
+        check_parity(LinkedInCompanyConnectionScraper, MultiAccountScraper, 5 * args.items_per_page)
+        drained = check_drain(MultiAccountScraper, server, 8 * args.items_per_page)
+
+        server.max_rps = args.session_rps
+        report = []
+        for accounts in range(1, args.accounts + 1):
+            rate, found = measure(MultiAccountScraper, accounts, args.session_rps, companies)
+            report.append({'accounts': accounts, 'pages_per_s': round(rate, 2), 'employees': found})
+    finally:
+        server.stop()
+
+    print(f"{args.companies} companies at {args.session_rps:g} req/s per session "
+          f"(parity OK, {drained} drains in drain check)")
+    base = report[0]['pages_per_s']
+    for row in report:
+        speedup = row['pages_per_s'] / base
+        row['speedup'] = round(speedup, 2)
+        print(f"{row['accounts']:2d} accounts  {row['pages_per_s']:7.2f} pages/s  {speedup:5.2f}x  "
+              f"({speedup / row['accounts']:.0%} of linear)  {row['employees']} employees")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'accounts', 'session_rps': args.session_rps, 'companies': args.companies,
+                       'results': report}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
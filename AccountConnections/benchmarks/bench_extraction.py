@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Extraction Micro-Benchmark
+Per-item cost of _extract_employee_data: the previous select_one()-based
+extractor versus the single-pass tree walk.
+
+Usage:
+    python benchmarks/bench_extraction.py
+    python benchmarks/bench_extraction.py --pages 'saved/*.html' --repeat 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import fixtures
+from scraping import LinkedInCompanyConnectionScraper, MUTUAL_CONNECTIONS_RE
+
+
+def selector_extract(scraper, item_soup):
+    """The select_one()-based extractor this benchmark measures against."""
+    name_elem = item_soup.select_one('.entity-result__title-text a span[aria-hidden="true"]')
+    name = name_elem.get_text().strip() if name_elem else "Unknown"
+
+    profile_link = item_soup.select_one('.entity-result__title-text a')
+    profile_url = profile_link.get('href') if profile_link else None
+
+    subtitle_elem = item_soup.select_one('.entity-result__primary-subtitle')
+    title_company = subtitle_elem.get_text().strip() if subtitle_elem else ""
+
+    location_elem = item_soup.select_one('.entity-result__secondary-subtitle')
+    location = location_elem.get_text().strip() if location_elem else ""
+
+    mutual_connections = 0
+    mutual_elem = item_soup.select_one('.entity-result__insight')
+    if mutual_elem:
+        match = MUTUAL_CONNECTIONS_RE.search(mutual_elem.get_text().strip())
+        if match:
+            mutual_connections = int(match.group(1))
+
+    connection_degree = '3rd+'
+    degree_elem = item_soup.select_one('.dist-value')
+    if degree_elem:
+        connection_degree = degree_elem.get_text().strip()
+    else:
+        badge_elem = item_soup.select_one('.entity-result__badge-text')
+        if badge_elem:
+            text = badge_elem.get_text().strip()
+            if any(deg in text for deg in ['1st', '2nd', '3rd']):
+                connection_degree = text
+
+    return {
+        'name': name,
+        'title_company': title_company,
+        'location': location,
+        'profile_url': profile_url,
+        'mutual_connections': mutual_connections,
+        'connection_degree': connection_degree,
+        'connection_strength': scraper._calculate_strength(mutual_connections, connection_degree),
+        'can_message': connection_degree in ['1st', '2nd'],
+        'can_connect': connection_degree in ['2nd', '3rd']
+    }
+
+
+def time_per_item(extract, items, repeat):
+    """Best-of-`repeat` microseconds per item."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            extract(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', help='glob of saved search-result pages (default: synthetic fixtures)')
+    parser.add_argument('--synthetic-pages', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = fixtures.load_saved_pages(args.pages)
+    else:
+        pages = [fixtures.search_page_html(start=i * 10, seed=7) for i in range(args.synthetic_pages)]
+
+    items = []
+    for html in pages:
+        soup = BeautifulSoup(html, 'html.parser')
+        items.extend(soup.find_all('li', class_='reusable-search__result-container'))
+    if not items:
+        sys.exit('No result items found in the given pages')
+
+    scraper = LinkedInCompanyConnectionScraper({})
+
+    mismatches = sum(
+        1 for item in items if selector_extract(scraper, item) != scraper._extract_employee_data(item)
+    )
+    if mismatches:
+        sys.exit(f'Parity failure: {mismatches}/{len(items)} items differ')
+
+    before = time_per_item(lambda item: selector_extract(scraper, item), items, args.repeat)
+    after = time_per_item(scraper._extract_employee_data, items, args.repeat)
+
+    results = {
+        'benchmark': 'extraction',
+        'pages': len(pages),
+        'items': len(items),
+        'selector_us_per_item': round(before, 2),
+        'single_pass_us_per_item': round(after, 2),
+        'speedup': round(before / after, 2)
+    }
+
+    print(f"Items: {len(items)} from {len(pages)} pages (parity OK)")
+    print(f"select_one extractor:  {before:8.1f} µs/item")
+    print(f"single-pass extractor: {after:8.1f} µs/item")
+    print(f"speedup:               {before / after:8.2f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Intro Graph Benchmark
+Builds an intro_graph.IntroGraph from synthetic search results (`--sessions`
+viewers in teams of `--team-size`, each searching `--companies` companies of
+`--people` people) and reports:
+
+- ingest: result pages observed per second
+- query: intro_paths() latency on a warm index (cached ranking) and right
+  after the company changed (re-ranked from the adjacency index)
+- snapshot: size, write time and load time
+
+Before timing, intro_paths() is checked against a brute-force ranking
+over the edges of each viewer's team, including after a snapshot round trip,
+and the cached rankings are checked to stay within --cached-queries.
+
+Usage:
+    python benchmarks/bench_intro_graph.py
+    python benchmarks/bench_intro_graph.py --sessions 50 --companies 200 --people 300
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_index import get_company_index
+from intro_graph import IntroGraph
+from records import Employee, connection_strength
+
+DEGREES = ('1st', '2nd', '2nd', '3rd', '3rd', '3rd')
+
+
+def search_pages(sessions, companies, people, seed):
+    """(viewer, company, page of employees) as the scrapers would observe them."""
+    rng = random.Random(seed)
+    pages = []
+    for company in range(companies):
+        for viewer in range(sessions):
+            employees = []
+            for person in rng.sample(range(people), k=max(1, people // 2)):
+                degree = rng.choice(DEGREES)
+                mutual = rng.randint(0, 30) if degree != '1st' else rng.randint(0, 60)
+                employees.append(Employee(
+                    f'Person {company}-{person}', f'Engineer at Company {company}', 'Austin, TX',
+                    f'https://www.linkedin.com/in/c{company}-p{person}/', mutual, degree,
+                    connection_strength(mutual, degree), degree in ('1st', '2nd'), degree != '1st'))
+            for start in range(0, len(employees), 10):
+                pages.append((f'session-{viewer}', f'Company {company}', employees[start:start + 10]))
+    rng.shuffle(pages)
+    return pages
+
+
+def teams_of(sessions, team_size):
+    """Viewers grouped into consecutive teams."""
+    return [[f'session-{viewer}' for viewer in range(start, min(start + team_size, sessions))]
+            for start in range(0, sessions, team_size)]
+
+
+def brute_force(pages, teams, viewer, company):
+    """Reference ranking: every person the viewer's team saw at the company and the viewer's best path."""
+    team = next((team for team in teams if viewer in team), [viewer])
+    edges = {}
+    for page_viewer, page_company, employees in pages:
+        if page_company != company or page_viewer not in team:
+            continue
+        for employee in employees:
+            edges.setdefault(employee['profile_url'], {})[page_viewer] = employee
+
+    ranked = []
+    for url, by_viewer in edges.items():
+        own = by_viewer.get(viewer)
+        introducers = [e['connection_strength'] for v, e in by_viewer.items()
+                       if v != viewer and e['connection_degree'] == '1st']
+        if own is not None and own['connection_degree'] == '1st':
+            score, introducer = own['connection_strength'], None
+        elif introducers:
+            score = connection_strength((own['mutual_connections'] if own else 0) + 1, '2nd')
+            introducer = max(introducers)
+        elif own is not None:
+            score, introducer = own['connection_strength'], None
+        else:
+            continue
+        ranked.append((-score, -(introducer or 0), url))
+    return [url for _, _, url in sorted(ranked)]
+
+
+def check_parity(graph, pages, teams, sessions, companies):
+    for viewer in range(min(sessions, 5)):
+        for company in range(min(companies, 5)):
+            expected = brute_force(pages, teams, f'session-{viewer}', f'Company {company}')
+            found = [path['profile_url'] for path in graph.intro_paths(f'session-{viewer}', f'Company {company}',
+                                                                        limit=len(expected) + 1)]
+            if found != expected:
+                sys.exit(f'Parity failure: session-{viewer} / Company {company} ranking differs')
+
+
+def query_us(graph, queries, changed_company=None):
+    """Median and p99 microseconds per intro_paths() call."""
+    samples = []
+    for viewer, company in queries:
+        if changed_company is not None:
+            changed_company(company)
+        started = time.perf_counter()
+        graph.intro_paths(viewer, company)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--companies', type=int, default=100)
+    parser.add_argument('--people', type=int, default=150)
+    parser.add_argument('--team-size', type=int, default=8)
+    parser.add_argument('--cached-queries', type=int, default=1024)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    pages = search_pages(args.sessions, args.companies, args.people, args.seed)
+    teams = teams_of(args.sessions, args.team_size)
+    rng = random.Random(args.seed)
+    queries = [(f'session-{rng.randrange(args.sessions)}', f'Company {rng.randrange(args.companies)}')
+               for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'intro_graph.json')
+        graph = IntroGraph(path, snapshot_seconds=float('inf'), teams=teams, max_cached_queries=args.cached_queries)
+        started = time.perf_counter()
+        for viewer, company, employees in pages:
+            graph.observe(viewer, company, employees)
+        ingest_s = time.perf_counter() - started
+
+        check_parity(graph, pages, teams, args.sessions, args.companies)
+
+        started = time.perf_counter()
+        graph.snapshot()
+        write_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        loaded = IntroGraph(path, teams=teams)
+        load_ms = (time.perf_counter() - started) * 1000
+        check_parity(loaded, pages, teams, args.sessions, args.companies)
+        snapshot_kb = os.path.getsize(path) / 1024
+
+        # Mark the company changed before each query so it is re-ranked
+        def changed_company(company):
+            graph._versions[get_company_index().canonical_key(company)] += 1
+
+        query_us(graph, queries)
+        warm_p50, warm_p99 = query_us(graph, queries)
+        cold_p50, cold_p99 = query_us(graph, queries, changed_company)
+        stats = graph.stats()
+        if stats['cached_rankings'] > args.cached_queries:
+            sys.exit(f"Cache failure: {stats['cached_rankings']} rankings kept, limit {args.cached_queries}")
+
+    print(f"{stats['people']} people, {stats['edges']} edges, {stats['companies']} companies, "
+          f"{stats['viewers']} viewers in {len(teams)} teams (parity OK)")
+    print(f"ingest    {len(pages) / ingest_s:10.0f} pages/s")
+    print(f"query     warm p50 {warm_p50:8.1f} µs  p99 {warm_p99:8.1f} µs")
+    print(f"          re-rank p50 {cold_p50:5.1f} µs  p99 {cold_p99:8.1f} µs")
+    print(f"snapshot  {snapshot_kb:8.0f} KB  write {write_ms:7.1f} ms  load {load_ms:7.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'intro_graph', 'stats': stats, 'ingest_pages_per_s': round(len(pages) / ingest_s),
+                       'warm_p50_us': round(warm_p50, 1), 'warm_p99_us': round(warm_p99, 1),
+                       'rerank_p50_us': round(cold_p50, 1), 'rerank_p99_us': round(cold_p99, 1),
+                       'snapshot_kb': round(snapshot_kb), 'write_ms': round(write_ms, 1),
+                       'load_ms': round(load_ms, 1)}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Parse Pool Scaling Benchmark
+Pages/sec when many concurrent scrapes parse search pages: in-process
+(threads contend for the GIL) versus parse_pool.ParsePool with 1..N worker
+processes. Each configuration parses the same pages from `--concurrency`
+threads, as concurrent requests in one gunicorn worker would.
+
+Before timing, pool output is checked for parity with in-process parsing.
+
+Usage:
+    python benchmarks/bench_parse_pool.py
+    python benchmarks/bench_parse_pool.py --pages 200 --items-per-page 50 --processes 1,2,4,8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixtures
+from parse_pool import ParsePool
+from scraping import LinkedInResultParser
+
+
+def pages_per_sec(parse, pages, concurrency):
+    """Throughput of parsing every page from `concurrency` threads."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(parse, pages))
+    return len(pages) / (time.perf_counter() - started)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_processes = sorted({1, 2, max(1, cpus // 2), cpus})
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=64)
+    parser.add_argument('--items-per-page', type=int, default=10)
+    parser.add_argument('--padding-kb', type=int, default=300)
+    parser.add_argument('--processes', default=','.join(map(str, default_processes)),
+                        help='comma-separated pool sizes to measure')
+    parser.add_argument('--concurrency', type=int, default=max(4, cpus * 2), help='threads submitting pages')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    pages = [fixtures.search_page_html(args.items_per_page, start=i * args.items_per_page, seed=11,
+                                       padding_kb=args.padding_kb) for i in range(args.pages)]
+    scraper = LinkedInResultParser()
+
+    with_pool = ParsePool(1)
+    try:
+        if [with_pool.parse_search_results(scraper, html) for html in pages[:5]] != \
+                [scraper._parse_search_results(html) for html in pages[:5]]:
+            sys.exit('Parity failure: pool and in-process parsing differ')
+    finally:
+        with_pool.shutdown()
+
+    print(f"{len(pages)} pages x {args.items_per_page} items, {args.concurrency} threads, {cpus} CPUs (parity OK)")
+
+    baseline = pages_per_sec(scraper._parse_search_results, pages, args.concurrency)
+    results = [{'processes': 0, 'pages_per_sec': round(baseline, 2), 'speedup': 1.0}]
+    print(f"{'in-process':<14} {baseline:8.2f} pages/s")
+
+    for processes in [int(value) for value in args.processes.split(',') if value.strip()]:
+        pool = ParsePool(processes)
+        try:
+            # Start the workers outside the timed run
+            pages_per_sec(lambda html: pool.parse_search_results(scraper, html), pages[:processes * 2], processes * 2)
+            rate = pages_per_sec(lambda html: pool.parse_search_results(scraper, html), pages, args.concurrency)
+        finally:
+            pool.shutdown()
+
+        results.append({
+            'processes': processes,
+            'pages_per_sec': round(rate, 2),
+            'speedup': round(rate / baseline, 2),
+            'fallbacks': pool.fallbacks
+        })
+        print(f"{processes:>2} processes   {rate:8.2f} pages/s  {rate / baseline:5.2f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'parse_pool', 'pages': len(pages), 'cpus': cpus,
+                       'concurrency': args.concurrency, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Parser Backend Benchmark
+Parse time and peak Python heap per page for every parser backend, with
+and without restricted (SoupStrainer) parsing.
+
+Before timing, every configuration is checked for parity: the records
+extracted from each fixture page must equal those from a full html.parser
+tree, for search pages and profile pages.
+
+Usage:
+    python benchmarks/bench_parsing.py
+    python benchmarks/bench_parsing.py --pages 'saved/*.html' --json parsing.json
+
+tracemalloc only sees Python allocations, so the selectolax figure leaves
+out lexbor's C-side tree (freed as soon as the fragments are extracted).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixtures
+from html_parsing import PARSER_BACKENDS, resolve_backend
+from scraping import LinkedInCompanyConnectionScraper
+
+CONFIGURATIONS = [(backend, restricted) for backend in PARSER_BACKENDS for restricted in (False, True)
+                  if not (backend == 'selectolax' and restricted)]
+
+
+def check_parity(search_pages, profile_pages):
+    """Exit unless every configuration extracts the same records as the baseline."""
+    baseline = LinkedInCompanyConnectionScraper({}, parser_backend='html.parser', restricted_parsing=False)
+    expected_search = [baseline._parse_search_results(html) for html in search_pages]
+    expected_profile = [baseline._parse_user_company(html) for html in profile_pages]
+
+    for backend, restricted in CONFIGURATIONS:
+        scraper = LinkedInCompanyConnectionScraper({}, parser_backend=backend, restricted_parsing=restricted)
+        label = f'{backend} (restricted={restricted})'
+
+        if [scraper._parse_search_results(html) for html in search_pages] != expected_search:
+            sys.exit(f'Parity failure on search pages: {label}')
+        if [scraper._parse_user_company(html) for html in profile_pages] != expected_profile:
+            sys.exit(f'Parity failure on profile pages: {label}')
+
+
+def measure(parse, pages, repeat):
+    """Best-of-`repeat` ms per page and peak traced heap (KB) for one page."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for html in pages:
+            parse(html)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse(pages[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best / len(pages) * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', help='glob of saved search-result pages (default: synthetic fixtures)')
+    parser.add_argument('--synthetic-pages', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    if args.pages:
+        search_pages = fixtures.load_saved_pages(args.pages)
+    else:
+        search_pages = [fixtures.search_page_html(start=i * 10, seed=3) for i in range(args.synthetic_pages)]
+    profile_pages = [fixtures.profile_page_html(), fixtures.profile_page_html(company='Other Co')]
+
+    check_parity(search_pages, profile_pages)
+    print(f"Parity OK across {len(CONFIGURATIONS)} configurations, {len(search_pages)} search pages")
+    print(f"{'backend':<12} {'restricted':<11} {'ms/page':>9} {'peak KB':>9}")
+
+    results = []
+    for backend, restricted in CONFIGURATIONS:
+        if resolve_backend(backend) != backend:
+            continue
+        scraper = LinkedInCompanyConnectionScraper({}, parser_backend=backend, restricted_parsing=restricted)
+        ms_per_page, peak_kb = measure(scraper._parse_search_results, search_pages, args.repeat)
+        results.append({
+            'backend': backend,
+            'restricted': restricted,
+            'parse_ms_per_page': round(ms_per_page, 2),
+            'peak_kb': round(peak_kb, 1)
+        })
+        print(f"{backend:<12} {str(restricted):<11} {ms_per_page:9.2f} {peak_kb:9.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'parsing', 'pages': len(search_pages), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
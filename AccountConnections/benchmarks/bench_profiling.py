@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Request Profiling Benchmark
+Searches of `--pages` pages against the mock LinkedIn server, reporting:
+
+- off: what the profiling hooks cost a request that is not profiled
+  (profiling.active() and profiling.traced() per page)
+- on: search latency unprofiled and profiled, with the samples taken and
+  the time to write the collapsed stacks and summary
+
+Before timing, `--concurrent` profiles are run at once, each on a thread
+spinning in its own function, and each profile is checked to hold only its
+own thread's stacks; a profiled search is checked to include the page fetch
+threads and parsing.
+
+Usage:
+    python benchmarks/bench_profiling.py
+    python benchmarks/bench_profiling.py --pages 10 --runs 10 --concurrent 8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_linkedin import MockLinkedInServer
+
+
+def check_isolation(profiling, concurrent, directory):
+    """Profiles running at once each see only their own threads."""
+    def spin(profile_number, results):
+        profile = profiling.start_profile({'profile': profile_number}, interval=0.001)
+        deadline = time.perf_counter() + 0.3
+        busy = globals()[f'busy_{profile_number % 2}']
+        while time.perf_counter() < deadline:
+            busy()
+        profiling.finish_profile(profile, directory)
+        results[profile_number] = profile
+
+    results = {}
+    threads = [threading.Thread(target=spin, args=(number, results)) for number in range(concurrent)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for number, profile in results.items():
+        own, other = f'busy_{number % 2} ', f'busy_{1 - number % 2} '
+        stacks = profile.collapsed()
+        if not profile.samples or own not in stacks or other in stacks:
+            sys.exit(f'Isolation failure: profile {number} has {profile.samples} samples, '
+                     f'own stacks {own in stacks}, other stacks {other in stacks}')
+
+
+def busy_0():
+    sum(range(1000))
+
+
+def busy_1():
+    sum(range(1000))
+
+
+def check_coverage(profiling, scraper, pages, directory):
+    profile = profiling.start_profile({'check': 'coverage'})
+    scraper.search_company_employees('Coverage', limit=pages * 10)
+    profiling.finish_profile(profile, directory)
+    stacks = profile.collapsed()
+    if '_fetch_search_page' not in stacks or '_parse_search_results' not in stacks:
+        sys.exit('Coverage failure: profiled search is missing page fetches or parsing')
+
+
+def search_ms(profiling, scraper, pages, runs, directory, profiled):
+    """Median search latency, and for profiled runs the median samples and save time."""
+    latencies, samples, saves = [], [], []
+    for run in range(runs):
+        started = time.perf_counter()
+        profile = profiling.start_profile({'run': run}) if profiled else None
+        scraper.search_company_employees(f'Company {run}', limit=pages * 10)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if profile is not None:
+            saving = time.perf_counter()
+            profiling.finish_profile(profile, directory)
+            saves.append((time.perf_counter() - saving) * 1000)
+            samples.append(profile.samples)
+    return (statistics.median(latencies), statistics.median(samples) if samples else 0,
+            statistics.median(saves) if saves else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--concurrent', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, filename in (('COMPANY_INDEX_PATH', 'company_index.db'), ('INTRO_GRAPH_PATH', ''),
+                               ('EMPLOYEE_STORE_PATH', 'employees.db')):
+            os.environ[name] = os.path.join(directory, filename) if filename else ''
+        profiles = os.path.join(directory, 'profiles')
+
+        with MockLinkedInServer(latency=args.latency) as server:
+            os.environ['LINKEDIN_BASE_URL'] = server.url
+            import profiling
+            from scraping import LinkedInCompanyConnectionScraper
+
+            scraper = LinkedInCompanyConnectionScraper({'li_at': 'bench-session'}, requests_per_second=1000,
+                                                       burst=1000)
+            check_isolation(profiling, args.concurrent, profiles)
+            check_coverage(profiling, scraper, args.pages, profiles)
+
+            hooks_ns = min(timeit.repeat(lambda: profiling.traced(profiling.active), number=100000, repeat=5))
+            hooks_ns = hooks_ns / 100000 * 1e9
+            search_ms(profiling, scraper, args.pages, 1, profiles, False)
+            plain_ms, _, _ = search_ms(profiling, scraper, args.pages, args.runs, profiles, False)
+            profiled_ms, samples, save_ms = search_ms(profiling, scraper, args.pages, args.runs, profiles, True)
+
+    print(f"{args.concurrent} concurrent profiles isolated, profiled search covers fetches and parsing")
+    print(f"off       {hooks_ns:8.0f} ns per page ({hooks_ns * args.pages / 1e6 / plain_ms * 100:.4f}% of a search)")
+    print(f"search    unprofiled {plain_ms:7.1f} ms  profiled {profiled_ms:7.1f} ms  "
+          f"({(profiled_ms / plain_ms - 1) * 100:+.1f}%)")
+    print(f"profile   {samples:6.0f} samples  saved in {save_ms:5.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'profiling', 'pages': args.pages, 'hooks_ns_per_page': round(hooks_ns),
+                       'unprofiled_ms': round(plain_ms, 1), 'profiled_ms': round(profiled_ms, 1),
+                       'samples': samples, 'save_ms': round(save_ms, 1)}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
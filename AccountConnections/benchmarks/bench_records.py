@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Employee Record Benchmark
+Memory and JSON encoding time for a synthetic search response holding
+`--records` employees, as plain dicts (the old shape) versus records.Employee:
+
+- memory: traced allocations for building the records
+- encode: jsonify()-equivalent bytes with Flask's default provider versus
+  records.FastJSONProvider (orjson fast path when installed)
+
+Before timing, FastJSONProvider output is checked byte for byte against the
+default provider for ASCII and non-ASCII results, debug (indented) output
+and values that take the json fallback.
+
+Usage:
+    python benchmarks/bench_records.py
+    python benchmarks/bench_records.py --records 50000 --iterations 20
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import records
+from records import Employee, EMPLOYEE_FIELDS
+
+
+def employee_values(count, seed=0, names=('Alex', 'Sam', 'Jordan', 'Taylor')):
+    """Field tuples shaped like _extract_employee_data() output."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        degree = rng.choice(['1st', '2nd', '3rd'])
+        mutual = rng.randint(0, 40)
+        title = rng.choice(['Account Manager at AllCode', 'Software Engineer at AllCode', 'Director of Sales'])
+        rows.append((f'{rng.choice(names)} Person{i}', title, 'San Francisco Bay Area',
+                     f'https://www.linkedin.com/in/person-{i}/', mutual, degree,
+                     mutual * 2 + {'1st': 100, '2nd': 50, '3rd': 0}[degree], degree in ('1st', '2nd'),
+                     degree in ('2nd', '3rd')))
+    return rows
+
+
+def response_body(employees):
+    return {'success': True, 'company': 'AllCode', 'total_found': len(employees), 'employees': employees,
+            'timings': {'total_ms': 812.37, 'stages': {'fetch': {'count': 15, 'ms': 640.1}}},
+            'capabilities': {'logged_in': True, 'notes': ['Respect rate limits']}}
+
+
+def traced_kb(build):
+    tracemalloc.start()
+    result = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return current / 1024
+
+
+def encode_ms(provider, body, iterations):
+    """Median ms per jsonify()-style encode."""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        provider.dumps(body, separators=(',', ':'))
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def check_parity(default, fast):
+    rows = employee_values(200, seed=3)
+    unicode_rows = employee_values(50, seed=4, names=('José', 'Zoë', '李', 'Ana'))
+    cases = [
+        response_body([Employee(*row) for row in rows]),
+        response_body([Employee(*row) for row in unicode_rows]),
+        dict(response_body([Employee(*row) for row in rows[:5]]), hit_rate=1e-05, big=2 ** 70),
+        {'employees': [], 'ratio': 0.1, 'none': None, 'nested': [[1, 2.5], {'b': 1, 'a': 2}]},
+    ]
+    for body in cases:
+        expected_body = json.loads(json.dumps(body, default=records.json_default))
+        for kwargs in ({'separators': (',', ':')}, {'indent': 2}, {}):
+            if fast.dumps(body, **kwargs) != default.dumps(expected_body, **kwargs):
+                sys.exit(f'Parity failure: FastJSONProvider output differs ({kwargs})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    fast = records.FastJSONProvider(app)
+    check_parity(default, fast)
+
+    rows = employee_values(args.records)
+    dict_kb = traced_kb(lambda: [dict(zip(EMPLOYEE_FIELDS, row)) for row in rows])
+    record_kb = traced_kb(lambda: [Employee(*row) for row in rows])
+
+    dict_body = response_body([dict(zip(EMPLOYEE_FIELDS, row)) for row in rows])
+    record_body = response_body([Employee(*row) for row in rows])
+    default_ms = encode_ms(default, dict_body, args.iterations)
+    fast_ms = encode_ms(fast, record_body, args.iterations)
+
+    print(f"{args.records} employees, orjson {'available' if records.orjson else 'not installed'} (parity OK)")
+    print(f"memory   dicts {dict_kb:9.1f} KB   Employee {record_kb:9.1f} KB   {1 - record_kb / dict_kb:.0%} less")
+    print(f"encode   dicts {default_ms:9.2f} ms   Employee {fast_ms:9.2f} ms   {default_ms / fast_ms:.1f}x faster")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'records', 'records': args.records, 'orjson': records.orjson is not None,
+                       'dict_kb': round(dict_kb, 1), 'employee_kb': round(record_kb, 1),
+                       'default_encode_ms': round(default_ms, 2), 'fast_encode_ms': round(fast_ms, 2)}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Shared Cache Benchmark
+For each shared_cache backend, `--workers` processes (standing in for
+gunicorn workers) request the same `--keys` keys in shuffled order
+through SharedCache.get_or_compute(), where a compute is a simulated
+scrape of `--compute-ms`. Reports:
+
+- computes: how many scrapes ran in total (single-flight gives one per
+  key; the memory backend, private to each worker, gives one per key per worker)
+- per-worker hit rate (hits plus results computed by another worker)
+- get/set latency for a search-result-sized value
+
+Usage:
+    python benchmarks/bench_shared_cache.py
+    python benchmarks/bench_shared_cache.py --workers 8 --keys 50 --rounds 3
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Employee
+from shared_cache import SharedCache, open_backend
+
+
+def sample_result(count=50):
+    """A search result shaped like search_company_employees() output."""
+    employees = [Employee(f'Person {i}', 'Account Manager at AllCode', 'Austin, TX',
+                          f'https://www.linkedin.com/in/person-{i}/', i % 40, '2nd', 50 + i, True, True)
+                 for i in range(count)]
+    return {'company': 'AllCode', 'total_found': count, 'employees': employees, 'capabilities': {}}
+
+
+def worker(backend_name, path, keys, rounds, compute_ms, seed, computes, results):
+    cache = SharedCache('bench', open_backend(backend_name, path))
+    value = sample_result()
+
+    def compute():
+        with computes.get_lock():
+            computes.value += 1
+        time.sleep(compute_ms / 1000)
+        return value
+
+    order = list(range(keys))
+    random.Random(seed).shuffle(order)
+    for _ in range(rounds):
+        for key in order:
+            cache.get_or_compute(f'company-{key}', compute, ttl=300)
+    results.put(cache.stats())
+
+
+def latency_us(backend, iterations=200):
+    """Median get and set microseconds for one search result."""
+    value = sample_result()
+    sets, gets = [], []
+    for i in range(iterations):
+        started = time.perf_counter()
+        backend.set(f'latency-{i % 20}', value, 300)
+        sets.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        backend.get(f'latency-{i % 20}')
+        gets.append(time.perf_counter() - started)
+    return round(statistics.median(gets) * 1e6, 1), round(statistics.median(sets) * 1e6, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', default='memory,sqlite,mmap')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--keys', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=2)
+    parser.add_argument('--compute-ms', type=float, default=50)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    report = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name in [value.strip() for value in args.backends.split(',') if value.strip()]:
+            path = os.path.join(directory, f'cache-{name}')
+            computes = context.Value('i', 0)
+            results = context.Queue()
+            started = time.perf_counter()
+            processes = [context.Process(target=worker, args=(name, path, args.keys, args.rounds, args.compute_ms,
+                                                               seed, computes, results))
+                         for seed in range(args.workers)]
+            for process in processes:
+                process.start()
+            stats = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+            elapsed = time.perf_counter() - started
+
+            backend = open_backend(name, path)
+            get_us, set_us = latency_us(backend)
+            hit_rates = [worker_stats['hit_rate'] for worker_stats in stats]
+            report.append({
+                'backend': name,
+                'computes': computes.value,
+                'elapsed_s': round(elapsed, 2),
+                'hit_rates': hit_rates,
+                'get_us': get_us,
+                'set_us': set_us
+            })
+            print(f"{name:<7} computes {computes.value:4d} (keys {args.keys})  {elapsed:6.2f}s  "
+                  f"hit rate per worker {', '.join(f'{rate:.2f}' for rate in hit_rates)}  "
+                  f"get {get_us:8.1f} µs  set {set_us:8.1f} µs")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'shared_cache', 'workers': args.workers, 'keys': args.keys,
+                       'rounds': args.rounds, 'results': report}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
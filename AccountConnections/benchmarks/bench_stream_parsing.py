@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Streaming Parse Memory Benchmark
+Peak Python heap (tracemalloc) and time to fetch and parse one search page
+from the mock LinkedIn server, reading the whole body then parsing it
+versus stream_parsing, which tokenizes the body as it downloads and keeps
+only the result item being read.
+
+Before measuring, streamed output is checked for parity with
+_parse_search_results() for every parser backend, including pages split
+into small chunks.
+
+Usage:
+    python benchmarks/bench_stream_parsing.py
+    python benchmarks/bench_stream_parsing.py --padding-kb 1000 --items-per-page 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures
+from mock_linkedin import MockLinkedInServer
+
+
+def check_parity(parser_class, backends, pages):
+    """Streamed parsing matches whole-page parsing for each backend and chunk size."""
+    from html_parsing import resolve_backend
+
+    for backend in backends:
+        if resolve_backend(backend) != backend:
+            continue
+        parser = parser_class()
+        parser._configure_parser(backend, False)
+        for html in pages:
+            expected = parser._parse_search_results(html)
+            for size in (1, 97, 16384):
+                chunks = (html[i:i + size] for i in range(0, len(html), size))
+                if parser._parse_search_stream(chunks) != expected:
+                    sys.exit(f'Parity failure: {backend} streamed in {size}-char chunks differs')
+
+
+def measure(scraper, iterations):
+    """Peak traced memory and mean seconds to fetch and parse page 0."""
+    peaks = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        tracemalloc.start()
+        employees = scraper._fetch_search_page('AllCode', 0)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return max(peaks), (time.perf_counter() - started) / iterations, len(employees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items-per-page', type=int, default=10)
+    parser.add_argument('--padding-kb', type=int, default=300)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--backend', default='html.parser', help='parser backend for the memory runs')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    server = MockLinkedInServer(results_per_page=args.items_per_page, padding_kb=args.padding_kb).start()
+    try:
+        # scraping reads LINKEDIN_BASE_URL at import
+        os.environ['LINKEDIN_BASE_URL'] = server.url
+        from scraping import LinkedInCompanyConnectionScraper, LinkedInResultParser
+
+        pages = [fixtures.search_page_html(args.items_per_page, start=i * args.items_per_page, seed=5,
+                                           padding_kb=min(args.padding_kb, 50)) for i in range(3)]
+        pages.append(fixtures.empty_search_page_html(10))
+        check_parity(LinkedInResultParser, ('html.parser', 'lxml', 'selectolax'), pages)
+
+        results = {}
+        for mode, stream in (('buffered', False), ('streaming', True)):
+            scraper = LinkedInCompanyConnectionScraper({}, requests_per_second=1000, burst=1000,
+                                                       parser_backend=args.backend, stream_parsing=stream)
+            scraper._fetch_search_page('AllCode', 0)
+            peak, seconds, found = measure(scraper, args.iterations)
+            results[mode] = {'peak_kb': round(peak / 1024, 1), 'ms': round(seconds * 1000, 2), 'employees': found}
+
+        if results['buffered']['employees'] != results['streaming']['employees']:
+            sys.exit('Parity failure: buffered and streamed fetches found different employees')
+    finally:
+        server.stop()
+
+    page_kb = len(server.search_page(0, 'AllCode')) / 1024
+    print(f"{page_kb:.0f} KB page, {args.items_per_page} items, backend {args.backend} (parity OK)")
+    for mode, result in results.items():
+        print(f"{mode:<10} peak {result['peak_kb']:9.1f} KB   {result['ms']:8.2f} ms/page")
+    reduction = 1 - results['streaming']['peak_kb'] / results['buffered']['peak_kb']
+    print(f"peak memory reduction: {reduction:.0%}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'stream_parsing', 'page_kb': round(page_kb, 1), 'backend': args.backend,
+                       'results': results, 'peak_reduction': round(reduction, 3)}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark Comparison
+Compare two run_benchmarks.py result files and flag regressions.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json --threshold 10
+
+Exits with status 1 if any metric regressed by more than the threshold (%).
+"""
+
+import argparse
+import json
+import sys
+
+# Metrics where a bigger number is better; everything else timed or sized is lower-is-better
+HIGHER_IS_BETTER = ('pages_per_sec', 'items_per_sec', 'requests_per_sec', 'speedup', 'throughput')
+LOWER_IS_BETTER = ('_ms', 'peak_rss_kb', 'peak_kb', 'error_rate')
+
+
+def direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not a performance metric."""
+    if any(metric.endswith(suffix) or metric == suffix for suffix in HIGHER_IS_BETTER):
+        return 1
+    if any(suffix in metric for suffix in LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    with open(args.candidate) as f:
+        candidate = json.load(f)['results']
+
+    regressions = 0
+    for scenario in sorted(set(baseline) & set(candidate)):
+        print(scenario)
+        for metric, old in baseline[scenario].items():
+            new = candidate[scenario].get(metric)
+            better = direction(metric)
+            if not better or not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or not old:
+                continue
+
+            change = (new - old) / old * 100
+            regressed = change * better < -args.threshold
+            regressions += regressed
+            flag = '  REGRESSION' if regressed else ''
+            print(f"    {metric:<20} {old:>12} -> {new:<12} {change:+7.1f}%{flag}")
+
+    for scenario in sorted(set(baseline) ^ set(candidate)):
+        print(f"{scenario}: only in {'baseline' if scenario in baseline else 'candidate'}")
+
+    if regressions:
+        print(f"{regressions} regression(s) beyond {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Synthetic LinkedIn Page Fixtures
+Generates search-result and profile pages shaped like LinkedIn's markup.
+
+Pages are deterministic for a given seed so benchmark runs are comparable.
+Each search page carries several hundred KB of head/script/JSON padding,
+like the real thing, so parser cost is representative.
+"""
+
+import glob
+import random
+from typing import List
+
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie',
+               'Avery', 'Quinn', 'Dana', 'Robin', 'Chris', 'Pat', 'Drew', 'José', 'Zoë']
+LAST_NAMES = ['Smith', 'Johnson', 'Lee', 'Garcia', 'Nguyen', 'Brown', 'Patel', 'Kim',
+              'Martin', 'Lopez', 'Clark', 'Walker', 'Müller', 'O\'Neil']
+TITLES = ['Software Engineer', 'Senior Developer', 'Product Manager', 'Account Manager',
+          'Director of Sales', 'Data Scientist', 'DevOps Engineer', 'Designer', 'CTO']
+LOCATIONS = ['San Francisco, CA', 'New York, NY', 'Austin, TX', 'Seattle, WA',
+             'Miami, FL', 'London, United Kingdom', 'Remote']
+DEGREES = ['1st', '2nd', '3rd', '3rd+']
+
+
+def result_item_html(index: int, rng: random.Random, company: str = 'AllCode') -> str:
+    """One <li> search result, varying the optional parts the extractor handles."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    slug = f"{name.lower().replace(' ', '-')}-{index}"
+    degree = rng.choice(DEGREES)
+    mutual = rng.randint(0, 40)
+
+    # Degree shows up as .dist-value, as a badge, or not at all
+    degree_style = rng.random()
+    dist_value = f'<span class="dist-value">{degree}</span>' if degree_style < 0.3 else ''
+    badge = ''
+    if degree_style < 0.85:
+        badge = (
+            '<span class="entity-result__badge t-14 t-normal t-black--light">'
+            '<div class="entity-result__badge-text">'
+            f'<span aria-hidden="true">{degree}</span>'
+            f'<span class="visually-hidden">{degree} degree connection</span>'
+            '</div></span>'
+        )
+
+    insight_style = rng.random()
+    if insight_style < 0.6:
+        insight_text = f'{mutual} mutual connections'
+    elif insight_style < 0.8:
+        insight_text = f'{rng.choice(FIRST_NAMES)} is a mutual connection'
+    else:
+        insight_text = ''
+    insight = (
+        '<div class="entity-result__insight t-12 t-black--light">'
+        f'<div class="entity-result__simple-insight-text-container"><strong>{insight_text}</strong></div></div>'
+        if insight_text else ''
+    )
+
+    return (
+        '<li class="reusable-search__result-container">\n'
+        f'<div class="entity-result" data-chameleon-result-urn="urn:li:member:{index}">\n'
+        '<div class="entity-result__item">\n'
+        '<div class="entity-result__universal-image"><div class="display-flex align-items-center">'
+        f'<a class="app-aware-link scale-down" href="https://www.linkedin.com/in/{slug}" aria-hidden="true">'
+        f'<img class="presence-entity__image EntityPhoto-circle-3" alt="{name}" width="48" height="48"></a>'
+        '</div></div>\n'
+        '<div class="entity-result__content entity-result__divider pt3 pb3 t-12 t-black--light">\n'
+        '<div class="mb1"><div class="t-roman t-sans"><div class="display-flex">\n'
+        '<span class="entity-result__title-line entity-result__title-line--2-lines">\n'
+        '<span class="entity-result__title-text t-16">\n'
+        f'<a class="app-aware-link" href="https://www.linkedin.com/in/{slug}?miniProfileUrn=urn%3Ali%3Afs_miniProfile%3A{index}">\n'
+        f'<span dir="ltr"><span aria-hidden="true"><!---->{name}<!----></span>'
+        f'<span class="visually-hidden">View {name}&#8217;s profile</span></span>\n'
+        '</a>\n'
+        f'{badge}\n'
+        '</span></span></div></div>\n'
+        f'<div class="entity-result__primary-subtitle t-14 t-black t-normal">\n  {rng.choice(TITLES)} at {company} &amp; Partners\n</div>\n'
+        f'<div class="entity-result__secondary-subtitle t-14 t-normal">\n  {rng.choice(LOCATIONS)}\n</div>\n'
+        f'{dist_value}'
+        '</div>\n'
+        f'<p class="entity-result__summary entity-result__summary--2-lines t-12 t-black--light">'
+        f'Building things at {company}. Previously somewhere else.</p>\n'
+        f'{insight}\n'
+        '</div>\n'
+        '<div class="entity-result__actions entity-result__divider">'
+        '<button class="artdeco-button artdeco-button--2 artdeco-button--secondary" aria-label="Invite to connect">'
+        '<span class="artdeco-button__text">Connect</span></button></div>\n'
+        '</div></div>\n'
+        '</li>\n'
+    )
+
+
+def search_page_html(count: int = 10, start: int = 0, seed: int = 0, company: str = 'AllCode',
+                     padding_kb: int = 300) -> str:
+    """A people-search results page holding `count` result items."""
+    rng = random.Random(seed * 100003 + start)
+    items = ''.join(result_item_html(start + i, rng, company) for i in range(count))
+    return _page_shell(
+        '<main class="scaffold-layout__main"><div class="search-results-container">'
+        '<ul class="reusable-search__entity-result-list list-style-none">\n'
+        f'{items}'
+        '</ul></div></main>',
+        rng,
+        padding_kb
+    )
+
+
+def empty_search_page_html(padding_kb: int = 300) -> str:
+    """A results page with no matches, which ends paging."""
+    return _page_shell(
+        '<main class="scaffold-layout__main"><div class="search-reusable-search-no-results">'
+        '<h2>No results found</h2></div></main>',
+        random.Random(0),
+        padding_kb
+    )
+
+
+def profile_page_html(company: str = 'AllCode', title: str = 'Account Manager', padding_kb: int = 200) -> str:
+    """A /in/me/ profile page with an experience section."""
+    return _page_shell(
+        '<main><section class="artdeco-card" data-section="experience"><ul>'
+        '<li class="artdeco-list__item">'
+        f'<div class="display-flex"><div class="mr1 t-bold"><span aria-hidden="true">{title}</span>'
+        f'<span class="visually-hidden">{title}</span></div></div>'
+        f'<span class="t-14 t-normal"><span aria-hidden="true">{company}</span></span>'
+        '</li>'
+        '<li class="artdeco-list__item"><div class="mr1 t-bold"><span aria-hidden="true">Intern</span></div>'
+        '<span class="t-14 t-normal"><span aria-hidden="true">Previous Co</span></span></li>'
+        '</ul></section></main>',
+        random.Random(1),
+        padding_kb
+    )
+
+
+def load_saved_pages(pattern: str) -> List[str]:
+    """Read saved HTML pages matching a glob pattern."""
+    pages = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append(f.read())
+    return pages
+
+
+def _page_shell(main_html: str, rng: random.Random, padding_kb: int) -> str:
+    """Wrap content in the head, nav and embedded-data noise LinkedIn pages carry."""
+    blob = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(256))
+    chunks = max(1, padding_kb * 1024 // 2 // 300)
+    data = ''.join(
+        f'<code style="display: none" id="bpr-guid-{i}">{{&quot;data&quot;:{{&quot;id&quot;:&quot;{blob}&quot;}}}}</code>\n'
+        for i in range(chunks)
+    )
+    script = 'window.__como_rehydration__ = [' + ','.join(f'"{blob}"' for _ in range(chunks)) + '];'
+    nav = ''.join(
+        f'<li class="global-nav__primary-item"><a class="global-nav__primary-link" href="/nav/{i}">'
+        f'<span class="t-12 global-nav__primary-link-text">Item {i}</span></a></li>'
+        for i in range(20)
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+        '<title>Search | LinkedIn</title>'
+        '<style>.entity-result{display:flex}.visually-hidden{position:absolute}</style>'
+        f'<script>{script}</script></head>\n'
+        f'<body class="render-mode-BIGPIPE"><header><nav><ul class="global-nav__primary-items">{nav}</ul></nav></header>\n'
+        f'{main_html}\n'
+        f'{data}'
+        '</body></html>'
+    )
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Load Test Harness
+Drives the Flask scraping endpoints with open-loop traffic against the
+local mock LinkedIn server, to find how much load a worker/thread setup
+takes before latency collapses:
+
+    scrape_company   scraping_api.py POST /api/scrape-company
+    scrape           linkedin_scraper_api.py POST /scrape
+    search           app.py POST /search (after POST /login)
+
+Requests arrive at each `--rates` rate for `--duration` seconds whether or
+not earlier ones have finished (Poisson or uniform arrivals), and latency
+is measured from each request's scheduled arrival, so a backed-up server
+shows up as latency rather than as a slower client. Every endpoint is run
+under every `--configs` WORKERSxTHREADS setup:
+
+    --server gunicorn   gunicorn gthread workers on localhost (as deployed)
+    --server inprocess  one worker in this process, THREADS request threads
+                        (shares this process's CPU with the load generator)
+
+Reports throughput, error rate (HTTP errors, timeouts and error bodies) and
+p50/p95/p99 latency of successful requests per endpoint, configuration
+and rate. Scrapes send cache_control no-store, so the result caches don't
+answer them (scraping_api.py's employee store, which the run turns on,
+still does); the store, company index, intro graph and shared cache
+files live in a temporary directory for the run. Requests rotate over `--sessions`
+LinkedIn cookie sets, each with its own scraper and rate budget (app.py's
+demo login always yields the same cookies, so /search shares one).
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --endpoints scrape --configs 1x4,2x4,4x8 --rates 5,10,20,40 --duration 30
+    python benchmarks/load_test.py --server inprocess --configs 1x1,1x8 --latency 0.2 --output load.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from mock_linkedin import MockLinkedInServer
+from stats import latency_summary
+
+# name: (module, path)
+ENDPOINTS = {
+    'scrape_company': ('scraping_api', '/api/scrape-company'),
+    'scrape': ('linkedin_scraper_api', '/scrape'),
+    'search': ('app', '/search'),
+}
+
+# Same key in every worker, so an app.py login is valid whichever worker serves /search
+SECRET_KEY = 'load-test'
+
+
+def parse_config(value):
+    """'2x4' -> (2 workers, 4 threads)."""
+    try:
+        workers, threads = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected WORKERSxTHREADS, got {value!r}')
+    if workers < 1 or threads < 1:
+        raise argparse.ArgumentTypeError(f'workers and threads must be at least 1, got {value!r}')
+    return workers, threads
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout, process=None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+class GunicornServer:
+    """An app module served by gunicorn gthread workers on a local port."""
+
+    def __init__(self, module, workers, threads, env):
+        self.port = free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        self._log = tempfile.TemporaryFile(mode='w+')
+        self._process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', f'{module}:app', '--bind', f'127.0.0.1:{self.port}',
+             '--workers', str(workers), '--threads', str(threads), '--worker-class', 'gthread',
+             '--timeout', '120', '--log-level', 'warning'],
+            cwd=PROJECT_DIR, env=dict(os.environ, **env), stdout=self._log, stderr=subprocess.STDOUT
+        )
+        if not wait_for_port(self.port, 60, self._process):
+            self.stop()
+            self._log.seek(0)
+            raise RuntimeError(f'gunicorn did not start:\n{self._log.read()[-2000:]}')
+
+    def stop(self):
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._log.close()
+
+
+class InProcessServer:
+    """An app module served from this process by a pool of request threads, like one gthread worker."""
+
+    def __init__(self, module, workers, threads, env):
+        if workers != 1:
+            raise ValueError('--server inprocess runs a single worker; use --server gunicorn for more')
+        from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+        os.environ.update(env)
+        app = __import__(module).app
+        executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='request')
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args):
+                pass
+
+        class PooledWSGIServer(BaseWSGIServer):
+            def process_request(self, request, client_address):
+                executor.submit(self._handle, request, client_address)
+
+            def _handle(self, request, client_address):
+                try:
+                    self.finish_request(request, client_address)
+                except Exception:
+                    self.handle_error(request, client_address)
+                finally:
+                    self.shutdown_request(request)
+
+        self._executor = executor
+        self._server = PooledWSGIServer('127.0.0.1', 0, app, handler=QuietHandler)
+        self.url = f'http://127.0.0.1:{self._server.server_port}'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+SERVERS = {'gunicorn': GunicornServer, 'inprocess': InProcessServer}
+
+
+class LoadClient:
+    """Sends one endpoint's requests, each on this thread's keep-alive connection."""
+
+    def __init__(self, endpoint, url, args):
+        self.endpoint = endpoint
+        self.url = url + ENDPOINTS[endpoint][1]
+        self.timeout = args.timeout
+        self.company = args.company
+        self.limit = args.limit
+        self.cookie_sets = [{'li_at': f'load-session-{i}', 'JSESSIONID': f'ajax:{i}'}
+                            for i in range(max(1, args.sessions))]
+        self.login_cookies = None
+        self._local = threading.local()
+        self._count = 0
+        self._count_lock = threading.Lock()
+
+    def login(self):
+        """app.py keeps LinkedIn cookies in its Flask session; log in once and reuse the cookie."""
+        if self.endpoint != 'search':
+            return
+        response = requests.post(self.url.replace('/search', '/login'),
+                                 data={'email': 'load@example.com', 'password': 'load-test'},
+                                 allow_redirects=False, timeout=self.timeout)
+        self.login_cookies = response.cookies.get_dict()
+        if not self.login_cookies:
+            raise RuntimeError(f'app.py login failed ({response.status_code})')
+
+    def send(self):
+        """One request; True if it succeeded."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+
+        with self._count_lock:
+            self._count += 1
+            count = self._count
+
+        body = {'company_name': self.company, 'limit': self.limit, 'cache_control': 'no-store'}
+        if self.endpoint == 'search':
+            response = session.post(self.url, json=body, cookies=self.login_cookies, timeout=self.timeout)
+        else:
+            body['cookies'] = self.cookie_sets[count % len(self.cookie_sets)]
+            response = session.post(self.url, json=body, timeout=self.timeout)
+
+        if response.status_code >= 400:
+            return False
+        payload = response.json()
+        # Failed scrapes come back as 200s with an error field
+        return 'error' not in payload and 'error' not in payload.get('results', {})
+
+
+def arrival_offsets(rate, duration, arrivals, rng):
+    """Seconds from the start at which each request is due."""
+    offsets = []
+    now = 0.0
+    while True:
+        now += rng.expovariate(rate) if arrivals == 'poisson' else 1 / rate
+        if now >= duration:
+            return offsets
+        offsets.append(now)
+
+
+def run_open_loop(client, rate, args, rng):
+    """Send requests on schedule, never waiting for earlier responses, and summarize them."""
+    offsets = arrival_offsets(rate, args.duration, args.arrivals, rng)
+    results = []
+    results_lock = threading.Lock()
+
+    def timed(due):
+        try:
+            ok = client.send()
+        except Exception:
+            ok = False
+        finished = time.perf_counter()
+        with results_lock:
+            results.append((finished - due, ok, finished))
+
+    started = time.perf_counter() + 0.05
+    with ThreadPoolExecutor(max_workers=args.client_threads, thread_name_prefix='load') as executor:
+        for offset in offsets:
+            due = started + offset
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(timed, due)
+
+    ok_latencies = [latency for latency, ok, _ in results if ok]
+    errors = len(results) - len(ok_latencies)
+    elapsed = max((finished for _, _, finished in results), default=started) - started
+    return dict(
+        latency_summary(ok_latencies),
+        offered_rps=rate,
+        sent=len(results),
+        ok=len(ok_latencies),
+        errors=errors,
+        error_rate=round(errors / len(results), 4) if results else 0.0,
+        throughput_rps=round(len(ok_latencies) / elapsed, 2) if elapsed > 0 else 0.0
+    )
+
+
+def run_endpoint(endpoint, config, args, mock, data_dir):
+    """Every rate against one endpoint served with one worker/thread configuration."""
+    workers, threads = config
+    env = {
+        'EMPLOYEE_STORE_PATH': os.path.join(data_dir, 'employees.db'),
+        'SHARED_CACHE_PATH': os.path.join(data_dir, 'shared_cache'),
+        'COMPANY_INDEX_PATH': os.path.join(data_dir, 'company_index.db'),
+        'INTRO_GRAPH_PATH': os.path.join(data_dir, 'intro_graph.json'),
+        'LINKEDIN_BASE_URL': mock.url,
+        'FLASK_SECRET_KEY': SECRET_KEY,
+        'SCRAPER_REQUESTS_PER_SECOND': str(args.rps),
+        'SCRAPER_MAX_REQUESTS_PER_SECOND': str(args.rps),
+        'SCRAPER_BURST': str(args.burst),
+    }
+    server = SERVERS[args.server](ENDPOINTS[endpoint][0], workers, threads, env)
+    rows = []
+    try:
+        client = LoadClient(endpoint, server.url, args)
+        client.login()
+        for _ in range(args.warmup):
+            client.send()
+
+        rng = random.Random(args.seed)
+        for rate in args.rates:
+            requests_before = mock.stats()['requests']
+            row = run_open_loop(client, rate, args, rng)
+            row.update(endpoint=endpoint, workers=workers, threads=threads,
+                       linkedin_requests=mock.stats()['requests'] - requests_before)
+            rows.append(row)
+            print(f"  {endpoint:<15} {workers}x{threads:<4} {rate:7.1f} req/s offered  "
+                  f"{row['throughput_rps']:7.2f} ok/s  errors {row['error_rate']:6.1%}  "
+                  f"p50 {row['p50_ms']:8.1f}  p95 {row['p95_ms']:8.1f}  p99 {row['p99_ms']:8.1f} ms", flush=True)
+    finally:
+        server.stop()
+    return rows
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help='comma-separated endpoint names')
+    parser.add_argument('--server', choices=SERVERS, default='gunicorn')
+    parser.add_argument('--configs', default='1x1,1x4,2x4', help='comma-separated WORKERSxTHREADS setups')
+    parser.add_argument('--rates', default='1,2,5,10', help='comma-separated offered request rates (req/s)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of traffic per rate')
+    parser.add_argument('--arrivals', choices=('poisson', 'uniform'), default='poisson')
+    parser.add_argument('--warmup', type=int, default=2, help='requests sent before measuring')
+    parser.add_argument('--timeout', type=float, default=30, help='client timeout; a timeout counts as an error')
+    parser.add_argument('--client-threads', type=int, default=256, help='most requests outstanding at once')
+    parser.add_argument('--sessions', type=int, default=8, help='LinkedIn cookie sets to rotate over')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--company', default='AllCode')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--rps', type=float, default=1000.0, help='scraper requests/second budget per session')
+    parser.add_argument('--burst', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.05, help='mock server latency (seconds)')
+    parser.add_argument('--pages', type=int, default=15, help='result pages the mock serves')
+    parser.add_argument('--items-per-page', type=int, default=10)
+    parser.add_argument('--padding-kb', type=int, default=300)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--server-max-rps', type=float, help='mock throttles each session above this rate')
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+    unknown = [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+    try:
+        configs = [parse_config(value.strip()) for value in args.configs.split(',') if value.strip()]
+        args.rates = [float(value) for value in args.rates.split(',') if value.strip()]
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    if args.server == 'inprocess' and any(workers != 1 for workers, _ in configs):
+        parser.error('--server inprocess runs a single worker; use --server gunicorn for more')
+
+    mock = MockLinkedInServer(latency=args.latency, pages=args.pages, results_per_page=args.items_per_page,
+                              throttle_rate=args.throttle_rate, padding_kb=args.padding_kb,
+                              max_rps=args.server_max_rps).start()
+    data_dir = tempfile.TemporaryDirectory()
+    results = []
+    try:
+        for endpoint in endpoints:
+            for config in configs:
+                print(f"▶ {endpoint} on {args.server} {config[0]}x{config[1]}", flush=True)
+                try:
+                    results.extend(run_endpoint(endpoint, config, args, mock, data_dir.name))
+                except RuntimeError as e:
+                    print(f"  {e}")
+                    results.append({'endpoint': endpoint, 'workers': config[0], 'threads': config[1],
+                                    'error': str(e)})
+    finally:
+        mock.stop()
+        data_dir.cleanup()
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'args': {key: value for key, value in vars(args).items() if key != 'output'}
+            },
+            'results': results
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Mock LinkedIn Server
+Local stand-in for the LinkedIn pages the scrapers fetch:
+
+    GET /search/results/people/?start=N   synthetic (or saved) result pages
+    GET /in/me/                           redirect to the session's own /in/<id>/
+    GET /in/<id>/                         profile page with an experience section
+                                          (ETag/Last-Modified; 304 on a matching
+                                          If-None-Match or If-Modified-Since)
+
+Latency, page count, items per page and throttling (429 or LinkedIn's 999,
+with Retry-After) are configurable. Throttling is either random
+(--throttle-rate) or rate based (--max-rps: requests beyond that many in
+the trailing second from one li_at session are throttled), like LinkedIn
+pushing back on an account. Point the scrapers at it with
+LINKEDIN_BASE_URL=http://127.0.0.1:<port>.
+
+Usage:
+    python benchmarks/mock_linkedin.py --port 8765 --latency 0.2 --throttle-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures
+
+
+class MockLinkedInServer:
+    """Threaded HTTP server serving LinkedIn-shaped pages with injectable latency and throttling."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, pages: int = 15, results_per_page: int = 10,
+                 throttle_rate: float = 0.0, throttle_status: int = 429, retry_after: Optional[float] = 1,
+                 padding_kb: int = 300, saved_pages: Optional[List[str]] = None, seed: int = 0,
+                 max_rps: Optional[float] = None, members: Optional[Dict[str, str]] = None):
+        """Configure the stand-in.
+
+        throttle_rate is the fraction of requests answered with throttle_status
+        (and a Retry-After header when retry_after is set); max_rps throttles
+        each session's (li_at cookie's) requests above that rate instead.
+        saved_pages, if given, are served in order instead of synthetic pages.
+        members maps li_at values to public profile ids (several sessions can
+        be one member); other sessions get an id derived from their li_at.
+        """
+        self.latency = latency
+        self.pages = len(saved_pages) if saved_pages else pages
+        self.results_per_page = results_per_page
+        self.throttle_rate = throttle_rate
+        self.throttle_status = throttle_status
+        self.retry_after = retry_after
+        self.padding_kb = padding_kb
+        self.saved_pages = saved_pages
+        self.seed = seed
+        self.max_rps = max_rps
+        # li_at sessions max_rps applies to (None: every session)
+        self.throttled_sessions = None
+        self.members = dict(members or {})
+
+        self.requests = 0
+        self.throttled = 0
+        self.bytes_sent = 0
+        self.not_modified = 0
+        self._profile = None
+        self._rng = random.Random(seed)
+        self._page_cache = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def start(self) -> 'MockLinkedInServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'MockLinkedInServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'requests': self.requests, 'throttled': self.throttled, 'bytes_sent': self.bytes_sent,
+                    'not_modified': self.not_modified}
+
+    def profile_page(self) -> tuple:
+        """Profile page body with its ETag and Last-Modified validators."""
+        with self._lock:
+            if self._profile is None:
+                body = fixtures.profile_page_html(padding_kb=self.padding_kb).encode('utf-8')
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                self._profile = (body, etag, formatdate(time.time(), usegmt=True))
+            return self._profile
+
+    def member(self, session: str) -> str:
+        """Public profile id of the member a session (li_at) belongs to."""
+        return self.members.get(session) or f'member-{hashlib.sha1(session.encode()).hexdigest()[:8]}'
+
+    def search_page(self, start: int, company: str) -> bytes:
+        """Rendered page for a result offset, cached so serving stays cheap."""
+        page = start // 10
+        key = (page, company)
+        with self._lock:
+            body = self._page_cache.get(key)
+        if body is not None:
+            return body
+
+        if page >= self.pages:
+            html = fixtures.empty_search_page_html(self.padding_kb)
+        elif self.saved_pages:
+            html = self.saved_pages[page]
+        else:
+            html = fixtures.search_page_html(self.results_per_page, start=page * self.results_per_page,
+                                             seed=self.seed, company=company, padding_kb=self.padding_kb)
+
+        body = html.encode('utf-8')
+        with self._lock:
+            self._page_cache[key] = body
+        return body
+
+    def _should_throttle(self, session: str = '') -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.max_rps and (self.throttled_sessions is None or session in self.throttled_sessions):
+                now = time.monotonic()
+                recent = self._recent.setdefault(session, deque())
+                while recent and now - recent[0] >= 1.0:
+                    recent.popleft()
+                if len(recent) >= self.max_rps:
+                    self.throttled += 1
+                    return True
+                recent.append(now)
+            if self.throttle_rate and self._rng.random() < self.throttle_rate:
+                self.throttled += 1
+                return True
+        return False
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                session = _session_from_cookies(self.headers.get('Cookie', ''))
+                if server._should_throttle(session):
+                    headers = {'Retry-After': str(server.retry_after)} if server.retry_after is not None else {}
+                    self._send(server.throttle_status, b'Too many requests', headers)
+                elif url.path.rstrip('/') == '/search/results/people':
+                    company = _company_from_query(query)
+                    start = int(query.get('start', ['0'])[0])
+                    self._send(200, server.search_page(start, company))
+                elif url.path.rstrip('/') == '/in/me' and session:
+                    self._send(302, b'', {'Location': f'/in/{server.member(session)}/'})
+                elif url.path.startswith('/in/'):
+                    body, etag, last_modified = server.profile_page()
+                    validators = {'ETag': etag, 'Last-Modified': last_modified}
+                    if (self.headers.get('If-None-Match') == etag
+                            or self.headers.get('If-Modified-Since') == last_modified):
+                        with server._lock:
+                            server.not_modified += 1
+                        self._send(304, b'', validators)
+                    else:
+                        self._send(200, body, validators)
+                else:
+                    self._send(404, b'Not found')
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_sent += len(body)
+
+        return Handler
+
+
+def _session_from_cookies(header: str) -> str:
+    """The li_at cookie value, which identifies the LinkedIn session."""
+    for part in header.split(';'):
+        name, _, value = part.strip().partition('=')
+        if name == 'li_at':
+            return value
+    return ''
+
+
+def _company_from_query(query) -> str:
+    """Company from the currentCompany facet (scraping.py) or keywords (LinkedInScraper)."""
+    if 'currentCompany' in query:
+        try:
+            return json.loads(query['currentCompany'][0])[0]
+        except (ValueError, IndexError):
+            pass
+    return query.get('keywords', ['AllCode'])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--pages', type=int, default=15, help='result pages before an empty page')
+    parser.add_argument('--results-per-page', type=int, default=10)
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests throttled')
+    parser.add_argument('--throttle-status', type=int, default=429)
+    parser.add_argument('--max-rps', type=float, help='throttle each session above this rate')
+    parser.add_argument('--padding-kb', type=int, default=300)
+    parser.add_argument('--saved-pages', help='glob of saved result pages to serve instead of synthetic ones')
+    args = parser.parse_args()
+
+    saved = fixtures.load_saved_pages(args.saved_pages) if args.saved_pages else None
+    server = MockLinkedInServer(args.port, args.latency, args.pages, args.results_per_page,
+                                args.throttle_rate, args.throttle_status, padding_kb=args.padding_kb,
+                                saved_pages=saved, max_rps=args.max_rps)
+    print(f"Mock LinkedIn serving on {server.url} (LINKEDIN_BASE_URL={server.url})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
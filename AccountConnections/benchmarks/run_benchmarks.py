@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite
+Runs the scrapers and Flask endpoints against a local mock LinkedIn server
+and reports pages/sec, parse ms/page, p50/p95/p99 end-to-end latency and
+peak RSS. Each scenario runs in its own subprocess so peak RSS is per
+scenario. Results are written as JSON for benchmarks/compare.py.
+
+Scenarios:
+    parse                  _parse_search_results on generated pages
+    scraper_search         LinkedInCompanyConnectionScraper.search_company_employees
+    linkedin_scraper       LinkedInScraper.scrape_company_employees
+    flask_scrape_company   scraping_api.py POST /api/scrape-company
+    flask_scrape           linkedin_scraper_api.py POST /scrape
+    flask_search           app.py POST /search
+    batch_search           search_companies() over --companies companies, one session
+    independent_search     the same companies as concurrent single-company searches
+                           (one pooled scraper, as concurrent /api/scrape-company
+                           calls get; --separate-sessions gives each its own)
+
+Usage:
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --scenarios parse,scraper_search --items-per-page 2000
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+import fixtures
+from mock_linkedin import MockLinkedInServer
+from stats import latency_summary, peak_rss_kb
+
+COOKIES = {'li_at': 'benchmark-session', 'JSESSIONID': 'benchmark'}
+
+
+def bench_parse(args, server):
+    from scraping import LinkedInCompanyConnectionScraper
+
+    pages = [fixtures.search_page_html(args.items_per_page, start=i * args.items_per_page, seed=1)
+             for i in range(args.parse_pages)]
+    scraper = LinkedInCompanyConnectionScraper(COOKIES)
+
+    durations = []
+    items = 0
+    for html in pages:
+        started = time.perf_counter()
+        items += len(scraper._parse_search_results(html))
+        durations.append(time.perf_counter() - started)
+
+    total = sum(durations)
+    return {
+        'pages': len(pages),
+        'items': items,
+        'page_kb': round(sum(len(html) for html in pages) / len(pages) / 1024, 1),
+        'parse_ms_per_page': round(total / len(pages) * 1000, 2),
+        'items_per_sec': round(items / total, 1)
+    }
+
+
+def bench_scraper_search(args, server):
+    from scraping import LinkedInCompanyConnectionScraper
+
+    def run(i):
+        scraper = LinkedInCompanyConnectionScraper(COOKIES, max_workers=args.workers)
+        return scraper.search_company_employees(args.company, args.limit, args.top_k, args.stop_after_weak_pages,
+                                                args.stop_after_stable_pages)['total_found']
+
+    return timed_iterations(run, args.iterations, server)
+
+
+def bench_linkedin_scraper(args, server):
+    from linkedin_scraper_api import LinkedInScraper
+
+    def run(i):
+        scraper = LinkedInScraper()
+        scraper.set_cookies(COOKIES)
+        return scraper.scrape_company_employees(args.company, args.limit)['total_found']
+
+    return timed_iterations(run, args.iterations, server)
+
+
+def bench_flask_scrape_company(args, server):
+    import scraping_api
+
+    client = scraping_api.app.test_client()
+
+    def run(i):
+        response = client.post('/api/scrape-company', json={
+            'cookies': COOKIES, 'company_name': args.company, 'limit': args.limit, 'cache_control': 'no-store'
+        })
+        return response.get_json().get('total_found', 0)
+
+    return timed_iterations(run, args.iterations, server)
+
+
+def bench_flask_scrape(args, server):
+    import linkedin_scraper_api
+
+    client = linkedin_scraper_api.app.test_client()
+
+    def run(i):
+        response = client.post('/scrape', json={
+            'cookies': COOKIES, 'company_name': args.company, 'limit': args.limit, 'cache_control': 'no-store'
+        })
+        return response.get_json().get('total_found', 0)
+
+    return timed_iterations(run, args.iterations, server)
+
+
+def bench_flask_search(args, server):
+    import app as web_app
+
+    client = web_app.app.test_client()
+    with client.session_transaction() as session:
+        session['linkedin_cookies'] = COOKIES
+
+    def run(i):
+        response = client.post('/search', json={
+            'company_name': args.company, 'limit': args.limit, 'cache_control': 'no-store'
+        })
+        return response.get_json()['results']['total_found']
+
+    return timed_iterations(run, args.iterations, server)
+
+
+def bench_batch_search(args, server):
+    from scraping import LinkedInCompanyConnectionScraper
+
+    def run_batch(companies, started):
+        scraper = LinkedInCompanyConnectionScraper(COOKIES)
+        return [(time.perf_counter() - started, results['total_found'])
+                for results in scraper.search_companies(companies, args.limit)]
+
+    return timed_batch(run_batch, args, server)
+
+
+def bench_independent_search(args, server):
+    from scraping import LinkedInCompanyConnectionScraper
+
+    def run_batch(companies, started):
+        shared = LinkedInCompanyConnectionScraper(COOKIES)
+
+        def scrape(company):
+            scraper = LinkedInCompanyConnectionScraper(COOKIES) if args.separate_sessions else shared
+            results = scraper.search_company_employees(company, args.limit)
+            return time.perf_counter() - started, results['total_found']
+
+        with ThreadPoolExecutor(max_workers=len(companies)) as executor:
+            return list(executor.map(scrape, companies))
+
+    return timed_batch(run_batch, args, server)
+
+
+SCENARIOS = {
+    'parse': bench_parse,
+    'scraper_search': bench_scraper_search,
+    'linkedin_scraper': bench_linkedin_scraper,
+    'flask_scrape_company': bench_flask_scrape_company,
+    'flask_scrape': bench_flask_scrape,
+    'flask_search': bench_flask_search,
+    'batch_search': bench_batch_search,
+    'independent_search': bench_independent_search,
+}
+
+
+def timed_iterations(run, iterations, server):
+    """Run `run(i)` repeatedly, timing each call and counting pages served."""
+    requests_before = server.stats()['requests']
+    latencies = []
+    found = 0
+
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        found += run(i)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    served = server.stats()
+    pages = served['requests'] - requests_before
+    return dict(
+        latency_summary(latencies),
+        iterations=iterations,
+        pages_fetched=pages,
+        pages_per_sec=round(pages / elapsed, 2),
+        employees_per_call=round(found / iterations, 1),
+        throttled=served['throttled']
+    )
+
+
+def timed_batch(run_batch, args, server):
+    """Time whole batches of --companies companies and when each company completed."""
+    companies = [f'Company {i}' for i in range(args.companies)]
+    requests_before = server.stats()['requests']
+    batch_latencies, company_latencies = [], []
+    found = 0
+
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        batch_started = time.perf_counter()
+        completions = run_batch(companies, batch_started)
+        batch_latencies.append(time.perf_counter() - batch_started)
+        company_latencies.extend(latency for latency, _ in completions)
+        found += sum(count for _, count in completions)
+    elapsed = time.perf_counter() - started
+
+    served = server.stats()
+    pages = served['requests'] - requests_before
+    company_summary = latency_summary(company_latencies)
+    return dict(
+        latency_summary(batch_latencies),
+        company_p50_ms=company_summary['p50_ms'],
+        company_p95_ms=company_summary['p95_ms'],
+        iterations=args.iterations,
+        companies=args.companies,
+        pages_fetched=pages,
+        pages_per_sec=round(pages / elapsed, 2),
+        employees_per_batch=round(found / args.iterations, 1),
+        throttled=served['throttled']
+    )
+
+
+def run_child(args):
+    """Run one scenario in this process and print its metrics as JSON."""
+    server = MockLinkedInServer(latency=args.latency, pages=args.pages, results_per_page=args.items_per_page,
+                                throttle_rate=args.throttle_rate, throttle_status=args.throttle_status,
+                                retry_after=args.retry_after, padding_kb=args.padding_kb,
+                                max_rps=args.server_max_rps).start()
+    # Must be set before the scraper modules are imported
+    os.environ['LINKEDIN_BASE_URL'] = server.url
+    os.environ['SCRAPER_REQUESTS_PER_SECOND'] = str(args.rps)
+    os.environ['SCRAPER_BURST'] = str(args.burst)
+    os.environ['SCRAPER_MAX_REQUESTS_PER_SECOND'] = str(args.max_rps or args.rps)
+
+    try:
+        metrics = SCENARIOS[args.child](args, server)
+    finally:
+        server.stop()
+
+    metrics['peak_rss_kb'] = peak_rss_kb()
+    print(json.dumps(metrics))
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma-separated scenario names')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--company', default='AllCode')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=1, help='max_workers for scraper_search')
+    parser.add_argument('--companies', type=int, default=20, help='companies per batch for the batch scenarios')
+    parser.add_argument('--separate-sessions', action='store_true',
+                        help='independent_search: one scraper (and rate budget) per company')
+    parser.add_argument('--top-k', type=int, help='top_k for scraper_search')
+    parser.add_argument('--stop-after-weak-pages', type=int, help='stopping rule for scraper_search')
+    parser.add_argument('--stop-after-stable-pages', type=int, help='stopping rule for scraper_search')
+    parser.add_argument('--rps', type=float, default=1000.0, help='scraper requests/second budget')
+    parser.add_argument('--burst', type=int, default=1)
+    parser.add_argument('--max-rps', type=float, help='adaptive pacing ceiling (default: --rps, i.e. fixed rate)')
+    parser.add_argument('--latency', type=float, default=0.05, help='mock server latency (seconds)')
+    parser.add_argument('--pages', type=int, default=15, help='result pages the mock serves')
+    parser.add_argument('--items-per-page', type=int, default=10)
+    parser.add_argument('--parse-pages', type=int, default=20)
+    parser.add_argument('--padding-kb', type=int, default=300)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-status', type=int, default=429)
+    parser.add_argument('--retry-after', type=float, help='Retry-After seconds on throttled responses')
+    parser.add_argument('--server-max-rps', type=float, help='mock throttles requests above this rate')
+    parser.add_argument('--child', choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results = {}
+    for name in scenarios:
+        print(f"▶ {name}", flush=True)
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name] + sys.argv[1:],
+                               cwd=PROJECT_DIR, capture_output=True, text=True)
+        if child.returncode != 0:
+            print(child.stderr)
+            results[name] = {'error': child.stderr.strip().splitlines()[-1] if child.stderr.strip() else 'failed'}
+            continue
+        results[name] = json.loads(child.stdout.strip().splitlines()[-1])
+        for metric, value in results[name].items():
+            print(f"    {metric:<20} {value}")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': {key: value for key, value in vars(args).items() if key not in ('child', 'output')}
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Company Name Index
+Maps the ways a company gets typed ("AllCode", "allcode", "AllCode Inc.",
+"All Code LLC") to one canonical key, so they share result cache entries,
+stored employees and in-flight jobs. LinkedIn is always searched with the
+spelling the user typed; the index only decides which keys are shared:
+
+1. normalize_company() folds case, accents, punctuation, a leading "The"
+   and trailing legal suffixes (Inc, LLC, Ltd, GmbH, ...), and drops spaces
+2. Aliases are learned from scraped results: a company name read from the
+   title_company of COMPANY_ALIAS_MIN_SEEN different people in a
+   company's results maps to that company from then on, but only when it
+   is the searched name plus generic words ("Engineer at AllCode
+   Technologies" for AllCode). Other companies in headlines ("Consultant
+   at Accenture") are never learned, and a name that has been searched
+   for keeps its own key. Words that often name a different company
+   ("Scale AI", "Lambda Labs") are not generic
+
+Lookups on a warm index are dictionary reads. Companies and aliases are
+kept in SQLite at COMPANY_INDEX_PATH (empty: memory only), loaded at start;
+a gunicorn worker sees aliases other workers learn once it restarts.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional
+
+DEFAULT_PATH = os.environ.get('COMPANY_INDEX_PATH', 'company_index.db')
+DEFAULT_MIN_SEEN = int(os.environ.get('COMPANY_ALIAS_MIN_SEEN', '3'))
+
+# Trailing words dropped from company names (after punctuation is removed)
+LEGAL_SUFFIXES = frozenset([
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'pllc', 'ltd', 'limited', 'corp', 'corporation', 'co',
+    'company', 'plc', 'gmbh', 'ag', 'sa', 'sas', 'sarl', 'srl', 'spa', 'bv', 'nv', 'ab', 'as', 'oy',
+    'pty', 'pte', 'kk', 'pvt', 'private',
+])
+
+# Words that can follow a company's name in a headline without naming a different company
+ALIAS_DESCRIPTORS = frozenset([
+    'technologies', 'technology', 'software', 'systems', 'solutions', 'group', 'holdings', 'global',
+    'international', 'services', 'consulting', 'hq', 'us', 'usa', 'uk', 'team',
+])
+
+ABBREVIATION_RE = re.compile(r"[.'’]")
+WORD_RE = re.compile(r'[^\W_]+')
+TITLE_COMPANY_RE = re.compile(r'\s(?:at|@)\s+(.+)$', re.IGNORECASE)
+TITLE_COMPANY_END_RE = re.compile(r'\s*[|·•,]\s*|\s+-\s+')
+
+# Pending aliases tracked at once, before any reaches min_seen
+MAX_PENDING_ALIASES = 10000
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS company_aliases (
+    alias TEXT PRIMARY KEY,
+    canonical TEXT NOT NULL,
+    name TEXT NOT NULL,
+    learned_at REAL NOT NULL
+);
+"""
+
+
+@lru_cache(maxsize=8192)
+def normalize_company(company_name: str) -> str:
+    """Case, accent, punctuation and legal-suffix insensitive key for a company name."""
+    return ''.join(company_words(company_name)) or ' '.join((company_name or '').split()).casefold()
+
+
+def company_words(company_name: str) -> tuple:
+    """The words of normalize_company(), before they are joined."""
+    text = unicodedata.normalize('NFKD', (company_name or '').casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char)).replace('&', ' and ')
+    # "L.L.C." and "O'Reilly" are single words
+    words = WORD_RE.findall(ABBREVIATION_RE.sub('', text))
+
+    if len(words) > 1 and words[0] == 'the':
+        words.pop(0)
+    while len(words) > 1 and (words[-1] in LEGAL_SUFFIXES or words[-1] == 'and'):
+        words.pop()
+    return tuple(words)
+
+
+def is_alias_of(name: str, canonical: str) -> bool:
+    """Whether a name is the company `canonical` followed only by generic words (AllCode Technologies)."""
+    words = company_words(name)
+    for end in range(1, len(words)):
+        if ''.join(words[:end]) == canonical:
+            return all(word in ALIAS_DESCRIPTORS for word in words[end:])
+    return False
+
+
+def title_company_name(title_company: Optional[str]) -> Optional[str]:
+    """The company in a result headline like "Account Manager at AllCode | Cloud", if there is one."""
+    match = TITLE_COMPANY_RE.search(title_company or '')
+    if not match:
+        return None
+    name = TITLE_COMPANY_END_RE.split(match.group(1), 1)[0].strip()
+    return name or None
+
+
+class CompanyIndex:
+    """Thread-safe index of canonical company keys and learned aliases."""
+
+    def __init__(self, path: str = DEFAULT_PATH, min_seen: int = DEFAULT_MIN_SEEN):
+        """Open (or create) the index at `path` ('' for memory only); an alias needs min_seen people."""
+        self.path = path
+        self.min_seen = max(1, min_seen)
+        self._aliases = {}
+        self._names = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            if path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+            rows = self._conn.execute('SELECT alias, canonical, name FROM company_aliases').fetchall()
+            # Aliases learned from unrelated headline companies by earlier versions are dropped
+            stale = [(alias,) for alias, canonical, name in rows
+                     if alias != canonical and not is_alias_of(name, canonical)]
+            if stale:
+                with self._conn:
+                    self._conn.executemany('DELETE FROM company_aliases WHERE alias = ?', stale)
+                logger.warning("Dropped %d company aliases that name other companies", len(stale))
+            stale = {alias for alias, in stale}
+            for alias, canonical, name in rows:
+                if alias in stale:
+                    continue
+                self._aliases[alias] = canonical
+                if alias == canonical:
+                    self._names[canonical] = name
+
+    def canonical_key(self, company_name: str) -> str:
+        """The key shared by every known spelling of this company."""
+        key = normalize_company(company_name)
+        return self._aliases.get(key, key)
+
+    def learn(self, company_name: str, employees: Iterable[Dict[str, Any]]) -> int:
+        """Record a searched company and the company names in its results; returns aliases added."""
+        canonical = self.canonical_key(company_name)
+        if not canonical:
+            return 0
+        if canonical not in self._names:
+            self._add(canonical, canonical, ' '.join(company_name.split()))
+
+        added = 0
+        for employee in employees:
+            name = title_company_name(employee.get('title_company'))
+            if name is None:
+                continue
+            alias = normalize_company(name)
+            # Known names (including everything searched for) keep their mapping
+            if alias in self._aliases or not is_alias_of(name, canonical):
+                continue
+
+            with self._lock:
+                if len(self._pending) >= MAX_PENDING_ALIASES:
+                    self._pending.clear()
+                people = self._pending.setdefault((canonical, alias), set())
+                people.add(employee.get('profile_url') or employee.get('name'))
+                if len(people) < self.min_seen:
+                    continue
+                del self._pending[(canonical, alias)]
+            added += self._add(alias, canonical, name)
+        return added
+
+    def stats(self) -> Dict[str, int]:
+        """Known companies, aliases and aliases still gathering evidence."""
+        with self._lock:
+            return {
+                'companies': len(self._names),
+                'aliases': len(self._aliases) - len(self._names),
+                'pending_aliases': len(self._pending)
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _add(self, alias: str, canonical: str, name: str) -> int:
+        """Map alias to canonical (first mapping wins, here and across workers); 1 if it is new."""
+        with self._lock:
+            if alias in self._aliases:
+                return 0
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute('INSERT OR IGNORE INTO company_aliases (alias, canonical, name, learned_at) '
+                                       'VALUES (?, ?, ?, ?)', (alias, canonical, name, time.time()))
+                    canonical, name = self._conn.execute(
+                        'SELECT canonical, name FROM company_aliases WHERE alias = ?', (alias,)).fetchone()
+            self._aliases[alias] = canonical
+            if alias == canonical:
+                self._names[canonical] = name
+        if alias != canonical:
+            logger.info("Learned company alias: %r -> %r", name, self._names.get(canonical, canonical))
+        return 1
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_company_index() -> CompanyIndex:
+    """The process-wide index at COMPANY_INDEX_PATH."""
+    global _shared_index
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = CompanyIndex()
+    return _shared_index
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Persistent Employee Store
+SQLite store of employee records from search results, so companies
+searched recently are answered without re-scraping. Off unless
+EMPLOYEE_STORE_PATH is set:
+
+1. Records are keyed by profile_url per LinkedIn member (degree and mutual
+   connections depend on who is looking), with indexes on company and
+   connection strength. A session whose member can't be resolved is
+   scraped without the store
+2. Each record tracks when it was first and last seen; records and
+   companies unseen for EMPLOYEE_STORE_RETENTION are deleted
+3. A company refreshed within EMPLOYEE_STORE_MAX_AGE is served from disk,
+   as long as that refresh read at least as many results as are asked for
+   (or every result LinkedIn had)
+4. Refreshes are incremental: once the stored results reach the limit,
+   paging stops at the first page whose records are all already stored and
+   unchanged (unless the refresh is forced). A refresh that reads every
+   result, with no failed page, drops stored employees it did not see
+5. A refresh whose first page fails raises, and the company is not marked
+   refreshed
+6. query() searches stored employees across companies with no network I/O
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+from records import Employee, EMPLOYEE_FIELDS
+from result_cache import normalize_company_name
+from scraping import MAX_SEARCH_PAGES, RESULTS_PER_PAGE
+
+DEFAULT_PATH = os.environ.get('EMPLOYEE_STORE_PATH', '')
+DEFAULT_MAX_AGE = float(os.environ.get('EMPLOYEE_STORE_MAX_AGE', '3600'))
+DEFAULT_RETENTION = float(os.environ.get('EMPLOYEE_STORE_RETENTION', '604800'))
+
+# Seconds between sweeps for records older than the retention
+EXPIRE_INTERVAL = 3600
+
+# Employee fields are stored as columns
+BOOLEAN_FIELDS = frozenset(['can_message', 'can_connect'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    viewer TEXT NOT NULL,
+    profile_url TEXT NOT NULL,
+    company TEXT NOT NULL,
+    name TEXT,
+    title_company TEXT,
+    location TEXT,
+    mutual_connections INTEGER,
+    connection_degree TEXT,
+    connection_strength INTEGER,
+    can_message INTEGER,
+    can_connect INTEGER,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (viewer, profile_url)
+);
+CREATE INDEX IF NOT EXISTS employees_company ON employees (viewer, company, connection_strength DESC);
+CREATE INDEX IF NOT EXISTS employees_strength ON employees (viewer, connection_strength DESC);
+CREATE TABLE IF NOT EXISTS companies (
+    viewer TEXT NOT NULL,
+    company TEXT NOT NULL,
+    display_name TEXT,
+    refreshed_at REAL NOT NULL,
+    depth INTEGER NOT NULL DEFAULT 0,
+    exhausted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (viewer, company)
+);
+"""
+
+# Columns added to `companies` after it was first created
+COMPANY_COLUMNS = {
+    'depth': 'INTEGER NOT NULL DEFAULT 0',
+    'exhausted': 'INTEGER NOT NULL DEFAULT 0',
+}
+
+
+class SearchPageError(Exception):
+    """A refresh could not fetch any page of a company's results."""
+
+
+class EmployeeStore:
+    """Thread-safe SQLite store of scraped employees."""
+
+    def __init__(self, path: str = DEFAULT_PATH, max_age: float = DEFAULT_MAX_AGE,
+                 retention: float = DEFAULT_RETENTION):
+        """Open (or create) the store at `path`; companies older than max_age seconds are re-scraped,
+        and records unseen for `retention` seconds deleted."""
+        self.path = path
+        self.max_age = max_age
+        self.retention = retention
+        self._expired_at = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            # Let other gunicorn workers read while one writes
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(companies)')}
+        for column, definition in COMPANY_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE companies ADD COLUMN {column} {definition}')
+        self.expire()
+
+    def search(self, scraper, company_name: str, limit: int = 150, force_refresh: bool = False) -> Dict[str, Any]:
+        """search_company_employees() answered from the store, refreshing it if stale (or forced).
+
+        Raises SearchPageError if a refresh could not fetch the first page.
+        """
+        viewer = scraper.resolve_viewer()
+        if viewer is None:
+            return scraper.search_company_employees(company_name, limit)
+        company = normalize_company_name(company_name)
+
+        if force_refresh or not self.is_fresh(viewer, company, limit):
+            self.refresh(scraper, viewer, company_name, limit, incremental=not force_refresh)
+
+        return scraper.rank_employees(company_name, self._company_employees(viewer, company, limit), limit,
+                                      self._exhausted(viewer, company))
+
+    def is_fresh(self, viewer: str, company: str, limit: int = 0) -> bool:
+        """Whether the company was refreshed within max_age, reading at least `limit` results (or all)."""
+        row = self._company_row(viewer, company)
+        return (row is not None and time.time() - row['refreshed_at'] < self.max_age
+                and (row['exhausted'] or row['depth'] >= limit))
+
+    def refresh(self, scraper, viewer: str, company_name: str, limit: int = 150, incremental: bool = True) -> int:
+        """Scrape up to `limit` results into the store. Returns pages fetched.
+
+        Incremental refreshes of a company already stored to `limit` stop at
+        the first page holding nothing new or changed. Raises SearchPageError if the first
+        page could not be fetched.
+        """
+        company = normalize_company_name(company_name)
+        previous = self._company_row(viewer, company)
+        started = time.time()
+
+        # Stopping early relies on the stored results already reaching `limit`
+        incremental = incremental and previous is not None and (previous['exhausted'] or previous['depth'] >= limit)
+
+        outcome = {}
+        pages = scraper._iter_search_pages(company_name, limit, outcome)
+        fetched = 0
+        depth = 0
+        unchanged = False
+        try:
+            for employees in pages:
+                fetched += 1
+                depth += len(employees)
+                changed = self.upsert(viewer, company, employees)
+                if incremental and not changed:
+                    unchanged = True
+                    break
+        finally:
+            pages.close()
+
+        if not fetched and outcome.get('failed_page') is not None:
+            raise SearchPageError(f'LinkedIn search for {company_name} failed on its first page')
+
+        # A later page that failed leaves the rest of the results unknown
+        exhausted = bool(outcome.get('exhausted')) and outcome.get('failed_page') is None
+        if unchanged:
+            # The rest of the results are taken to be as stored
+            depth = max(depth, previous['depth'])
+            exhausted = bool(previous['exhausted'])
+
+        with self._lock, self._conn:
+            # An empty first page (which a signed-out session also gets) removes no one
+            if exhausted and fetched and not unchanged:
+                # Every current result was just seen; anyone else has left the company
+                self._conn.execute('DELETE FROM employees WHERE viewer = ? AND company = ? AND last_seen < ?',
+                                   (viewer, company, started))
+            self._conn.execute('INSERT OR REPLACE INTO companies (viewer, company, display_name, refreshed_at, '
+                               'depth, exhausted) VALUES (?, ?, ?, ?, ?, ?)',
+                               (viewer, company, company_name, time.time(),
+                                MAX_SEARCH_PAGES * RESULTS_PER_PAGE if exhausted else depth, int(exhausted)))
+        if time.time() - self._expired_at >= EXPIRE_INTERVAL:
+            self.expire()
+        return fetched
+
+    def upsert(self, viewer: str, company: str, employees: Iterable[Dict[str, Any]]) -> int:
+        """Insert or update employees; returns how many were new or changed."""
+        now = time.time()
+        # A profile listed twice on one page is stored once
+        employees = list({employee['profile_url']: employee for employee in reversed(list(employees))
+                          if employee.get('profile_url')}.values())
+        if not employees:
+            return 0
+
+        with self._lock, self._conn:
+            urls = [employee['profile_url'] for employee in employees]
+            placeholders = ','.join('?' * len(urls))
+            stored = {row['profile_url']: row for row in self._conn.execute(
+                f'SELECT * FROM employees WHERE viewer = ? AND profile_url IN ({placeholders})', [viewer] + urls)}
+
+            changed = 0
+            for employee in employees:
+                values = [self._to_column(field, employee.get(field)) for field in EMPLOYEE_FIELDS]
+                row = stored.get(employee['profile_url'])
+
+                if row is None:
+                    self._conn.execute(
+                        f"INSERT INTO employees (viewer, company, {', '.join(EMPLOYEE_FIELDS)}, first_seen, last_seen) "
+                        f"VALUES (?, ?, {', '.join('?' * len(EMPLOYEE_FIELDS))}, ?, ?)",
+                        [viewer, company] + values + [now, now])
+                    changed += 1
+                elif row['company'] != company or [row[field] for field in EMPLOYEE_FIELDS] != values:
+                    self._conn.execute(
+                        f"UPDATE employees SET company = ?, {', '.join(f'{field} = ?' for field in EMPLOYEE_FIELDS)}, "
+                        f"last_seen = ? WHERE viewer = ? AND profile_url = ?",
+                        [company] + values + [now, viewer, employee['profile_url']])
+                    changed += 1
+                else:
+                    self._conn.execute('UPDATE employees SET last_seen = ? WHERE viewer = ? AND profile_url = ?',
+                                       (now, viewer, employee['profile_url']))
+        return changed
+
+    def query(self, viewer: str, companies: Optional[List[str]] = None, min_strength: int = 0,
+              degree: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Stored employees for this member, strongest first, optionally filtered by company and degree."""
+        clauses = ['viewer = ?', 'connection_strength >= ?']
+        params = [viewer, min_strength]
+
+        if companies:
+            names = [normalize_company_name(company) for company in companies]
+            clauses.append(f"company IN ({','.join('?' * len(names))})")
+            params.extend(names)
+        if degree:
+            clauses.append('connection_degree = ?')
+            params.append(degree)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM employees WHERE {' AND '.join(clauses)} "
+                f"ORDER BY connection_strength DESC, first_seen LIMIT ? OFFSET ?", params + [limit, offset]
+            ).fetchall()
+
+        return [dict(self._to_employee(row), company=row['company'], first_seen=row['first_seen'],
+                     last_seen=row['last_seen']) for row in rows]
+
+    def expire(self) -> int:
+        """Delete employees and companies unseen for the retention period; returns employees deleted."""
+        cutoff = time.time() - self.retention
+        with self._lock, self._conn:
+            deleted = self._conn.execute('DELETE FROM employees WHERE last_seen < ?', (cutoff,)).rowcount
+            self._conn.execute('DELETE FROM companies WHERE refreshed_at < ?', (cutoff,))
+            self._expired_at = time.time()
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        """Stored employee and company counts."""
+        with self._lock:
+            employees = self._conn.execute('SELECT COUNT(*) FROM employees').fetchone()[0]
+            companies = self._conn.execute('SELECT COUNT(*) FROM companies').fetchone()[0]
+        return {'employees': employees, 'companies': companies}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _company_row(self, viewer: str, company: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute('SELECT * FROM companies WHERE viewer = ? AND company = ?',
+                                      (viewer, company)).fetchone()
+
+    def _exhausted(self, viewer: str, company: str) -> bool:
+        """Whether the company's last refresh read every result LinkedIn had."""
+        row = self._company_row(viewer, company)
+        return row is not None and bool(row['exhausted'])
+
+    def _company_employees(self, viewer: str, company: str, limit: int) -> List[Employee]:
+        """A company's stored employees, strongest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT * FROM employees WHERE viewer = ? AND company = ? '
+                'ORDER BY connection_strength DESC, first_seen LIMIT ?', (viewer, company, limit)
+            ).fetchall()
+        return [self._to_employee(row) for row in rows]
+
+    def _to_employee(self, row: sqlite3.Row) -> Employee:
+        """Employee record as _extract_employee_data() produces it."""
+        return Employee(*(bool(row[field]) if field in BOOLEAN_FIELDS else row[field] for field in EMPLOYEE_FIELDS))
+
+    def _to_column(self, field: str, value: Any) -> Any:
+        return int(bool(value)) if field in BOOLEAN_FIELDS else value
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Backends
+Builds BeautifulSoup trees for LinkedIn pages with a configurable backend:
+
+- html.parser: pure-Python stdlib parser (default)
+- lxml: libxml2-based tree builder
+- selectolax: lexbor locates the parts we read in C, and only those
+  fragments are handed to BeautifulSoup
+
+Restricted parsing makes html.parser/lxml build a tree for the result
+items or experience section only (SoupStrainer) instead of the whole
+several-hundred-KB page. Every backend returns a soup that the existing
+find()/find_all() lookups work on unchanged.
+
+Streaming parsing feeds a search page to an incremental tokenizer as it is
+downloaded and hands back each result item's markup as soon as its closing
+tag arrives, so neither the page text nor a whole-page tree is held.
+"""
+
+import importlib.util
+import logging
+import os
+import re
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_PARSER_BACKEND = os.environ.get('SCRAPER_PARSER_BACKEND', 'html.parser')
+DEFAULT_RESTRICTED_PARSING = os.environ.get('SCRAPER_RESTRICTED_PARSING', '').lower() in ('1', 'true', 'yes')
+DEFAULT_STREAM_PARSING = os.environ.get('SCRAPER_STREAM_PARSING', '').lower() in ('1', 'true', 'yes')
+
+RESULT_CONTAINER_CLASS = 'reusable-search__result-container'
+
+# Class tokens, matched the way find_all(class_=...) matches multi-valued classes
+RESULT_ITEMS = SoupStrainer('li', class_=re.compile(r'(?:^|\s)%s(?:\s|$)' % RESULT_CONTAINER_CLASS))
+EXPERIENCE_SECTION = SoupStrainer('section', attrs={'data-section': 'experience'})
+EXPERIENCE_DIV = SoupStrainer('div', id='experience')
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_backend(name: str) -> str:
+    """Validate a backend name, falling back to html.parser if it isn't installed."""
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}', expected one of {', '.join(PARSER_BACKENDS)}")
+
+    if name != 'html.parser' and importlib.util.find_spec(name) is None:
+        logger.warning("Parser backend '%s' is not installed, falling back to html.parser", name)
+        return 'html.parser'
+    return name
+
+
+def parse_search_page(html: str, backend: str = DEFAULT_PARSER_BACKEND,
+                      restricted: bool = DEFAULT_RESTRICTED_PARSING) -> BeautifulSoup:
+    """Soup for a people-search page; restricted trees hold only the result items."""
+    if backend == 'selectolax':
+        return _selectolax_result_items(html)
+    return BeautifulSoup(html, backend, parse_only=RESULT_ITEMS if restricted else None)
+
+
+def parse_profile_page(html: str, backend: str = DEFAULT_PARSER_BACKEND,
+                       restricted: bool = DEFAULT_RESTRICTED_PARSING) -> BeautifulSoup:
+    """Soup for a profile page; restricted trees hold only the experience section."""
+    if backend == 'selectolax':
+        return _selectolax_experience_section(html)
+    if not restricted:
+        return BeautifulSoup(html, backend)
+
+    # The section form takes precedence over the div form wherever it appears,
+    # so the div is only parsed for when there is no section
+    soup = BeautifulSoup(html, backend, parse_only=EXPERIENCE_SECTION)
+    if soup.find('section', {'data-section': 'experience'}):
+        return soup
+    return BeautifulSoup(html, backend, parse_only=EXPERIENCE_DIV)
+
+
+def iter_result_fragments(chunks: Iterable[str]) -> Iterator[str]:
+    """Markup of each outermost result item in a page arriving as text chunks, in page order."""
+    stream = ResultItemStream()
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
+
+
+class ResultItemStream(HTMLParser):
+    """Incremental tokenizer that keeps only the result item currently open.
+
+    Markup outside result items is tokenized and dropped. Inside one, tokens
+    are written back out as source text, so parsing a fragment yields the
+    same subtree a whole-page parse would.
+    """
+
+    def __init__(self):
+        # Character references stay as written; the fragment parser resolves them
+        super().__init__(convert_charrefs=False)
+        self._parts = []
+        self._depth = 0
+        self._done = []
+
+    def feed(self, data: str) -> List[str]:
+        """Tokenize the next chunk; returns the result items it completed."""
+        super().feed(data)
+        return self._take_done()
+
+    def close(self) -> List[str]:
+        """Finish the page; an item left open by a truncated page is returned as is."""
+        super().close()
+        if self._depth:
+            self._done.append(''.join(self._parts))
+            self._parts = []
+            self._depth = 0
+        return self._take_done()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'li':
+            if self._depth:
+                self._depth += 1
+            elif RESULT_CONTAINER_CLASS in (dict(attrs).get('class') or '').split():
+                self._depth = 1
+        self._write(self.get_starttag_text())
+
+    def handle_startendtag(self, tag, attrs):
+        self._write(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if not self._depth:
+            return
+        self._parts.append(f'</{tag}>')
+        if tag == 'li':
+            self._depth -= 1
+            if not self._depth:
+                self._done.append(''.join(self._parts))
+                self._parts = []
+
+    def handle_data(self, data):
+        self._write(data)
+
+    def handle_entityref(self, name):
+        self._write(f'&{name};')
+
+    def handle_charref(self, name):
+        self._write(f'&#{name};')
+
+    def handle_comment(self, data):
+        self._write(f'<!--{data}-->')
+
+    def handle_decl(self, decl):
+        self._write(f'<!{decl}>')
+
+    def handle_pi(self, data):
+        self._write(f'<?{data}>')
+
+    def unknown_decl(self, data):
+        self._write(f'<![{data}]>')
+
+    def _write(self, text: str) -> None:
+        if self._depth:
+            self._parts.append(text)
+
+    def _take_done(self) -> List[str]:
+        done, self._done = self._done, []
+        return done
+
+
+def _selectolax_result_items(html: str) -> BeautifulSoup:
+    """Locate outermost result items with lexbor and soup only those."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    fragments = [
+        node.html for node in tree.css(f'li.{RESULT_CONTAINER_CLASS}')
+        if not _has_result_item_ancestor(node)
+    ]
+    return BeautifulSoup(''.join(fragments), 'html.parser')
+
+
+def _selectolax_experience_section(html: str) -> BeautifulSoup:
+    """Locate the experience section with lexbor and soup only that."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    node = tree.css_first('section[data-section="experience"]') or tree.css_first('div#experience')
+    return BeautifulSoup(node.html if node is not None else '', 'html.parser')
+
+
+def _has_result_item_ancestor(node) -> bool:
+    """Nested result items are already inside their ancestor's fragment."""
+    parent = node.parent
+    while parent is not None:
+        if parent.tag == 'li' and RESULT_CONTAINER_CLASS in (parent.attributes.get('class') or '').split():
+            return True
+        parent = parent.parent
+    return False
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Warm Introduction Graph
+In-memory graph of the connections seen in search results, answering
+"who on my team can introduce me to people at company X":
+
+1. Nodes are people keyed by profile_url, indexed by (canonical) company;
+   each scraped result adds an edge from the viewer to the person with its
+   degree, mutual connection count and connection_strength. A viewer is a
+   LinkedIn member (their public profile id, read from the profile page),
+   so their edges survive cookie rotation
+2. Teams are groups of viewers from INTRO_GRAPH_TEAMS ("alice,bob;carol",
+   public profile ids). A viewer only sees people they or a teammate have
+   seen, and only teammates are offered as introducers; without a team a
+   viewer sees their own connections only
+3. intro_paths() ranks a company's people for one viewer by the
+   connection_strength weights: a direct connection scores as itself, an
+   introduction by a teammate counts as a 2nd-degree path with one more
+   mutual connection, and otherwise the viewer's own 2nd/3rd-degree edge is
+   used. The last INTRO_GRAPH_CACHED_QUERIES rankings are kept per viewer
+   and company until that company's people or edges change
+
+The graph is snapshotted as JSON to INTRO_GRAPH_PATH (empty: memory only)
+every INTRO_GRAPH_SNAPSHOT_SECONDS while it changes and at exit, and loaded
+at start. Snapshots from other gunicorn workers are merged in before each
+write, newest observation winning.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional
+
+from company_index import get_company_index
+from records import connection_strength
+
+DEFAULT_PATH = os.environ.get('INTRO_GRAPH_PATH', 'intro_graph.json')
+DEFAULT_SNAPSHOT_SECONDS = float(os.environ.get('INTRO_GRAPH_SNAPSHOT_SECONDS', '300'))
+DEFAULT_TEAMS = os.environ.get('INTRO_GRAPH_TEAMS', '')
+DEFAULT_MAX_CACHED_QUERIES = int(os.environ.get('INTRO_GRAPH_CACHED_QUERIES', '1024'))
+DEFAULT_LIMIT = 20
+
+# Version 1 snapshots were keyed by cookie fingerprint and are not loaded
+SNAPSHOT_VERSION = 2
+
+# Edge tuple fields
+DEGREE, MUTUAL, STRENGTH, SEEN_AT = range(4)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_teams(spec: str) -> List[frozenset]:
+    """Teams of public profile ids from "alice,bob;carol,dave"."""
+    teams = (frozenset(member.strip() for member in team.split(',') if member.strip()) for team in spec.split(';'))
+    return [team for team in teams if team]
+
+
+class IntroGraph:
+    """Thread-safe graph of observed connections with per-company adjacency indexes."""
+
+    def __init__(self, path: str = DEFAULT_PATH, snapshot_seconds: float = DEFAULT_SNAPSHOT_SECONDS,
+                 teams: Optional[Iterable[Iterable[str]]] = None,
+                 max_cached_queries: int = DEFAULT_MAX_CACHED_QUERIES):
+        """Load the snapshot at `path` if there is one ('' keeps the graph in memory only).
+
+        teams defaults to INTRO_GRAPH_TEAMS.
+        """
+        self.path = path
+        self.snapshot_seconds = snapshot_seconds
+        self.max_cached_queries = max(1, max_cached_queries)
+        # viewer -> their teammates (every team they are in)
+        self._teammates = {}
+        for team in (parse_teams(DEFAULT_TEAMS) if teams is None else teams):
+            team = frozenset(team)
+            for viewer in team:
+                self._teammates[viewer] = self._teammates.get(viewer, frozenset()) | (team - {viewer})
+        # profile_url -> {'name', 'title_company', 'location', 'company'}
+        self._people = {}
+        # profile_url -> {viewer: (degree, mutual_connections, strength, seen_at)}
+        self._edges = {}
+        # company key -> set of profile_urls
+        self._by_company = {}
+        # company key -> change counter; (viewer, company) -> (version, ranking, response dicts), LRU
+        self._versions = {}
+        self._paths = OrderedDict()
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._dirty = False
+        self._snapshot_at = time.monotonic()
+        self._snapshot_mtime = 0.0
+        self.queries = 0
+        self.cached_queries = 0
+
+        if path and os.path.exists(path):
+            try:
+                self._merge_snapshot(self._read_snapshot())
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Ignoring unreadable intro graph snapshot %s: %s", path, e)
+
+    def observe(self, viewer: str, company_name: str, employees: Iterable[Dict[str, Any]],
+                verified: bool = True) -> None:
+        """Add one page of a viewer's search results for a company.
+
+        Unverified results (a keyword search, which also finds ex-employees and
+        anyone mentioning the name) only update the viewer's edges to people
+        already in the graph; they never place anyone at the company.
+        """
+        company = get_company_index().canonical_key(company_name)
+        now = time.time()
+        with self._lock:
+            changed = set()
+            for employee in employees:
+                url = employee.get('profile_url')
+                if not url:
+                    continue
+                if verified:
+                    person = {'name': employee.get('name'), 'title_company': employee.get('title_company'),
+                              'location': employee.get('location'), 'company': company}
+                else:
+                    person = self._people.get(url)
+                    if person is None:
+                        continue
+                edge = (employee.get('connection_degree'), employee.get('mutual_connections') or 0,
+                        employee.get('connection_strength') or 0, now)
+                if self._add(url, person, viewer, edge):
+                    changed.add(person['company'])
+            for changed_company in changed:
+                self._versions[changed_company] = self._versions.get(changed_company, 0) + 1
+            self._dirty = self._dirty or bool(changed)
+
+        if self.path and self._dirty and time.monotonic() - self._snapshot_at >= self.snapshot_seconds:
+            self._snapshot_at = time.monotonic()
+            threading.Thread(target=self.snapshot, name='intro-graph-snapshot', daemon=True).start()
+
+    def intro_paths(self, viewer: str, company_name: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Best ways for this viewer, or a teammate's introduction, to reach people at the company."""
+        company = get_company_index().canonical_key(company_name)
+        key = (viewer, company)
+        with self._lock:
+            self.queries += 1
+            version = self._versions.get(company, 0)
+            cached = self._paths.get(key)
+            if cached is not None and cached[0] == version:
+                self.cached_queries += 1
+            else:
+                cached = self._paths[key] = (version, self._rank(viewer, company), [])
+            self._paths.move_to_end(key)
+            while len(self._paths) > self.max_cached_queries:
+                self._paths.popitem(last=False)
+
+            # Response dicts are built for the ranked prefix asked for so far
+            _, ranked, paths = cached
+            for entry in ranked[len(paths):limit]:
+                paths.append(self._path(viewer, entry))
+            return paths[:limit]
+
+    def stats(self) -> Dict[str, int]:
+        """Graph size and query counters."""
+        with self._lock:
+            return {
+                'people': len(self._people),
+                'edges': sum(len(edges) for edges in self._edges.values()),
+                'companies': len(self._by_company),
+                'viewers': len({viewer for edges in self._edges.values() for viewer in edges}),
+                'cached_rankings': len(self._paths),
+                'queries': self.queries,
+                'cached_queries': self.cached_queries
+            }
+
+    def snapshot(self) -> bool:
+        """Merge in newer snapshots from other workers, then write this graph to `path`."""
+        if not self.path or not self._snapshot_lock.acquire(blocking=False):
+            return False
+        try:
+            try:
+                if os.path.getmtime(self.path) > self._snapshot_mtime:
+                    data = self._read_snapshot()
+                    with self._lock:
+                        self._merge_snapshot(data)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Ignoring unreadable intro graph snapshot %s: %s", self.path, e)
+
+            with self._lock:
+                # Copied under the lock, encoded outside it (edge tuples and people are never mutated)
+                data = {
+                    'version': SNAPSHOT_VERSION,
+                    'people': dict(self._people),
+                    'edges': {url: dict(edges) for url, edges in self._edges.items()}
+                }
+                self._dirty = False
+                self._snapshot_at = time.monotonic()
+            body = json.dumps(data, separators=(',', ':'))
+
+            temporary = f'{self.path}.{os.getpid()}.tmp'
+            with open(temporary, 'w') as f:
+                f.write(body)
+            os.replace(temporary, self.path)
+            self._snapshot_mtime = os.path.getmtime(self.path)
+            return True
+        except OSError as e:
+            logger.warning("Intro graph snapshot failed: %s", e)
+            return False
+        finally:
+            self._snapshot_lock.release()
+
+    def close(self) -> None:
+        """Write a final snapshot if anything changed."""
+        if self._dirty:
+            self.snapshot()
+
+    def _add(self, url: str, person: Dict[str, Any], viewer: str, edge: tuple) -> bool:
+        """Store a person and an edge to them (caller holds the lock); True if the graph changed."""
+        known = self._people.get(url)
+        changed = known != person
+        if changed:
+            if known is not None and known['company'] != person['company']:
+                # They moved: out of the old company's index
+                self._by_company.get(known['company'], set()).discard(url)
+                self._versions[known['company']] = self._versions.get(known['company'], 0) + 1
+            self._people[url] = person
+            self._by_company.setdefault(person['company'], set()).add(url)
+
+        edges = self._edges.setdefault(url, {})
+        previous = edges.get(viewer)
+        if previous is not None and previous[SEEN_AT] > edge[SEEN_AT]:
+            return changed
+        edges[viewer] = edge
+        return changed or previous is None or previous[:SEEN_AT] != edge[:SEEN_AT]
+
+    def _rank(self, viewer: str, company: str) -> List[tuple]:
+        """Every person at the company this viewer's team can reach as (-score, -introducer strength, url,
+        introducer), best first (lock held)."""
+        teammates = self._teammates.get(viewer, ())
+        ranked = []
+        for url in self._by_company.get(company, ()):
+            edges = self._edges[url]
+            own = edges.get(viewer)
+            # The teammate with the strongest 1st-degree connection to them
+            best = max(((edges[teammate][STRENGTH], teammate) for teammate in teammates
+                        if teammate in edges and edges[teammate][DEGREE] == '1st'), default=None)
+
+            if own is not None and own[DEGREE] == '1st':
+                ranked.append((-own[STRENGTH], 0, url, None))
+            elif best is not None:
+                # A teammate's direct connection is one more mutual connection on a 2nd-degree path
+                mutual = own[MUTUAL] if own is not None else 0
+                ranked.append((-connection_strength(mutual + 1, '2nd'), -best[0], url, best[1]))
+            elif own is not None:
+                ranked.append((-own[STRENGTH], 0, url, None))
+
+        ranked.sort()
+        return ranked
+
+    def _path(self, viewer: str, ranked: tuple) -> Dict[str, Any]:
+        """A ranked entry in the response shape (lock held)."""
+        score, introducer_strength, url, introducer = ranked
+        own = self._edges[url].get(viewer)
+        person = self._people[url]
+        if introducer is not None:
+            hops = 2
+        else:
+            hops = 1 if own[DEGREE] == '1st' else 2 if own[DEGREE] == '2nd' else 3
+        return {
+            'profile_url': url,
+            'name': person['name'],
+            'title_company': person['title_company'],
+            'location': person['location'],
+            'score': -score,
+            'hops': hops,
+            'connection_degree': own[DEGREE] if own is not None else None,
+            'mutual_connections': own[MUTUAL] if own is not None else 0,
+            'introducer': introducer,
+            'introducer_strength': -introducer_strength if introducer else None
+        }
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"snapshot version {data.get('version')}")
+        return data
+
+    def _merge_snapshot(self, data: Dict[str, Any]) -> None:
+        """Fold a snapshot into the graph, newest edge per (person, viewer) winning (lock held)."""
+        for url, edges in data['edges'].items():
+            person = data['people'].get(url)
+            if person is None:
+                continue
+            known = self._people.get(url)
+            if known is not None:
+                newest_known = max(edge[SEEN_AT] for edge in self._edges[url].values())
+                newest_loaded = max(edge[SEEN_AT] for edge in edges.values())
+                if newest_known >= newest_loaded:
+                    person = known
+            for viewer, edge in edges.items():
+                if self._add(url, person, viewer, tuple(edge)):
+                    self._versions[person['company']] = self._versions.get(person['company'], 0) + 1
+
+
+_shared_graph = None
+_shared_graph_lock = threading.Lock()
+
+
+def get_intro_graph() -> IntroGraph:
+    """The process-wide graph at INTRO_GRAPH_PATH, snapshotted at exit."""
+    global _shared_graph
+    if _shared_graph is None:
+        with _shared_graph_lock:
+            if _shared_graph is None:
+                _shared_graph = IntroGraph()
+                atexit.register(_shared_graph.close)
+    return _shared_graph
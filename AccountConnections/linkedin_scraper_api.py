@@ -2,24 +2,60 @@
 """
 LinkedIn Company Employee Scraper API
 Extracts real employee data from LinkedIn company pages
+
+/scrape returns the same fields as before LinkedInScraper moved onto
+scraping.py's parser, but some values changed:
+- missing values: name is "Unknown" (was "LinkedIn User"), title_company
+  and location are "" (were "Professional at <company>" and "Unknown
+  Location"), profile_url is null (was "#")
+- connection_degree falls back to "3rd+" (was "3rd"), so can_connect is
+  false when no degree is shown
+- mutual_connections is read from the result, 0 when not shown (was a
+  random 0-25)
+- connection_strength is 100/50/10 for 1st/2nd/3rd, else 0, plus 5 per
+  mutual connection (was 100/50/10, else 5, plus 2 per mutual connection)
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, url_for
 from flask_cors import CORS
-import requests
-from bs4 import BeautifulSoup
 import json
-import time
-import random
-from urllib.parse import quote, urljoin
-import re
+from urllib.parse import urljoin
+from contextlib import nullcontext
+import metrics
+import profiling
+import records
+from scrape_jobs import ScrapeJobManager, QueueFullError
+from scraping import (
+    LinkedInCompanyConnectionScraper,
+    cookie_fingerprint,
+    COOKIE_DOMAIN,
+    RESULTS_PER_PAGE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_BURST,
+)
+from scraper_pool import ScraperPool
+from company_index import get_company_index
+from result_cache import ResultCache, normalize_company_name
 
 app = Flask(__name__)
+app.json = records.FastJSONProvider(app)
 CORS(app)
+metrics.instrument_flask(app, 'linkedin_scraper_api')
+profiling.instrument_flask(app, 'linkedin_scraper_api')
+
+job_manager = ScrapeJobManager()
+
+class LinkedInScraper(LinkedInCompanyConnectionScraper):
+    """Keyword people search sharing the fetch/parse pipeline of scraping.py.
 
-class LinkedInScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    Only the page fetches are rate limited (SCRAPER_REQUESTS_PER_SECOND);
+    parsing and extraction run at full speed while the token bucket refills.
+    """
+    
+    def __init__(self, parser_backend=None, restricted_parsing=None, max_workers=DEFAULT_MAX_WORKERS,
+                 requests_per_second=DEFAULT_REQUESTS_PER_SECOND, burst=DEFAULT_BURST):
+        super().__init__({}, max_workers, requests_per_second, burst, parser_backend, restricted_parsing)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -30,79 +66,74 @@ class LinkedInScraper:
         })
     
     def set_cookies(self, cookies_dict):
-        """Set LinkedIn session cookies"""
+        """Set LinkedIn session cookies (the member they belong to is looked up again)"""
         for name, value in cookies_dict.items():
-            self.session.cookies.set(name, value, domain='.linkedin.com')
+            self.session.cookies.set(name, value, domain=COOKIE_DOMAIN)
+        self.viewer = None
+        self._viewer_checked_at = None
     
-    def scrape_company_employees(self, company_name, limit=50):
-        """Scrape employees from LinkedIn company search"""
+    def scrape_company_employees(self, company_name, limit=50, on_page=None):
+        """Scrape employees from LinkedIn company search; on_page is called with each page's employees"""
         try:
-            # Search for the company first
-            search_url = f"https://www.linkedin.com/search/results/people/?keywords={quote(company_name)}&origin=GLOBAL_SEARCH_HEADER"
-            
-            response = self.session.get(search_url)
-            if response.status_code != 200:
-                raise Exception(f"Failed to access LinkedIn search: {response.status_code}")
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract employee data from search results
             employees = []
-            search_results = soup.find_all('div', class_='entity-result__content')
-            
-            for result in search_results[:limit]:
-                employee = self.extract_employee_data(result, company_name)
-                if employee:
-                    employees.append(employee)
-                
-                # Rate limiting
-                time.sleep(random.uniform(1, 3))
+            outcome = {}
+            for page in self._iter_search_pages(company_name, limit, outcome):
+                page = [self._flag_account_manager(employee) for employee in page]
+                employees.extend(page)
+                if on_page is not None:
+                    on_page(page)
+            employees = employees[:limit]
+            if outcome['failed_page'] == 0:
+                raise Exception(outcome.get('error') or 'Failed to access LinkedIn search')
             
             return {
                 'total_found': len(employees),
-                'employees': employees
+                'employees': employees,
+                'exhausted': outcome['exhausted'],
+                'failed_page': outcome['failed_page']
             }
             
         except Exception as e:
             raise Exception(f"Scraping failed: {str(e)}")
     
-    def extract_employee_data(self, result_element, company_name):
-        """Extract individual employee data from search result"""
-        try:
-            # Name
-            name_elem = result_element.find('span', {'aria-hidden': 'true'})
-            name = name_elem.text.strip() if name_elem else "LinkedIn User"
-            
-            # Title and company
-            title_elem = result_element.find('div', class_='entity-result__primary-subtitle')
-            title_company = title_elem.text.strip() if title_elem else f"Professional at {company_name}"
-            
-            # Location
-            location_elem = result_element.find('div', class_='entity-result__secondary-subtitle')
-            location = location_elem.text.strip() if location_elem else "Unknown Location"
-            
-            # Profile URL
-            link_elem = result_element.find_parent().find('a', href=True)
-            profile_url = link_elem['href'] if link_elem else "#"
-            
-            # Connection degree (extract from result)
-            connection_elem = result_element.find('span', string=re.compile(r'\d+(st|nd|rd|th)'))
-            degree = connection_elem.text.strip() if connection_elem else "3rd"
-            
-            # Calculate connection strength and capabilities
-            mutual_connections = random.randint(0, 25)
-            connection_strength = self.calculate_connection_strength(degree, mutual_connections)
-            
-            return {\n                'name': name,\n                'title_company': title_company,\n                'location': location,\n                'profile_url': profile_url,\n                'mutual_connections': mutual_connections,\n                'connection_degree': degree,\n                'connection_strength': connection_strength,\n                'can_message': degree in ['1st', '2nd'],\n                'can_connect': degree in ['2nd', '3rd'],\n                'is_verified_account_manager': 'manager' in title_company.lower() or 'director' in title_company.lower()\n            }
-            
-        except Exception as e:
-            print(f"Error extracting employee data: {e}")
-            return None
+    def _flag_account_manager(self, employee):
+        """This API's results also flag likely account managers (manager or director titles)"""
+        title_company = (employee.get('title_company') or '').lower()
+        return dict(employee, is_verified_account_manager='manager' in title_company or 'director' in title_company)
+    
+    def _search_params(self, company_name, page):
+        """Keyword search rather than the currentCompany facet"""
+        return {
+            'keywords': company_name,
+            'origin': 'GLOBAL_SEARCH_HEADER',
+            'start': page * RESULTS_PER_PAGE
+        }
     
-    def calculate_connection_strength(self, degree, mutual_connections):
-        """Calculate connection strength score"""
-        base_score = {'1st': 100, '2nd': 50, '3rd': 10}.get(degree, 5)
-        return base_score + (mutual_connections * 2)
+    def _fetch_search_page(self, company_name, page):
+        """Fetch and parse one page; a failed first page is an error, a later one ends the search"""
+        response = self._get_search_page(company_name, page)
+        if response.status_code != 200:
+            response.close()
+            if page == 0:
+                raise Exception(f"Failed to access LinkedIn search: {response.status_code}")
+            return None
+        
+        employees = self._parse_response(response)
+        # Keyword hits are not necessarily current employees of company_name
+        self._observe(company_name, employees, verified=False)
+        return employees
+
+def build_scraper(cookies):
+    """Pool factory: a LinkedInScraper carrying these session cookies."""
+    scraper = LinkedInScraper()
+    if cookies:
+        scraper.set_cookies(cookies)
+    return scraper
+
+scraper_pool = ScraperPool(build_scraper)
+
+# Keyword-search results, shared across gunicorn workers with SHARED_CACHE_BACKEND
+result_cache = ResultCache(namespace='keyword_results')
 
 @app.route('/scrape', methods=['POST'])
 def scrape_employees():
@@ -114,20 +145,28 @@ def scrape_employees():
         if not company_name:
             return jsonify({'error': 'Company name is required'}), 400
         
-        scraper = LinkedInScraper()
-        
-        # If cookies are provided, use them
-        if 'cookies' in data:
-            scraper.set_cookies(data['cookies'])
+        # Reuse this session's scraper (and its open connections) if pooled
+        cookies = data.get('cookies') or {}
+        scraper = scraper_pool.get(cookies)
         
-        result = scraper.scrape_company_employees(company_name, limit)
+        # One worker scrapes a company at a time; the others wait for its result
+        with (metrics.request_timings() if data.get('debug') else nullcontext()) as timings:
+            result, cache_status = result_cache.get_or_search(
+                cookies, company_name, limit,
+                lambda: scraper.scrape_company_employees(company_name, limit),
+                data.get('cache_control')
+            )
         
-        return jsonify({
+        response = {
             'company': company_name,
             'total_found': result['total_found'],
             'employees': result['employees'],
-            'success': True
-        })
+            'success': True,
+            'cache': dict(result_cache.stats(), status=cache_status)
+        }
+        if timings is not None:
+            response['timings'] = timings.to_dict()
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({
@@ -135,9 +174,65 @@ def scrape_employees():
             'success': False
         }), 500
 
+@app.route('/scrape/jobs', methods=['POST'])
+def create_scrape_job():
+    data = request.get_json()
+    company_name = data.get('company_name')
+    limit = data.get('limit', 50)
+    cookies = data.get('cookies', {})
+    
+    if not company_name:
+        return jsonify({'error': 'Company name is required'}), 400
+    
+    def run(job):
+        scraper = scraper_pool.get(cookies)
+        result = scraper.scrape_company_employees(company_name, limit,
+                                                  on_page=lambda page: job.record_page(len(page)))
+        return {
+            'company': company_name,
+            'total_found': result['total_found'],
+            'employees': result['employees']
+        }
+    
+    try:
+        key = (cookie_fingerprint(cookies), normalize_company_name(company_name), limit)
+        job, joined = job_manager.submit(key, run)
+    except QueueFullError as e:
+        return jsonify({'error': str(e), 'success': False}), 503
+    
+    return jsonify(dict(
+        job.to_status(),
+        joined=joined,
+        status_url=url_for('scrape_job_status', job_id=job.id),
+        result_url=url_for('scrape_job_result', job_id=job.id)
+    )), 202
+
+@app.route('/scrape/jobs/<job_id>', methods=['GET'])
+def scrape_job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job id'}), 404
+    
+    return jsonify(job.to_status())
+
+@app.route('/scrape/jobs/<job_id>/result', methods=['GET'])
+def scrape_job_result(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job id'}), 404
+    
+    if not job.finished:
+        return jsonify(job.to_status()), 202
+    
+    if job.status == 'failed':
+        return jsonify({'error': job.error, 'success': False}), 500
+    
+    return jsonify(dict(job.result, success=True))
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'service': 'linkedin-scraper'})
+    return jsonify({'status': 'healthy', 'service': 'linkedin-scraper', 'cache': result_cache.stats(),
+                    'companies': get_company_index().stats()})
 
 if __name__ == '__main__':
     print("Starting LinkedIn Scraper API on http://localhost:8000")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Scraper Metrics
+Counters and histograms for the scraping hot path, served in Prometheus
+text format, plus an optional per-request timing breakdown:
+
+    with metrics.request_timings() as timings:
+        results = scraper.search_company_employees(company, limit)
+    response['timings'] = timings.to_dict()
+
+Stages timed: fetch (status, bytes, latency), rate-limit sleep, parse,
+extract and rank. Cache lookups are counted per worker process. SCRAPER_METRICS=0 turns aggregation off; timers are then
+a shared no-op unless a request_timings() block is active.
+"""
+
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Iterator, Sequence, Tuple
+
+ENABLED = os.environ.get('SCRAPER_METRICS', '1').lower() not in ('0', 'false', 'no', 'off')
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (last is +Inf), sum
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                yield f'{self.name}_bucket{_format_labels(self.labelnames + ("le",), labels + (le,))} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}'
+            yield f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}'
+
+
+class RequestTimings:
+    """Per-request totals by stage, shared by every thread working on the request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            count, total = self._stages.get(stage, (0, 0.0))
+            self._stages[stage] = (count + 1, total + seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """{'total_ms': ..., 'stages': {stage: {'count': n, 'ms': ...}}}"""
+        with self._lock:
+            stages = dict(self._stages)
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'stages': {stage: {'count': count, 'ms': round(total * 1000, 2)}
+                       for stage, (count, total) in sorted(stages.items())}
+        }
+
+
+FETCH_SECONDS = Histogram('scraper_fetch_seconds', 'LinkedIn page fetch latency', ['status'])
+FETCH_BYTES = Counter('scraper_fetch_bytes_total', 'Bytes received from LinkedIn', ['status'])
+SLEEP_SECONDS = Counter('scraper_rate_limit_sleep_seconds_total', 'Time spent waiting on the rate limiter')
+STAGE_SECONDS = Histogram('scraper_stage_seconds', 'Time spent per scraping stage', ['stage'])
+HTTP_SECONDS = Histogram('http_request_duration_seconds', 'API request latency', ['app', 'endpoint', 'status'])
+CACHE_LOOKUPS = Counter('scraper_cache_lookups_total', 'Cache lookups by outcome, per worker process',
+                        ['cache', 'worker', 'status'])
+
+REGISTRY = (FETCH_SECONDS, FETCH_BYTES, SLEEP_SECONDS, STAGE_SECONDS, HTTP_SECONDS, CACHE_LOOKUPS)
+
+_current_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def active() -> bool:
+    """Whether anything would record a timing right now."""
+    return ENABLED or _current_timings.get() is not None
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """Collect a stage breakdown for work done inside the block (including threads given its context)."""
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def stage_timer(stage: str):
+    """Context manager timing one stage; a shared no-op when nothing is recording."""
+    if not active():
+        return _NOOP
+    return _StageTimer(stage)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    if ENABLED:
+        STAGE_SECONDS.observe(seconds, stage)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+def observe_fetch(status: int, nbytes: int, seconds: float) -> None:
+    """Record one LinkedIn fetch."""
+    if ENABLED:
+        FETCH_SECONDS.observe(seconds, str(status))
+        FETCH_BYTES.inc(nbytes, str(status))
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add('fetch', seconds)
+
+
+def observe_sleep(seconds: float) -> None:
+    """Record time spent waiting for a rate-limit token."""
+    if ENABLED:
+        SLEEP_SECONDS.inc(seconds)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add('sleep', seconds)
+
+
+def observe_cache(cache: str, status: str) -> None:
+    """Record one cache lookup (hit, shared or miss) in this worker."""
+    if ENABLED:
+        CACHE_LOOKUPS.inc(1, cache, str(os.getpid()), status)
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format."""
+    return '\n'.join(line for metric in REGISTRY for line in metric.render()) + '\n'
+
+
+def instrument_flask(app, name: str) -> None:
+    """Time every request to `app` and serve GET /metrics."""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('metrics_started', None)
+        if ENABLED and started is not None:
+            HTTP_SECONDS.observe(time.perf_counter() - started, name, request.endpoint or 'unknown',
+                                 str(response.status_code))
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics_endpoint():
+        return Response(render(), mimetype='text/plain; version=0.0.4')
+
+
+class _StageTimer:
+    __slots__ = ('stage', 'started')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> '_StageTimer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        observe_stage(self.stage, time.perf_counter() - self.started)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ''
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + ','.join(pairs) + '}'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
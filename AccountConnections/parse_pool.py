@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Process-Pool Parsing
+Hands raw search-page HTML to a pool of parser processes that return plain
+employee dicts, so concurrent scrapes in one worker stop serializing on the
+GIL while BeautifulSoup runs.
+
+- Pool size: SCRAPER_PARSE_PROCESSES (0, the default, parses in-process)
+- Submissions are bounded by SCRAPER_PARSE_MAX_PENDING; a caller that cannot
+  get a slot within SCRAPER_PARSE_SUBMIT_TIMEOUT seconds parses in-process
+- A broken or unavailable pool falls back to in-process parsing
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional
+
+DEFAULT_PROCESSES = int(os.environ.get('SCRAPER_PARSE_PROCESSES', '0'))
+DEFAULT_MAX_PENDING = int(os.environ.get('SCRAPER_PARSE_MAX_PENDING', '0'))
+DEFAULT_SUBMIT_TIMEOUT = float(os.environ.get('SCRAPER_PARSE_SUBMIT_TIMEOUT', '5'))
+
+logger = logging.getLogger(__name__)
+
+# Parser per (backend, restricted) inside each worker process
+_worker_parsers = {}
+
+
+def _parse_in_worker(html: str, parser_backend: str, restricted_parsing: bool) -> List[Dict[str, Any]]:
+    """Worker-process entry point: parse one search page into employee dicts."""
+    key = (parser_backend, restricted_parsing)
+    parser = _worker_parsers.get(key)
+    if parser is None:
+        # Imported here: scraping imports this module
+        from scraping import LinkedInResultParser
+        parser = LinkedInResultParser()
+        parser._configure_parser(parser_backend, restricted_parsing)
+        _worker_parsers[key] = parser
+    return parser._parse_search_results(html)
+
+
+class ParsePool:
+    """Bounded process pool for search-page parsing with in-process fallback."""
+
+    def __init__(self, processes: int = DEFAULT_PROCESSES, max_pending: int = DEFAULT_MAX_PENDING,
+                 submit_timeout: float = DEFAULT_SUBMIT_TIMEOUT):
+        """Initialize with worker processes, maximum pages in flight (default 2 per process) and submit timeout."""
+        self.processes = max(0, processes)
+        self.max_pending = max_pending or self.processes * 2
+        self.submit_timeout = submit_timeout
+        self.submitted = 0
+        self.fallbacks = 0
+        self._slots = threading.BoundedSemaphore(max(1, self.max_pending))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def parse_search_results(self, parser, html: str) -> List[Dict[str, Any]]:
+        """Parse with `parser`'s settings in a worker process, or in-process with `parser` on fallback."""
+        if self.processes < 1:
+            return parser._parse_search_results(html)
+
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            self.fallbacks += 1
+            return parser._parse_search_results(html)
+
+        try:
+            executor = self._get_executor()
+            future = executor.submit(_parse_in_worker, html, parser.parser_backend, parser.restricted_parsing)
+            self.submitted += 1
+            return future.result()
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            logger.warning("Parse pool unavailable (%s); parsing in-process", e)
+            self._discard_executor()
+            self.fallbacks += 1
+            return parser._parse_search_results(html)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size and submission counters."""
+        return {
+            'processes': self.processes,
+            'max_pending': self.max_pending,
+            'submitted': self.submitted,
+            'fallbacks': self.fallbacks
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts them on next use."""
+        self._discard_executor()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # forkserver: forking a threaded server process is unsafe
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(self.processes, mp_context=context)
+            return self._executor
+
+    def _discard_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_parse_pool() -> Optional[ParsePool]:
+    """The process-wide pool configured by SCRAPER_PARSE_PROCESSES, or None when disabled."""
+    global _shared_pool
+    if DEFAULT_PROCESSES < 1:
+        return None
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ParsePool()
+        return _shared_pool
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Profile Cache
+Per-session cache of the logged-in user's current company (from /in/me/),
+keyed by session cookie fingerprint, so page loads stop downloading and
+parsing the profile page:
+
+1. Within PROFILE_CACHE_TTL the cached company is served as is
+2. Once stale, the cached company is still served and one background
+   refresh is started; it sends If-None-Match / If-Modified-Since, so an
+   unchanged profile costs a 304 rather than a page download and parse
+3. Entries older than PROFILE_CACHE_MAX_STALE, and sessions never seen, are
+   fetched on the request path
+4. A failed background refresh keeps the cached company and is retried
+   after PROFILE_CACHE_RETRY_AFTER seconds
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from scraping import cookie_fingerprint
+
+DEFAULT_TTL = float(os.environ.get('PROFILE_CACHE_TTL', '3600'))
+DEFAULT_MAX_STALE = float(os.environ.get('PROFILE_CACHE_MAX_STALE', '604800'))
+DEFAULT_RETRY_AFTER = float(os.environ.get('PROFILE_CACHE_RETRY_AFTER', '60'))
+DEFAULT_MAX_ENTRIES = int(os.environ.get('PROFILE_CACHE_MAX_ENTRIES', '1024'))
+DEFAULT_REFRESH_WORKERS = int(os.environ.get('PROFILE_CACHE_REFRESH_WORKERS', '2'))
+
+UNKNOWN_COMPANY = 'Unknown Company'
+
+logger = logging.getLogger(__name__)
+
+# company is None when the profile names no current company
+ProfileEntry = namedtuple('ProfileEntry', ['company', 'etag', 'last_modified', 'fetched_at'])
+
+
+class ProfileCache:
+    """Thread-safe TTL + LRU cache of user companies with stale-while-revalidate."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_stale: float = DEFAULT_MAX_STALE,
+                 retry_after: float = DEFAULT_RETRY_AFTER, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 refresh_workers: int = DEFAULT_REFRESH_WORKERS):
+        """Initialize with freshness lifetime, how long a stale entry may still be served, the
+        retry delay after a failed refresh (seconds), maximum entries and background refresh threads."""
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.retry_after = retry_after
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.refresh_failures = 0
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, refresh_workers),
+                                            thread_name_prefix='profile-refresh')
+
+    def get_company(self, cookies: Dict[str, str], scraper) -> Tuple[str, str]:
+        """The user's company for this session, fetched with `scraper` if needed.
+
+        Returns (company, status), status one of hit, stale, miss or error.
+        """
+        key = cookie_fingerprint(cookies)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry.fetched_at if entry is not None else None
+
+            if entry is not None and age < self.max_stale:
+                self._entries.move_to_end(key)
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry.company or UNKNOWN_COMPANY, 'hit'
+
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._executor.submit(self._refresh, key, scraper, entry)
+                return entry.company or UNKNOWN_COMPANY, 'stale'
+
+            self.misses += 1
+
+        try:
+            return self._revalidate(key, scraper, entry).company or UNKNOWN_COMPANY, 'miss'
+        except Exception as e:
+            logger.warning("Profile fetch failed: %s", e)
+            return UNKNOWN_COMPANY, 'error'
+
+    def discard(self, cookies: Dict[str, str]) -> None:
+        """Forget a session's entry (on logout)."""
+        with self._lock:
+            self._entries.pop(cookie_fingerprint(cookies), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/revalidation counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'refresh_failures': self.refresh_failures,
+                'refreshing': len(self._refreshing),
+                'entries': len(self._entries)
+            }
+
+    def shutdown(self) -> None:
+        """Stop the refresh threads, letting running refreshes finish."""
+        self._executor.shutdown(wait=True)
+
+    def _refresh(self, key: str, scraper, entry: ProfileEntry) -> None:
+        """Background revalidation of a stale entry."""
+        try:
+            self._revalidate(key, scraper, entry)
+        except Exception as e:
+            logger.warning("Background profile refresh failed: %s", e)
+            with self._lock:
+                self.refresh_failures += 1
+                if self._entries.get(key) is entry:
+                    # Stay servable, and go stale again after retry_after
+                    self._entries[key] = entry._replace(fetched_at=time.monotonic() - self.ttl + self.retry_after)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _revalidate(self, key: str, scraper, entry: Optional[ProfileEntry]) -> ProfileEntry:
+        """Conditionally re-fetch the profile page and store the result."""
+        etag, last_modified = (entry.etag, entry.last_modified) if entry is not None else (None, None)
+        fetched = scraper.fetch_user_company(etag, last_modified)
+        company = fetched.company
+
+        with self._lock:
+            if fetched.not_modified and entry is not None:
+                # 304: the cached company is still current
+                self.not_modified += 1
+                company = entry.company
+
+            fresh = ProfileEntry(company, fetched.etag, fetched.last_modified, time.monotonic())
+            self._entries[key] = fresh
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fresh
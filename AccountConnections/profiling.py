@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Request Profiling
+Opt-in sampling profiler for single API requests, to see where a slow
+search spends its time:
+
+    SCRAPER_PROFILING=1 gunicorn scraping_api:app ...
+    curl -H 'X-Profile: 1' -d '{...}' .../api/scrape-company
+
+A profiled request's threads (the request thread and the page fetch
+threads working for it) have their stacks sampled every
+SCRAPER_PROFILE_INTERVAL seconds. When the response has been sent, two
+files are written to SCRAPER_PROFILE_DIR:
+
+- <id>.collapsed: collapsed stacks ("frame;frame;frame count"), for
+  flamegraph.pl, speedscope or inferno
+- <id>.json: request details and the top SCRAPER_PROFILE_TOP functions by
+  self and total time
+
+The response carries an X-Profile-URL header (and a "profile" field in JSON
+object bodies) pointing at GET /profiles/<id>; /profiles/<id>.collapsed
+serves the stacks. Concurrent profiled requests each sample only their own
+threads. A profiled request parses pages in-process, so parsing shows up
+in its stacks rather than in the parse pool's processes.
+
+Without SCRAPER_PROFILING no hooks or routes are installed. With it, the
+switch is the X-Profile header or a ?profile= query flag, which must equal
+SCRAPER_PROFILE_TOKEN when that is set; reading a saved profile then needs
+the token the same way.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+ENABLED = os.environ.get('SCRAPER_PROFILING', '0').lower() in ('1', 'true', 'yes', 'on')
+DEFAULT_DIR = os.environ.get('SCRAPER_PROFILE_DIR', 'profiles')
+DEFAULT_INTERVAL = float(os.environ.get('SCRAPER_PROFILE_INTERVAL', '0.005'))
+DEFAULT_TOP = int(os.environ.get('SCRAPER_PROFILE_TOP', '20'))
+DEFAULT_KEEP = int(os.environ.get('SCRAPER_PROFILE_KEEP', '100'))
+TOKEN = os.environ.get('SCRAPER_PROFILE_TOKEN', '')
+
+PROFILE_ID_RE = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$')
+
+logger = logging.getLogger(__name__)
+
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Stack samples for the threads working on one request."""
+
+    def __init__(self, description: Dict[str, Any], interval: float = DEFAULT_INTERVAL):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.description = description
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = time.perf_counter()
+        self.finished = None
+        # thread ident -> how many times it is attached (a thread can nest)
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def attach(self) -> None:
+        """Sample the calling thread until detach()."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def detach(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            count = self._threads.pop(ident, 0) - 1
+            if count > 0:
+                self._threads[ident] = count
+
+    def record(self, frames: Dict[int, Any]) -> None:
+        """Add one sample from sys._current_frames() for this profile's threads."""
+        with self._lock:
+            threads = list(self._threads)
+        for ident in threads:
+            frame = frames.get(ident)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+                self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stack lines, most sampled first."""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+        """Request details and the hottest functions by self and total (inclusive) time."""
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+
+        def hot(counts: Counter) -> List[Dict[str, Any]]:
+            return [{'function': frame, 'samples': count, 'ms': round(count * self.interval * 1000, 1),
+                     'percent': round(count / self.samples * 100, 1)}
+                    for frame, count in counts.most_common(top)]
+
+        duration = (self.finished or time.perf_counter()) - self.started
+        return dict(
+            self.description,
+            id=self.id,
+            duration_ms=round(duration * 1000, 1),
+            interval_ms=round(self.interval * 1000, 2),
+            samples=self.samples,
+            top_self=hot(self_counts) if self.samples else [],
+            top_total=hot(total_counts) if self.samples else []
+        )
+
+
+class _Sampler:
+    """One thread sampling every active profile's threads while any profile is active."""
+
+    def __init__(self):
+        self._profiles = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                profiles = list(self._profiles)
+                interval = min(profile.interval for profile in profiles)
+
+            frames = sys._current_frames()
+            for profile in profiles:
+                profile.record(frames)
+            del frames
+            time.sleep(interval)
+
+
+_sampler = _Sampler()
+
+
+def active() -> bool:
+    """Whether the current request is being profiled."""
+    return _current_profile.get() is not None
+
+
+def traced(function, *args):
+    """Call function(*args), sampling this thread for the current profile if there is one.
+
+    For work a profiled request hands to another thread, e.g.
+    executor.submit(contextvars.copy_context().run, profiling.traced, fetch, page).
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return function(*args)
+    profile.attach()
+    try:
+        return function(*args)
+    finally:
+        profile.detach()
+
+
+def start_profile(description: Dict[str, Any], interval: float = DEFAULT_INTERVAL) -> RequestProfile:
+    """Start sampling the calling thread (and threads it hands work to via traced())."""
+    profile = RequestProfile(description, interval)
+    profile.token = _current_profile.set(profile)
+    profile.attach()
+    _sampler.start(profile)
+    return profile
+
+
+def finish_profile(profile: RequestProfile, directory: str = DEFAULT_DIR, top: int = DEFAULT_TOP,
+                   keep: int = DEFAULT_KEEP) -> Optional[str]:
+    """Stop sampling and write <id>.collapsed and <id>.json; returns the summary path, None on failure."""
+    profile.finished = time.perf_counter()
+    _sampler.stop(profile)
+    profile.detach()
+    try:
+        _current_profile.reset(profile.token)
+    except ValueError:
+        # Finished from another context (a closing streamed response)
+        _current_profile.set(None)
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, profile.id)
+        with open(f'{base}.collapsed', 'w') as f:
+            f.write(profile.collapsed())
+        with open(f'{base}.json', 'w') as f:
+            json.dump(profile.summary(top), f, indent=2)
+        _prune(directory, keep)
+        return f'{base}.json'
+    except OSError as e:
+        logger.warning("Could not save profile %s: %s", profile.id, e)
+        return None
+
+
+def requested(value: Optional[str]) -> bool:
+    """Whether a header or query value turns profiling on for a request."""
+    if not value:
+        return False
+    if TOKEN:
+        return value == TOKEN
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def instrument_flask(app, name: str, directory: str = DEFAULT_DIR) -> None:
+    """With SCRAPER_PROFILING on, profile requests that ask for it and serve GET /profiles/<id>."""
+    if not ENABLED:
+        return
+    from flask import abort, g, jsonify, request, send_file, url_for
+
+    directory = os.path.abspath(directory)
+
+    @app.before_request
+    def _start_profile():
+        if requested(request.headers.get('X-Profile') or request.args.get('profile')):
+            g.profile = start_profile({'app': name, 'method': request.method, 'path': request.path,
+                                       'endpoint': request.endpoint})
+
+    @app.after_request
+    def _link_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+
+        url = url_for('profile_summary', profile_id=profile.id, _external=True)
+        response.headers['X-Profile-URL'] = url
+        response.headers['X-Profile-Collapsed-URL'] = url_for('profile_stacks', profile_id=profile.id,
+                                                              _external=True)
+        if not response.is_streamed and response.is_json:
+            body = response.get_json(silent=True)
+            if isinstance(body, dict):
+                body['profile'] = {'id': profile.id, 'url': url,
+                                   'collapsed_url': response.headers['X-Profile-Collapsed-URL']}
+                response.set_data(app.json.dumps(body))
+
+        # Streamed bodies are produced after this hook; sample until the response is closed
+        response.call_on_close(lambda: finish_profile(profile, directory))
+        return response
+
+    def _check_access(profile_id):
+        # Profiles show request paths and code; with a token set only its holders may read them
+        if TOKEN and not requested(request.headers.get('X-Profile') or request.args.get('profile')):
+            abort(403)
+        if not PROFILE_ID_RE.match(profile_id):
+            abort(404)
+
+    @app.route('/profiles/<profile_id>', methods=['GET'])
+    def profile_summary(profile_id):
+        """A saved profile's summary (top functions by self and total time)."""
+        _check_access(profile_id)
+        path = os.path.join(directory, f'{profile_id}.json')
+        if not os.path.exists(path):
+            return jsonify({'error': 'Profile not found (it is saved once its response completes)'}), 404
+        return send_file(path, mimetype='application/json')
+
+    @app.route('/profiles/<profile_id>.collapsed', methods=['GET'])
+    def profile_stacks(profile_id):
+        """A saved profile's collapsed stacks, for flame graph tools."""
+        _check_access(profile_id)
+        path = os.path.join(directory, f'{profile_id}.collapsed')
+        if not os.path.exists(path):
+            abort(404)
+        return send_file(path, mimetype='text/plain')
+
+
+def _collapse(frame) -> str:
+    """Root-first 'function (file:line)' frames joined by ';'."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def _prune(directory: str, keep: int) -> None:
+    """Delete the oldest profiles beyond `keep`."""
+    ids = sorted({name.rsplit('.', 1)[0] for name in os.listdir(directory)
+                  if PROFILE_ID_RE.match(name.rsplit('.', 1)[0])})
+    for profile_id in ids[:max(0, len(ids) - keep)]:
+        for suffix in ('.json', '.collapsed'):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Incremental Result Ranking
+Bounded top-k ranking of employees by connection strength as search pages
+arrive, with optional rules for ending paging early:
+
+- weak pages: a run of pages with nothing above WEAK_STRENGTH (3rd+ degree,
+  no mutual connections). LinkedIn orders results by relevance, so later
+  pages are not expected to do better.
+- stable pages: a run of pages that left the current top-k unchanged.
+
+Both rules are off unless a page count is given (0 disables).
+
+Results gathered by several viewers (multi-account searches) can list the
+same person more than once; with dedupe_by='profile_url' each person is
+ranked once, in the position they were first seen, using the strongest
+connection any viewer has to them.
+"""
+
+import heapq
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_STOP_AFTER_WEAK_PAGES = int(os.environ.get('SCRAPER_STOP_AFTER_WEAK_PAGES', '0'))
+DEFAULT_STOP_AFTER_STABLE_PAGES = int(os.environ.get('SCRAPER_STOP_AFTER_STABLE_PAGES', '0'))
+
+# _calculate_strength() of a 3rd+ degree result with no mutual connections
+WEAK_STRENGTH = 0
+
+
+class TopKRanker:
+    """Keep the k strongest employees seen so far in a bounded min-heap.
+
+    Ties keep arrival order, so results() matches a stable sort of every
+    employee offered, by connection_strength descending, cut to k.
+    """
+
+    def __init__(self, k: int, limit: Optional[int] = None, stop_after_weak_pages: Optional[int] = None,
+                 stop_after_stable_pages: Optional[int] = None, dedupe_by: Optional[str] = None):
+        """Initialize with k, an optional cap on employees considered, the stopping rules and
+        an optional field identifying duplicates (limit then counts distinct employees)."""
+        self.k = max(1, k)
+        self.limit = limit
+        self.stop_after_weak_pages = (DEFAULT_STOP_AFTER_WEAK_PAGES if stop_after_weak_pages is None
+                                      else stop_after_weak_pages)
+        self.stop_after_stable_pages = (DEFAULT_STOP_AFTER_STABLE_PAGES if stop_after_stable_pages is None
+                                        else stop_after_stable_pages)
+        self.seen = 0
+        self.pages = 0
+        self.weak_pages = 0
+        self.stable_pages = 0
+        self.dedupe_by = dedupe_by
+        self.duplicates = 0
+        self._heap = []
+        # dedupe key -> heap entry of that employee's strongest record
+        self._best = {}
+
+    def add_page(self, employees: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Offer one page of employees; returns the (new, if deduplicating) ones within the limit."""
+        if self.dedupe_by is not None:
+            employees, changed = self._merge_duplicates(employees)
+        else:
+            changed = False
+        if self.limit is not None:
+            employees = employees[:max(0, self.limit - self.seen)]
+
+        for employee in employees:
+            changed |= self._push(employee)
+
+        self.pages += 1
+        weak = all(employee.get('connection_strength', 0) <= WEAK_STRENGTH for employee in employees)
+        self.weak_pages = self.weak_pages + 1 if weak else 0
+        self.stable_pages = 0 if changed else self.stable_pages + 1
+        return employees
+
+    @property
+    def stop_reason(self) -> Optional[str]:
+        """Which stopping rule has fired, if any."""
+        if self.stop_after_weak_pages and self.weak_pages >= self.stop_after_weak_pages:
+            return 'weak_pages'
+        if self.stop_after_stable_pages and self.stable_pages >= self.stop_after_stable_pages:
+            return 'stable_pages'
+        return None
+
+    def results(self) -> List[Dict[str, Any]]:
+        """The current top-k, strongest first."""
+        return [employee for _, _, employee in sorted(self._heap, reverse=True)]
+
+    def _push(self, employee: Dict[str, Any]) -> bool:
+        """Offer one employee; True if it entered the top-k."""
+        # Negated arrival order makes later arrivals lose ties and keeps
+        # entries unique, so the dicts themselves are never compared
+        entry = (employee.get('connection_strength', 0), -self.seen, employee)
+        self.seen += 1
+        if self.dedupe_by is not None:
+            self._best[employee.get(self.dedupe_by)] = entry
+        return self._offer(entry)
+
+    def _offer(self, entry: tuple) -> bool:
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def _merge_duplicates(self, employees: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Split out employees already seen, upgrading any seen now with a stronger connection.
+
+        Returns (first sightings, whether an upgrade changed the top-k).
+        Employees without the dedupe field are never duplicates.
+        """
+        new = []
+        page_keys = set()
+        changed = False
+        for employee in employees:
+            key = employee.get(self.dedupe_by)
+            if key is None or (key not in self._best and key not in page_keys):
+                if key is not None:
+                    page_keys.add(key)
+                new.append(employee)
+                continue
+
+            self.duplicates += 1
+            if key in page_keys:
+                # Repeated within this page: keep the stronger of the two
+                for i, pending in enumerate(new):
+                    if pending.get(self.dedupe_by) == key:
+                        if employee.get('connection_strength', 0) > pending.get('connection_strength', 0):
+                            new[i] = employee
+                        break
+            else:
+                changed |= self._upgrade(key, employee)
+        return new, changed
+
+    def _upgrade(self, key: Any, employee: Dict[str, Any]) -> bool:
+        """Replace a seen employee's record with a stronger one, keeping its arrival position."""
+        strength, order, _ = self._best[key]
+        if employee.get('connection_strength', 0) <= strength:
+            return False
+
+        entry = (employee.get('connection_strength', 0), order, employee)
+        self._best[key] = entry
+        for i, ranked in enumerate(self._heap):
+            if ranked[1] == order:
+                self._heap[i] = entry
+                heapq.heapify(self._heap)
+                return True
+        return self._offer(entry)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting Utilities
+Token-bucket limiter used to pace outbound LinkedIn requests, and an
+adaptive variant that speeds up while LinkedIn responds normally and backs
+off when it throttles
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests/second with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialize with a refill rate (tokens per second) and bucket capacity."""
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.total_wait = 0.0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns seconds waited."""
+        with self._lock:
+            wait = self._reserve()
+            self.total_wait += wait
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _reserve(self) -> float:
+        """Reserve a token and return how long the caller must wait for it."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # Tokens may go negative: each caller reserves its own future slot,
+        # so concurrent callers are spaced out instead of waking together.
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class AsyncTokenBucket(TokenBucket):
+    """Token bucket whose acquire() yields to the event loop instead of blocking."""
+
+    async def acquire(self) -> float:
+        """Take one token, awaiting until it is available. Returns seconds waited."""
+        with self._lock:
+            wait = self._reserve()
+            self.total_wait += wait
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+# LinkedIn answers rate limiting with 429, or its own 999 status
+THROTTLE_STATUSES = frozenset([429, 999])
+
+
+class ThrottledError(Exception):
+    """Raised when a request is still throttled or failing after all retries."""
+
+
+class CircuitOpenError(Exception):
+    """Raised while a session's circuit breaker is open after repeated failures."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptivePacer(TokenBucket):
+    """Token bucket whose rate adapts to how LinkedIn responds (AIMD).
+
+    Until the first throttle each healthy response grows the rate by
+    `slow_start` (multiplicative, like TCP slow start); after that it adds
+    `increase`, up to max_rate either way. A throttle (429/999) multiplies
+    it by `backoff` down to min_rate and
+    honours Retry-After by holding all requests until it has passed; a
+    Retry-After longer than `max_hold` seconds opens the circuit for that
+    long instead, so callers fail fast rather than sleep.
+    failure_threshold consecutive throttles or server errors open the
+    circuit: acquire() raises CircuitOpenError until `cooldown` seconds
+    have passed, after which a single further failure reopens it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_rate: Optional[float] = None,
+                 min_rate: Optional[float] = None, increase: float = 0.05, backoff: float = 0.5,
+                 slow_start: float = 1.2,
+                 failure_threshold: int = 5, cooldown: float = 300.0, retry_base: float = 1.0,
+                 retry_cap: float = 30.0, max_hold: float = 60.0):
+        """Initialize with a starting rate and burst; see the class docstring for the rest."""
+        super().__init__(rate, burst)
+        self.max_rate = max(self.rate, max_rate or self.rate)
+        self.min_rate = min(self.rate, min_rate or self.rate / 10)
+        self.increase = increase
+        self.backoff = backoff
+        self.slow_start = slow_start
+        self._in_slow_start = True
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.max_hold = max_hold
+        self.throttled = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self._held_until = 0.0
+        self._open_until = 0.0
+
+    def record_response(self, status: int, retry_after: Optional[str] = None) -> bool:
+        """Adapt to one response; True if the request should be retried."""
+        if status in THROTTLE_STATUSES:
+            self.record_throttle(parse_retry_after(retry_after))
+            return True
+        if status >= 500:
+            self.record_failure()
+            return True
+        if status < 400:
+            self.record_success()
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            if self._in_slow_start:
+                self._set_rate(self.rate * self.slow_start)
+            else:
+                self._set_rate(self.rate + self.increase)
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.throttled += 1
+            self._in_slow_start = False
+            self._set_rate(self.rate * self.backoff)
+            if retry_after and retry_after > self.max_hold:
+                # Too long to sleep through in a request: pause the session until then
+                self._open_until = max(self._open_until, time.monotonic() + retry_after)
+            elif retry_after:
+                self._held_until = max(self._held_until, time.monotonic() + retry_after)
+            self._count_failure()
+
+    def record_failure(self) -> None:
+        """A server error or connection failure (counts toward the circuit breaker only)."""
+        with self._lock:
+            self.failures += 1
+            self._count_failure()
+
+    def retry_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (from 0)."""
+        return random.uniform(0, min(self.retry_cap, self.retry_base * 2 ** attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        """Current rate and throttle/failure counters."""
+        with self._lock:
+            return {
+                'requests_per_second': round(self.rate, 3),
+                'throttled': self.throttled,
+                'failures': self.failures,
+                'circuit_open': time.monotonic() < self._open_until
+            }
+
+    def _reserve(self) -> float:
+        now = time.monotonic()
+        if now < self._open_until:
+            raise CircuitOpenError(f'Session paused after throttling; retry in {self._open_until - now:.0f}s')
+        return max(super()._reserve(), self._held_until - now)
+
+    def _set_rate(self, rate: float) -> None:
+        """Change the refill rate, crediting tokens earned at the old rate (called with the lock held)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def _count_failure(self) -> None:
+        """Open the circuit once failures reach the threshold (called with the lock held)."""
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self._open_until = max(self._open_until, time.monotonic() + self.cooldown)
+            self._set_rate(self.min_rate)
+            # Half-open after the cooldown: one more failure reopens it
+            self.consecutive_failures = self.failure_threshold - 1
+
+
+class AsyncAdaptivePacer(AdaptivePacer):
+    """Adaptive pacer whose acquire() yields to the event loop instead of blocking."""
+
+    acquire = AsyncTokenBucket.acquire
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Employee Records
+Slotted record type for employees parsed from search results, and the JSON
+encoding the APIs use for it:
+
+- Employee stores its nine fields in slots instead of a per-record dict,
+  while keeping read-only dict access (employee['name'], .get(), items(),
+  ==) for existing callers
+- FastJSONProvider encodes Flask responses with orjson when it is installed
+  and the bytes would match Flask's default provider, and with json otherwise
+- dumps() is json.dumps() that understands Employee, for NDJSON/SSE/ASGI bodies
+- connection_strength() is the score results (and intro paths) are ranked by
+"""
+
+import json
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Dict, Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Employee fields, in the order search results have always listed them
+EMPLOYEE_FIELDS = (
+    'name', 'title_company', 'location', 'profile_url', 'mutual_connections', 'connection_degree',
+    'connection_strength', 'can_message', 'can_connect'
+)
+
+_FIELD_SET = frozenset(EMPLOYEE_FIELDS)
+_field_values = attrgetter(*EMPLOYEE_FIELDS)
+
+
+class Employee(Mapping):
+    """One search result, readable as a dict of EMPLOYEE_FIELDS."""
+
+    __slots__ = EMPLOYEE_FIELDS
+
+    def __init__(self, name: str, title_company: str, location: str, profile_url: str, mutual_connections: int,
+                 connection_degree: str, connection_strength: int, can_message: bool, can_connect: bool):
+        self.name = name
+        self.title_company = title_company
+        self.location = location
+        self.profile_url = profile_url
+        self.mutual_connections = mutual_connections
+        self.connection_degree = connection_degree
+        self.connection_strength = connection_strength
+        self.can_message = can_message
+        self.can_connect = can_connect
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Employee':
+        return cls(*(data.get(field) for field in EMPLOYEE_FIELDS))
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Spelled out: several times faster than dict(zip(...)), and runs once per record per response
+        return {
+            'name': self.name,
+            'title_company': self.title_company,
+            'location': self.location,
+            'profile_url': self.profile_url,
+            'mutual_connections': self.mutual_connections,
+            'connection_degree': self.connection_degree,
+            'connection_strength': self.connection_strength,
+            'can_message': self.can_message,
+            'can_connect': self.can_connect
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _FIELD_SET else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET
+
+    def __iter__(self):
+        return iter(EMPLOYEE_FIELDS)
+
+    def __len__(self) -> int:
+        return len(EMPLOYEE_FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Employee):
+            return _field_values(self) == _field_values(other)
+        return super().__eq__(other)
+
+    def __reduce__(self):
+        # Positional values pickle smaller and faster than per-slot state (parse pool results)
+        return Employee, _field_values(self)
+
+    def __repr__(self) -> str:
+        return f'Employee({self.to_dict()!r})'
+
+
+def connection_strength(mutual_connections: int, degree: str) -> int:
+    """Prioritization score: connection degree, plus 5 per mutual connection."""
+    score = 0
+
+    if degree == '1st':
+        score += 100
+    elif degree == '2nd':
+        score += 50
+    elif degree == '3rd':
+        score += 10
+
+    score += mutual_connections * 5
+    return score
+
+
+def json_default(obj: Any) -> Any:
+    """json `default` hook: Employees encode as their dict."""
+    if isinstance(obj, Employee):
+        return obj.to_dict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps(obj: Any, **kwargs) -> str:
+    """json.dumps() that also encodes Employees."""
+    return json.dumps(obj, default=json_default, **kwargs)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's default JSON provider, byte for byte, with an orjson fast path for compact responses."""
+
+    @staticmethod
+    def default(obj: Any) -> Any:
+        if isinstance(obj, Employee):
+            return obj.to_dict()
+        return DefaultJSONProvider.default(obj)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # jsonify() outside debug mode asks for exactly this; anything else
+        # (indent, other callers' options) goes through json
+        if (orjson is not None and kwargs == {'separators': (',', ':')} and self.sort_keys
+                and self.ensure_ascii and _orjson_compatible(obj)):
+            try:
+                data = orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS)
+            except TypeError:
+                data = None
+            # orjson writes non-ASCII text raw where json escapes it
+            if data is not None and data.isascii():
+                return data.decode('ascii')
+        return super().dumps(obj, **kwargs)
+
+
+def _orjson_compatible(obj: Any) -> bool:
+    """Whether orjson encodes every value in obj exactly as json would.
+
+    Only plain containers, strings, ints, bools, None, Employees and floats
+    that print without an exponent qualify (json writes 1e-05, orjson 0.00001).
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (str, int, Employee)) or value is None:
+            continue
+        if isinstance(value, float):
+            if not (value == 0 or 1e-4 <= abs(value) < 1e16):
+                return False
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        else:
+            return False
+    return True
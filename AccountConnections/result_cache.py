@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Company Search Result Cache
+TTL cache of search_company_employees() results, keyed by
+(session cookie fingerprint, canonical company key), kept in a
+shared_cache backend so gunicorn workers can share results (see
+SHARED_CACHE_BACKEND). A missing result is scraped by one worker while
+concurrent requests for it in other workers wait for that result.
+
+A cached result also answers requests for a smaller limit by slicing its
+prioritized employee list, and for any limit if its search was exhausted
+(paged through every result LinkedIn had). Requests can opt out with Cache-Control-style
+directives in the body:
+    "cache_control": "no-cache"  -> skip the lookup, store the fresh result
+    "cache_control": "no-store"  -> skip the cache entirely
+"""
+
+import os
+from collections import namedtuple
+from typing import Dict, Any, Callable, Optional, Tuple
+
+from company_index import get_company_index
+from scraping import cookie_fingerprint
+from shared_cache import CacheBackend, SharedCache, open_backend
+
+DEFAULT_TTL = float(os.environ.get('RESULT_CACHE_TTL', '300'))
+DEFAULT_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', '256'))
+
+CacheEntry = namedtuple('CacheEntry', ['limit', 'results'])
+
+
+def normalize_company_name(company_name: str) -> str:
+    """Canonical key for a company name, shared by its known spellings (see company_index)."""
+    return get_company_index().canonical_key(company_name)
+
+
+def parse_cache_control(value: Optional[str]) -> Tuple[bool, bool]:
+    """Return (bypass, refresh) for a Cache-Control-style directive string."""
+    directives = {part.strip().lower() for part in (value or '').split(',')}
+    bypass = 'no-store' in directives
+    refresh = bypass or 'no-cache' in directives
+    return bypass, refresh
+
+
+class ResultCache:
+    """Thread- and process-safe TTL cache of company search results."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 namespace: str = 'results', backend: Optional[CacheBackend] = None):
+        """Initialize with entry lifetime in seconds, maximum entry count, a key namespace
+        (caches holding different result shapes must not share one) and backend."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache = SharedCache(namespace, backend or open_backend(max_entries=max_entries))
+
+    def get(self, cookies: Dict[str, str], company_name: str, limit: int) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached result covering `limit`, or None."""
+        entry = self.cache.get(self._key(cookies, company_name))
+        if entry is None or not self._covers(entry, limit):
+            self.cache.record('miss')
+            return None
+
+        self.cache.record('hit')
+        return self._slice(entry, limit)
+
+    def put(self, cookies: Dict[str, str], company_name: str, limit: int, results: Dict[str, Any]) -> None:
+        """Store a successful result."""
+        self.cache.set(self._key(cookies, company_name), CacheEntry(limit, results), self.ttl)
+
+    def get_or_search(self, cookies: Dict[str, str], company_name: str, limit: int,
+                      search: Callable[[], Dict[str, Any]],
+                      cache_control: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """Serve from cache or run `search` (once across workers); returns (results, cache status)."""
+        bypass, refresh = parse_cache_control(cache_control)
+
+        if bypass:
+            return search(), 'bypass'
+
+        if refresh:
+            results = search()
+            if self.cacheable(results):
+                self.put(cookies, company_name, limit, results)
+            return results, 'refresh'
+
+        entry, status = self.cache.get_or_compute(
+            self._key(cookies, company_name),
+            lambda: CacheEntry(limit, search()),
+            self.ttl,
+            accept=lambda cached: self._covers(cached, limit),
+            store=lambda computed: self.cacheable(computed.results)
+        )
+        return (entry.results if status == 'miss' else self._slice(entry, limit)), status
+
+    @staticmethod
+    def cacheable(results: Dict[str, Any]) -> bool:
+        """Whether a search result may be cached: not an error, and not cut short by a failed page."""
+        return 'error' not in results and results.get('failed_page') is None
+
+    def stats(self) -> Dict[str, Any]:
+        """This worker's hit/miss counters and hit rate, and the cache's current size."""
+        return self.cache.stats()
+
+    def _covers(self, entry: CacheEntry, limit: int) -> bool:
+        # Only a search that paged through every result answers a larger limit; a short result
+        # can also come from a failed page or an early stop
+        return entry.limit >= limit or entry.results.get('exhausted', False)
+
+    def _slice(self, entry: CacheEntry, limit: int) -> Dict[str, Any]:
+        employees = entry.results['employees'][:limit]
+        exhausted = entry.results.get('exhausted', False) and len(employees) == len(entry.results['employees'])
+        return dict(entry.results, employees=employees, total_found=len(employees), exhausted=exhausted)
+
+    def _key(self, cookies: Dict[str, str], company_name: str) -> str:
+        return f'{cookie_fingerprint(cookies)}:{normalize_company_name(company_name)}'
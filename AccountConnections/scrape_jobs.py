@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Background Scrape Jobs
+In-process job queue so long scrapes run outside the HTTP request:
+
+1. POST enqueues a scrape and returns a job id immediately
+2. A bounded pool of worker threads runs queued jobs
+3. Status reports progress (pages done, employees found)
+4. Identical in-flight requests join the existing job instead of
+   starting a duplicate scrape
+
+No external broker is needed. Jobs live in the process that accepted
+them, so run a single gunicorn worker (with threads) per job endpoint.
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Any, Callable, Hashable, Optional, Tuple
+
+DEFAULT_WORKERS = int(os.environ.get('SCRAPE_JOB_WORKERS', '4'))
+DEFAULT_QUEUE_DEPTH = int(os.environ.get('SCRAPE_JOB_QUEUE_DEPTH', '100'))
+DEFAULT_RETENTION = float(os.environ.get('SCRAPE_JOB_RETENTION', '600'))
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at its configured depth."""
+
+
+class ScrapeJob:
+    """A queued or running scrape and its progress."""
+
+    def __init__(self, key: Hashable, run: Callable[['ScrapeJob'], Dict[str, Any]]):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.run = run
+        self.status = 'queued'
+        self.pages_done = 0
+        self.employees_found = 0
+        self.joined = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def record_page(self, employees: int) -> None:
+        """Progress callback for scrapers: one more page with this many employees."""
+        self.pages_done += 1
+        self.employees_found += employees
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def to_status(self) -> Dict[str, Any]:
+        """Status payload returned by the job status endpoints."""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': {
+                'pages_done': self.pages_done,
+                'employees_found': self.employees_found
+            },
+            'joined_requests': self.joined,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class ScrapeJobManager:
+    """Bounded worker pool executing scrape jobs with request coalescing."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_depth: int = DEFAULT_QUEUE_DEPTH,
+                 retention: float = DEFAULT_RETENTION):
+        """Initialize with worker count, maximum queued jobs and finished-job retention (seconds)."""
+        self.workers = max(1, workers)
+        self.retention = retention
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._jobs = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, key: Hashable, run: Callable[[ScrapeJob], Dict[str, Any]]) -> Tuple[ScrapeJob, bool]:
+        """Enqueue `run` under `key`, or join the in-flight job with that key.
+
+        Returns (job, joined). Raises QueueFullError when the queue is full.
+        """
+        with self._lock:
+            self._purge_finished()
+
+            job = self._in_flight.get(key)
+            if job is not None:
+                job.joined += 1
+                return job, True
+
+            job = ScrapeJob(key, run)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(f'Job queue is full ({self._queue.maxsize} jobs waiting)')
+
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+            self._start_workers()
+            return job, False
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        """Look up a job by id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth, in-flight and retained job counts."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queued': self._queue.qsize(),
+                'in_flight': len(self._in_flight),
+                'retained': len(self._jobs)
+            }
+
+    def _start_workers(self) -> None:
+        """Start worker threads on first use (called with the lock held)."""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f'scrape-job-{len(self._threads)}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            job.started_at = time.time()
+
+            try:
+                job.result = job.run(job)
+                if 'error' in job.result:
+                    job.error = job.result['error']
+                    job.status = 'failed'
+                else:
+                    job.status = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+            finally:
+                job.finished_at = time.time()
+                with self._lock:
+                    if self._in_flight.get(job.key) is job:
+                        del self._in_flight[job.key]
+                self._queue.task_done()
+
+    def _purge_finished(self) -> None:
+        """Forget finished jobs older than the retention window (called with the lock held)."""
+        cutoff = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
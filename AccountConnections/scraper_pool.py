@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Scraper Session Pool
+Process-wide pool of scraper instances keyed by session cookie fingerprint,
+so each user's requests.Session (and its keep-alive connections) is reused
+across HTTP requests instead of paying TCP/TLS setup on every request.
+
+The default factory is account_pool.build_scraper: the user's session,
+spread over extra accounts when SCRAPER_EXTRA_ACCOUNTS_FILE is set.
+
+Entries expire after sitting idle and the pool evicts its least recently
+used entry when full. Pooled scrapers are shared between request threads:
+requests.Session, its connection pool and the token bucket are thread-safe,
+and the scrapers hold no other per-request state.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Dict, Any, Callable
+
+from account_pool import build_scraper
+from scraping import cookie_fingerprint
+
+DEFAULT_MAX_SIZE = int(os.environ.get('SCRAPER_POOL_MAX_SIZE', '128'))
+DEFAULT_IDLE_TIMEOUT = float(os.environ.get('SCRAPER_POOL_IDLE_TIMEOUT', '300'))
+
+PoolEntry = namedtuple('PoolEntry', ['scraper', 'last_used'])
+
+
+class ScraperPool:
+    """Thread-safe LRU pool of scrapers with idle expiry."""
+
+    def __init__(self, factory: Callable[[Dict[str, str]], Any] = build_scraper,
+                 max_size: int = DEFAULT_MAX_SIZE, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """Initialize with a cookies -> scraper factory, maximum size and idle timeout (seconds)."""
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.created = 0
+        self.reused = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cookies: Dict[str, str]) -> Any:
+        """Return the pooled scraper for these cookies, creating it if needed."""
+        key = cookie_fingerprint(cookies)
+        now = time.monotonic()
+
+        with self._lock:
+            self._expire_idle(now)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.reused += 1
+                scraper = entry.scraper
+            else:
+                self.created += 1
+                scraper = self.factory(cookies)
+
+            self._entries[key] = PoolEntry(scraper, now)
+            self._entries.move_to_end(key)
+
+            # Evicted scrapers are dropped, not closed: a request thread may
+            # still be using one, and its sockets close once it lets go
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return scraper
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size and reuse counters."""
+        with self._lock:
+            return {'size': len(self._entries), 'created': self.created, 'reused': self.reused}
+
+    def _expire_idle(self, now: float) -> None:
+        """Drop entries idle longer than the timeout (called with the lock held)."""
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry.last_used < self.idle_timeout:
+                break
+            del self._entries[key]
@@ -10,97 +10,237 @@ After LinkedIn authentication, this module:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import re
+import os
+import json
+import hashlib
 import time
-import random
-from typing import Dict, Any, List, Optional
-from bs4 import BeautifulSoup
-from urllib.parse import quote
+import threading
+import contextvars
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from bs4 import BeautifulSoup, Tag
+from urllib.parse import quote, urlparse
+import metrics
+import profiling
+from rate_limit import AdaptivePacer, CircuitOpenError, ThrottledError
+from ranking import TopKRanker
+from parse_pool import ParsePool, get_shared_parse_pool
+from records import Employee, connection_strength
+from company_index import get_company_index, normalize_company
+from intro_graph import get_intro_graph
+from html_parsing import (
+    parse_search_page,
+    parse_profile_page,
+    iter_result_fragments,
+    resolve_backend,
+    DEFAULT_PARSER_BACKEND,
+    DEFAULT_RESTRICTED_PARSING,
+    DEFAULT_STREAM_PARSING,
+    RESULT_CONTAINER_CLASS,
+)
 
-class LinkedInCompanyConnectionScraper:
-    """Scrape LinkedIn for company connections after authentication."""
+# Point at a stand-in server (benchmarks/mock_linkedin.py) for offline runs
+LINKEDIN_BASE_URL = os.environ.get('LINKEDIN_BASE_URL', 'https://www.linkedin.com').rstrip('/')
+LINKEDIN_HOST = urlparse(LINKEDIN_BASE_URL).hostname
+COOKIE_DOMAIN = '.linkedin.com' if LINKEDIN_HOST.endswith('linkedin.com') else LINKEDIN_HOST
+SEARCH_URL = f"{LINKEDIN_BASE_URL}/search/results/people/"
+PROFILE_URL = f"{LINKEDIN_BASE_URL}/in/me/"
+# /in/me/ redirects to the member's own /in/<public id>/, which names them across cookie rotations
+PROFILE_ID_RE = re.compile(r'/in/([^/?#]+)/?$')
+# fetch_user_company() result; company is None both when the page names no company and when it
+# was not modified (304), which not_modified tells apart
+ProfileFetch = namedtuple('ProfileFetch', ['company', 'etag', 'last_modified', 'not_modified'])
+# Seconds before an unreadable profile page is tried again for the viewer
+VIEWER_RETRY_SECONDS = 300
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive'
+}
+RESULTS_PER_PAGE = 10
+MAX_SEARCH_PAGES = 15
+
+MUTUAL_CONNECTIONS_RE = re.compile(r'(\d+)\s+mutual\s+connection', re.IGNORECASE)
+
+# Search result element classes read by _scan_result_item
+TITLE_CLASS = 'entity-result__title-text'
+RESULT_FIELD_CLASSES = {
+    'entity-result__primary-subtitle': 'subtitle',
+    'entity-result__secondary-subtitle': 'location',
+    'entity-result__insight': 'insight',
+    'dist-value': 'degree',
+    'entity-result__badge-text': 'badge'
+}
+REQUIRED_RESULT_FIELDS = frozenset(['name', 'link', 'subtitle', 'location', 'insight', 'degree'])
+
+# Pacing defaults; 0.5 req/s matches the old average 1-3s sleep between pages
+DEFAULT_MAX_WORKERS = int(os.environ.get('SCRAPER_MAX_WORKERS', '1'))
+DEFAULT_REQUESTS_PER_SECOND = float(os.environ.get('SCRAPER_REQUESTS_PER_SECOND', '0.5'))
+DEFAULT_BURST = int(os.environ.get('SCRAPER_BURST', '1'))
+
+# Adaptive pacing: the rate climbs toward the maximum while LinkedIn responds
+# normally and halves on 429/999; repeated failures pause the session. The
+# maximum defaults to the starting rate, so pacing only speeds up when
+# SCRAPER_MAX_REQUESTS_PER_SECOND is set
+DEFAULT_MAX_REQUESTS_PER_SECOND = float(os.environ.get('SCRAPER_MAX_REQUESTS_PER_SECOND') or 0) or None
+DEFAULT_RATE_INCREASE = float(os.environ.get('SCRAPER_RATE_INCREASE', '0.1'))
+DEFAULT_MAX_RETRIES = int(os.environ.get('SCRAPER_MAX_RETRIES', '3'))
+DEFAULT_CIRCUIT_THRESHOLD = int(os.environ.get('SCRAPER_CIRCUIT_THRESHOLD', '5'))
+DEFAULT_CIRCUIT_COOLDOWN = float(os.environ.get('SCRAPER_CIRCUIT_COOLDOWN', '300'))
+# Longest Retry-After slept through; a longer one pauses the session (CircuitOpenError) instead
+DEFAULT_MAX_RETRY_AFTER = float(os.environ.get('SCRAPER_MAX_RETRY_AFTER', '60'))
+
+# Concurrent page fetches for a multi-company batch (still one rate budget)
+DEFAULT_BATCH_WORKERS = int(os.environ.get('SCRAPER_BATCH_WORKERS', '4'))
+
+# Keep-alive connections per host; pooled scrapers are shared by request threads
+DEFAULT_CONNECTIONS_PER_HOST = int(os.environ.get('SCRAPER_CONNECTIONS_PER_HOST', '16'))
+
+# Bytes read per chunk when search pages are parsed as they download
+DEFAULT_STREAM_CHUNK_SIZE = int(os.environ.get('SCRAPER_STREAM_CHUNK_SIZE', '16384'))
+
+def cookie_fingerprint(session_cookies: Dict[str, str]) -> str:
+    """Stable hash identifying a LinkedIn session without exposing its cookies."""
+    canonical = json.dumps(sorted((str(name), str(value)) for name, value in session_cookies.items()))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def profile_id(url: str) -> Optional[str]:
+    """The public profile id in a /in/<id>/ URL; None for /in/me/ (a redirect that was not followed)."""
+    match = PROFILE_ID_RE.search(urlparse(str(url)).path)
+    if not match or match.group(1) == 'me':
+        return None
+    return match.group(1)
+
+def build_pacer(requests_per_second: float, burst: int, pacer_class: type = AdaptivePacer) -> AdaptivePacer:
+    """Per-session adaptive pacer with the configured limits."""
+    return pacer_class(requests_per_second, burst, max_rate=DEFAULT_MAX_REQUESTS_PER_SECOND,
+                       increase=DEFAULT_RATE_INCREASE, failure_threshold=DEFAULT_CIRCUIT_THRESHOLD, cooldown=DEFAULT_CIRCUIT_COOLDOWN,
+                       max_hold=DEFAULT_MAX_RETRY_AFTER)
+
+def mount_connection_pool(session: requests.Session, max_workers: int = 1) -> None:
+    """Size the session's keep-alive pool for concurrent use."""
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(DEFAULT_CONNECTIONS_PER_HOST, max_workers))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+class LinkedInResultParser:
+    """Parse LinkedIn search and profile pages into employee records.
+
+    Shared by the blocking and asyncio scrapers; holds no network state.
+    """
     
-    def __init__(self, session_cookies: Dict[str, str]):
-        """Initialize with LinkedIn session cookies after auth."""
-        self.session = requests.Session()
-        self.session.cookies.update(session_cookies)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive'
-        })
+    parser_backend = resolve_backend(DEFAULT_PARSER_BACKEND)
+    restricted_parsing = DEFAULT_RESTRICTED_PARSING
+    stream_parsing = DEFAULT_STREAM_PARSING
+    parse_pool = None
     
-    def get_user_company(self) -> str:
-        """Extract the logged-in user's current company."""
-        try:
-            response = self.session.get('https://www.linkedin.com/in/me/')
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            current_position = self._extract_current_position(soup)
-            
-            return current_position.get('company', 'Unknown Company')
-            
-        except Exception as e:
-            return 'Unknown Company'
+    def _configure_parser(self, parser_backend: Optional[str], restricted_parsing: Optional[bool],
+                          stream_parsing: Optional[bool] = None) -> None:
+        """Override the process-wide parser defaults for this instance."""
+        if parser_backend is not None:
+            self.parser_backend = resolve_backend(parser_backend)
+        if restricted_parsing is not None:
+            self.restricted_parsing = restricted_parsing
+        if stream_parsing is not None:
+            self.stream_parsing = stream_parsing
     
-    def search_company_employees(self, company_name: str, limit: int = 150) -> Dict[str, Any]:
-        """Search for employees at a company with mutual connections."""
-        try:
-            search_url = "https://www.linkedin.com/search/results/people/"
-            params = {
-                'currentCompany': f'["{company_name}"]',
-                'origin': 'FACETED_SEARCH',
-                'start': 0
-            }
-            
-            all_employees = []
-            page = 0
-            
-            while len(all_employees) < limit and page < 15:
-                params['start'] = page * 10
-                
-                response = self.session.get(search_url, params=params)
-                if response.status_code != 200:
-                    break
-                    
-                employees = self._parse_search_results(response.text)
-                if not employees:
-                    break
-                    
-                all_employees.extend(employees)
-                page += 1
-                time.sleep(random.uniform(1, 3))
-            
-            prioritized = self._prioritize_results(all_employees[:limit])
-            
-            return {
-                'company': company_name,
-                'total_found': len(prioritized),
-                'employees': prioritized,
-                'capabilities': self._get_capabilities()
-            }
-            
-        except Exception as e:
-            return {
-                'error': str(e),
-                'company': company_name,
-                'total_found': 0,
-                'employees': [],
-                'capabilities': self._get_capabilities()
-            }
+    def _search_params(self, company_name: str, page: int) -> Dict[str, Any]:
+        """Query parameters for one page of a company people search."""
+        return {
+            'currentCompany': f'["{company_name}"]',
+            'origin': 'FACETED_SEARCH',
+            'start': page * RESULTS_PER_PAGE
+        }
+    
+    def _new_ranker(self, limit: int, top_k: Optional[int], stop_after_weak_pages: Optional[int],
+                    stop_after_stable_pages: Optional[int]) -> TopKRanker:
+        """Ranker keeping the top_k (default: all `limit`) strongest of the first `limit` results."""
+        return TopKRanker(top_k or limit, limit, stop_after_weak_pages, stop_after_stable_pages)
+    
+    def _build_search_response(self, company_name: str, ranker: TopKRanker, exhausted: bool = False,
+                               failed_page: Optional[int] = None) -> Dict[str, Any]:
+        """Ranked employees in the search response shape.
+
+        exhausted says paging ran out of results, so a larger limit would find no one else;
+        failed_page is the page that could not be fetched when the results are partial.
+        """
+        with metrics.stage_timer('rank'):
+            prioritized = ranker.results()
+        get_company_index().learn(company_name, prioritized)
+        
+        return {
+            'company': company_name,
+            'total_found': len(prioritized),
+            'employees': prioritized,
+            'exhausted': exhausted,
+            'failed_page': failed_page,
+            'capabilities': self._get_capabilities()
+        }
+    
+    def rank_employees(self, company_name: str, employees: List[Dict[str, Any]], limit: int = 150,
+                       exhausted: bool = False) -> Dict[str, Any]:
+        """Search response for employees fetched earlier (e.g. from employee_store), ranked as a
+        search for `limit` would rank them."""
+        ranker = self._new_ranker(limit, None, 0, 0)
+        ranker.add_page(employees)
+        return self._build_search_response(company_name, ranker, exhausted)
+    
+    def _build_paged_response(self, company_name: str, ranker: TopKRanker,
+                              outcome: Dict[str, Any]) -> Dict[str, Any]:
+        """Response for a search paged by _iter_search_pages(): the pages collected before a failed
+        page, or an error if the first page failed."""
+        if outcome.get('failed_page') == 0:
+            return self._build_error_response(
+                company_name, ThrottledError(outcome.get('error') or 'Search page 0 could not be fetched'))
+        return self._build_search_response(company_name, ranker, outcome.get('exhausted', False),
+                                           outcome.get('failed_page'))
+    
+    def _build_error_response(self, company_name: str, error: Exception) -> Dict[str, Any]:
+        """Search response shape for a failed scrape."""
+        return {
+            'error': str(error),
+            'company': company_name,
+            'total_found': 0,
+            'employees': [],
+            'capabilities': self._get_capabilities()
+        }
+    
+    def _record_page_end(self, outcome: Dict[str, Any], page: int, employees: Optional[List[Dict[str, Any]]],
+                         error: Optional[Exception] = None) -> None:
+        """Note in a paging outcome that `page` came back empty (no more results) or failed (None)."""
+        if employees is None:
+            outcome['failed_page'] = page
+            if error is not None:
+                outcome['error'] = str(error)
+        else:
+            outcome['exhausted'] = True
+    
+    def _parse_page(self, html: str) -> List[Dict[str, Any]]:
+        """Parse a search page, in the parse pool's worker processes if there is one.
+
+        Profiled requests parse in-process so the profile covers parsing.
+        """
+        if self.parse_pool is not None and not profiling.active():
+            with metrics.stage_timer('parse_pool'):
+                return self.parse_pool.parse_search_results(self, html)
+        return self._parse_search_results(html)
     
     def _parse_search_results(self, html: str) -> List[Dict[str, Any]]:
         """Parse LinkedIn people search results."""
         employees = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            result_items = soup.find_all('li', class_='reusable-search__result-container')
+            with metrics.stage_timer('parse'):
+                soup = parse_search_page(html, self.parser_backend, self.restricted_parsing)
+                result_items = soup.find_all('li', class_=RESULT_CONTAINER_CLASS)
             
             for item in result_items:
-                employee = self._extract_employee_data(item)
+                with metrics.stage_timer('extract'):
+                    employee = self._extract_employee_data(item)
                 if employee:
                     employees.append(employee)
                     
@@ -109,67 +249,145 @@ class LinkedInCompanyConnectionScraper:
             
         return employees
     
-    def _extract_employee_data(self, item_soup) -> Optional[Dict[str, Any]]:
+    def _parse_search_stream(self, chunks: Iterable[str]) -> List[Dict[str, Any]]:
+        """Parse LinkedIn people search results from text chunks, one result item at a time.
+
+        Gives the same employees as _parse_search_results() on the joined
+        chunks; only the result item being read is held in memory.
+        """
+        employees = []
+        
+        for fragment in iter_result_fragments(chunks):
+            try:
+                with metrics.stage_timer('parse'):
+                    soup = parse_search_page(fragment, self.parser_backend, self.restricted_parsing)
+                    # Also picks up result items nested inside this one
+                    result_items = soup.find_all('li', class_=RESULT_CONTAINER_CLASS)
+                
+                for item in result_items:
+                    with metrics.stage_timer('extract'):
+                        employee = self._extract_employee_data(item)
+                    if employee:
+                        employees.append(employee)
+                        
+            except Exception:
+                pass
+        
+        return employees
+    
+    def _parse_response(self, response: requests.Response) -> List[Dict[str, Any]]:
+        """Parse a search page response, reading it through the streaming parser if enabled."""
+        if not self.stream_parsing:
+            return self._parse_page(response.text)
+        
+        with response:
+            if response.encoding is None:
+                response.encoding = 'utf-8'
+            return self._parse_search_stream(response.iter_content(DEFAULT_STREAM_CHUNK_SIZE, decode_unicode=True))
+    
+    def _extract_employee_data(self, item_soup) -> Optional[Employee]:
         """Extract employee data from search result."""
         try:
+            elements = self._scan_result_item(item_soup)
+            
             # Name
-            name_elem = item_soup.select_one('.entity-result__title-text a span[aria-hidden="true"]')
+            name_elem = elements.get('name')
             name = name_elem.get_text().strip() if name_elem else "Unknown"
             
             # Profile URL
-            profile_link = item_soup.select_one('.entity-result__title-text a')
+            profile_link = elements.get('link')
             profile_url = profile_link.get('href') if profile_link else None
             
             # Title and Company
-            subtitle_elem = item_soup.select_one('.entity-result__primary-subtitle')
+            subtitle_elem = elements.get('subtitle')
             title_company = subtitle_elem.get_text().strip() if subtitle_elem else ""
             
             # Location
-            location_elem = item_soup.select_one('.entity-result__secondary-subtitle')
+            location_elem = elements.get('location')
             location = location_elem.get_text().strip() if location_elem else ""
             
             # Mutual connections
-            mutual_connections = self._extract_mutual_connections(item_soup)
+            mutual_connections = self._extract_mutual_connections(elements.get('insight'))
             
             # Connection degree
-            connection_degree = self._extract_connection_degree(item_soup)
+            connection_degree = self._extract_connection_degree(elements.get('degree'), elements.get('badge'))
             
-            return {
-                'name': name,
-                'title_company': title_company,
-                'location': location,
-                'profile_url': profile_url,
-                'mutual_connections': mutual_connections,
-                'connection_degree': connection_degree,
-                'connection_strength': self._calculate_strength(mutual_connections, connection_degree),
-                'can_message': connection_degree in ['1st', '2nd'],
-                'can_connect': connection_degree in ['2nd', '3rd']
-            }
+            return Employee(
+                name=name,
+                title_company=title_company,
+                location=location,
+                profile_url=profile_url,
+                mutual_connections=mutual_connections,
+                connection_degree=connection_degree,
+                connection_strength=self._calculate_strength(mutual_connections, connection_degree),
+                can_message=connection_degree in ['1st', '2nd'],
+                can_connect=connection_degree in ['2nd', '3rd']
+            )
             
         except Exception:
             return None
     
-    def _extract_mutual_connections(self, item_soup) -> int:
+    def _scan_result_item(self, item_soup) -> Dict[str, Tag]:
+        """Find every element the extractor reads in one pre-order walk.
+
+        Each field keeps the first match in document order, exactly as the
+        equivalent select_one() would:
+            name      .entity-result__title-text a span[aria-hidden="true"]
+            link      .entity-result__title-text a
+            subtitle  .entity-result__primary-subtitle
+            location  .entity-result__secondary-subtitle
+            insight   .entity-result__insight
+            degree    .dist-value
+            badge     .entity-result__badge-text
+        """
+        found = {}
+        in_title = TITLE_CLASS in (item_soup.get('class') or ())
+        # (tag, inside a title element, inside an <a> inside a title element)
+        stack = [(child, in_title, False) for child in reversed(item_soup.contents) if isinstance(child, Tag)]
+        
+        while stack:
+            tag, in_title, in_title_link = stack.pop()
+            classes = tag.attrs.get('class') or ()
+            
+            if in_title_link and 'name' not in found and tag.name == 'span' and tag.attrs.get('aria-hidden') == 'true':
+                found['name'] = tag
+            if in_title and 'link' not in found and tag.name == 'a':
+                found['link'] = tag
+            for css_class in classes:
+                field = RESULT_FIELD_CLASSES.get(css_class)
+                if field and field not in found:
+                    found[field] = tag
+            
+            # The badge is only a fallback for a missing .dist-value
+            if REQUIRED_RESULT_FIELDS <= found.keys():
+                break
+            
+            child_in_title_link = in_title_link or (in_title and tag.name == 'a')
+            child_in_title = in_title or TITLE_CLASS in classes
+            for child in reversed(tag.contents):
+                if isinstance(child, Tag):
+                    stack.append((child, child_in_title, child_in_title_link))
+        
+        return found
+    
+    def _extract_mutual_connections(self, mutual_elem: Optional[Tag]) -> int:
         """Extract number of mutual connections."""
         try:
-            mutual_elem = item_soup.select_one('.entity-result__insight')
             if mutual_elem:
                 text = mutual_elem.get_text().strip()
-                match = re.search(r'(\d+)\s+mutual\s+connection', text, re.IGNORECASE)
+                match = MUTUAL_CONNECTIONS_RE.search(text)
                 if match:
                     return int(match.group(1))
             return 0
         except:
             return 0
     
-    def _extract_connection_degree(self, item_soup) -> str:
+    def _extract_connection_degree(self, degree_elem: Optional[Tag], badge_elem: Optional[Tag]) -> str:
         """Extract connection degree (1st, 2nd, 3rd)."""
         try:
-            degree_elem = item_soup.select_one('.dist-value')
             if degree_elem:
                 return degree_elem.get_text().strip()
             
-            badge_elem = item_soup.select_one('.entity-result__badge-text')
             if badge_elem:
                 text = badge_elem.get_text().strip()
                 if any(deg in text for deg in ['1st', '2nd', '3rd']):
@@ -181,21 +399,14 @@ class LinkedInCompanyConnectionScraper:
     
     def _calculate_strength(self, mutual_connections: int, degree: str) -> int:
         """Calculate connection strength for prioritization."""
-        score = 0
-        
-        if degree == '1st':
-            score += 100
-        elif degree == '2nd':
-            score += 50
-        elif degree == '3rd':
-            score += 10
-        
-        score += mutual_connections * 5
-        return score
+        return connection_strength(mutual_connections, degree)
     
-    def _prioritize_results(self, employees: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Sort employees by connection strength."""
-        return sorted(employees, key=lambda x: x.get('connection_strength', 0), reverse=True)
+    def _parse_user_company(self, html: str) -> str:
+        """Parse the current company from a profile page."""
+        soup = parse_profile_page(html, self.parser_backend, self.restricted_parsing)
+        current_position = self._extract_current_position(soup)
+        
+        return current_position.get('company', 'Unknown Company')
     
     def _extract_current_position(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """Extract current job position."""
@@ -241,21 +452,341 @@ class LinkedInCompanyConnectionScraper:
                 'Implement proper rate limiting',
                 'Consider LinkedIn official APIs for production'
             ]
-        } scraping',
-                'Rate limiting prevents large-scale operations',
-                'Full profile access requires being connected',
-                'Cannot actually send messages/connections via scraping',
-                'May violate LinkedIn Terms of Service',
-                'Session cookies expire regularly'
-            ],
-            'recommendations': [
-                'Use for discovery and prioritization only',
-                'Redirect users to LinkedIn for actual connections',
-                'Implement proper rate limiting',
-                'Consider LinkedIn official APIs for production'
-            ]
         }
 
+class LinkedInCompanyConnectionScraper(LinkedInResultParser):
+    """Scrape LinkedIn for company connections after authentication."""
+    
+    def __init__(self, session_cookies: Dict[str, str], max_workers: int = DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST,
+                 parser_backend: Optional[str] = None, restricted_parsing: Optional[bool] = None,
+                 parse_pool: Optional[ParsePool] = None, stream_parsing: Optional[bool] = None):
+        """Initialize with LinkedIn session cookies after auth.
+
+        max_workers > 1 fetches result pages concurrently; every fetch still
+        draws from a per-session adaptive pacer starting at
+        requests_per_second/burst. Throttled fetches are retried.
+        parser_backend/restricted_parsing/stream_parsing override the
+        html_parsing defaults; parse_pool overrides the SCRAPER_PARSE_PROCESSES
+        shared pool (streamed pages are parsed in-process).
+        """
+        self._configure_parser(parser_backend, restricted_parsing, stream_parsing)
+        self.parse_pool = parse_pool or get_shared_parse_pool()
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = build_pacer(requests_per_second, burst)
+        self.max_retries = DEFAULT_MAX_RETRIES
+        self.session = requests.Session()
+        mount_connection_pool(self.session, self.max_workers)
+        self.session.cookies.update(session_cookies)
+        self.session.headers.update(DEFAULT_HEADERS)
+        # Results seen by this session feed the warm introduction graph, under the member's profile id
+        self.viewer = None
+        self._viewer_checked_at = None
+        self._viewer_lock = threading.Lock()
+    
+    def resolve_viewer(self) -> Optional[str]:
+        """The public profile id of the member these cookies belong to.
+
+        Known once the dashboard has fetched the profile (fetch_user_company);
+        otherwise read from where /in/me/ redirects, without following it, as
+        a paced request. None without cookies, or while that fails (retried
+        after VIEWER_RETRY_SECONDS).
+        """
+        if self.viewer is not None or not self.session.cookies:
+            return self.viewer
+        with self._viewer_lock:
+            checked_at = self._viewer_checked_at
+            if self.viewer is None and (checked_at is None or time.monotonic() - checked_at >= VIEWER_RETRY_SECONDS):
+                self._viewer_checked_at = time.monotonic()
+                try:
+                    metrics.observe_sleep(self.rate_limiter.acquire())
+                    started = time.perf_counter()
+                    response = self.session.get(PROFILE_URL, allow_redirects=False)
+                    metrics.observe_fetch(response.status_code, len(response.content), time.perf_counter() - started)
+                    self.rate_limiter.record_response(response.status_code, response.headers.get('Retry-After'))
+                    if response.is_redirect:
+                        self.viewer = profile_id(response.headers['Location'])
+                except (requests.RequestException, CircuitOpenError):
+                    pass
+        return self.viewer
+    
+    def get_user_company(self) -> str:
+        """Extract the logged-in user's current company."""
+        try:
+            return self.fetch_user_company().company or 'Unknown Company'
+            
+        except Exception as e:
+            return 'Unknown Company'
+    
+    def fetch_user_company(self, etag: Optional[str] = None,
+                           last_modified: Optional[str] = None) -> ProfileFetch:
+        """Fetch the profile page, conditionally if validators from an earlier fetch are given.
+
+        Returns a ProfileFetch; not_modified is True (and company None) when
+        the page is unchanged (304). Raises on any other failure.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        started = time.perf_counter()
+        response = self.session.get(PROFILE_URL, headers=headers)
+        metrics.observe_fetch(response.status_code, len(response.content), time.perf_counter() - started)
+        
+        if response.status_code in (200, 304) and self.viewer is None:
+            self.viewer = profile_id(response.url)
+        if response.status_code == 304:
+            return ProfileFetch(None, response.headers.get('ETag', etag),
+                                response.headers.get('Last-Modified', last_modified), True)
+        response.raise_for_status()
+        return ProfileFetch(self._parse_user_company(response.text), response.headers.get('ETag'),
+                            response.headers.get('Last-Modified'), False)
+    
+    def search_company_employees(self, company_name: str, limit: int = 150, top_k: Optional[int] = None,
+                                 stop_after_weak_pages: Optional[int] = None,
+                                 stop_after_stable_pages: Optional[int] = None) -> Dict[str, Any]:
+        """Search for employees at a company with mutual connections.
+
+        Considers up to `limit` results and returns the top_k strongest
+        (default: all of them). The stop_after_* page counts end paging
+        early; see ranking.py (None uses the SCRAPER_STOP_AFTER_* defaults).
+        """
+        try:
+            ranker = self._new_ranker(limit, top_k, stop_after_weak_pages, stop_after_stable_pages)
+            outcome = {}
+            pages = self._iter_search_pages(company_name, limit, outcome)
+            try:
+                for employees in pages:
+                    with metrics.stage_timer('rank'):
+                        ranker.add_page(employees)
+                    if ranker.stop_reason:
+                        break
+            finally:
+                pages.close()
+            
+            return self._build_paged_response(company_name, ranker, outcome)
+            
+        except Exception as e:
+            return self._build_error_response(company_name, e)
+    
+    def stream_company_employees(self, company_name: str, limit: int = 150, top_k: Optional[int] = None,
+                                 stop_after_weak_pages: Optional[int] = None,
+                                 stop_after_stable_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield each page of employees as soon as it is parsed, then the final result.
+
+        Page events look like {'event': 'page', 'page': n, 'employees': [...]};
+        the last event is the search_company_employees() response with
+        'event' set to 'complete' (or 'error').
+        """
+        try:
+            ranker = self._new_ranker(limit, top_k, stop_after_weak_pages, stop_after_stable_pages)
+            outcome = {}
+            pages = self._iter_search_pages(company_name, limit, outcome)
+            try:
+                for page, employees in enumerate(pages):
+                    with metrics.stage_timer('rank'):
+                        employees = ranker.add_page(employees)
+                    yield {'event': 'page', 'page': page, 'employees': employees}
+                    if ranker.stop_reason:
+                        break
+            finally:
+                pages.close()
+            
+            response = self._build_paged_response(company_name, ranker, outcome)
+            yield {'event': 'error' if 'error' in response else 'complete', **response}
+            
+        except Exception as e:
+            yield {'event': 'error', **self._build_error_response(company_name, e)}
+    
+    def search_companies(self, company_names: List[str], limit: int = 150,
+                         top_k: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Search several companies over this session, yielding each response as its company completes.
+
+        Page fetches are scheduled round-robin across companies, one page in
+        flight per company, so every company gets its first page early and
+        the whole batch shares this session's pacer. Spellings of the same
+        company ("AllCode", "AllCode Inc.") are searched once and each gets
+        the response; learned aliases are not merged, so each company is
+        searched as typed.
+        """
+        spellings = {}
+        for company in dict.fromkeys(company_names):
+            spellings.setdefault(normalize_company(company), []).append(company)
+        others = {names[0]: names[1:] for names in spellings.values()}
+        
+        # (company, next page, ranker) in round-robin order
+        queue = deque((company, 0, self._new_ranker(limit, top_k, None, None)) for company in others)
+        workers = max(self.max_workers, DEFAULT_BATCH_WORKERS)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        in_flight = {}
+        
+        try:
+            while queue or in_flight:
+                while queue and len(in_flight) < workers:
+                    company, page, ranker = queue.popleft()
+                    future = executor.submit(contextvars.copy_context().run, profiling.traced, self._fetch_search_page,
+                                             company, page)
+                    in_flight[future] = (company, page, ranker)
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    company, page, ranker = in_flight.pop(future)
+                    outcome = {'exhausted': False, 'failed_page': None}
+                    try:
+                        employees = future.result()
+                    except (ThrottledError, CircuitOpenError) as e:
+                        employees = None
+                        self._record_page_end(outcome, page, None, e)
+                    except Exception as e:
+                        response = self._build_error_response(company, e)
+                        yield response
+                        for other in others[company]:
+                            yield dict(response, company=other)
+                        continue
+                    
+                    with metrics.stage_timer('rank'):
+                        ranker.add_page(employees or [])
+                    # An empty page or the last one means LinkedIn has no more; a failed page (None) does not
+                    if not employees:
+                        self._record_page_end(outcome, page, employees)
+                    elif page + 1 >= MAX_SEARCH_PAGES:
+                        outcome['exhausted'] = True
+                    if not employees or outcome['exhausted'] or ranker.seen >= limit or ranker.stop_reason:
+                        response = self._build_paged_response(company, ranker, outcome)
+                        yield response
+                        for other in others[company]:
+                            yield dict(response, company=other)
+                    else:
+                        queue.append((company, page + 1, ranker))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _iter_search_pages(self, company_name: str, limit: int,
+                           outcome: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield parsed result pages in order, stopping at the first empty or failed page.
+
+        If given, `outcome` records how paging ended: 'exhausted' is True once
+        LinkedIn has no more results (an empty page, or MAX_SEARCH_PAGES read)
+        and 'failed_page' is the page that could not be fetched, if any, with
+        the 'error' it failed with when it was throttled out. Neither is set
+        when the caller stops early or the limit is reached.
+        """
+        if outcome is None:
+            outcome = {}
+        outcome.update(exhausted=False, failed_page=None)
+        
+        if self.max_workers == 1:
+            collected = 0
+            page = 0
+            while collected < limit:
+                if page >= MAX_SEARCH_PAGES:
+                    outcome['exhausted'] = True
+                    return
+                try:
+                    employees = self._fetch_search_page(company_name, page)
+                except (ThrottledError, CircuitOpenError) as e:
+                    self._record_page_end(outcome, page, None, e)
+                    return
+                if not employees:
+                    self._record_page_end(outcome, page, employees)
+                    return
+                collected += len(employees)
+                page += 1
+                yield employees
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = deque()
+        next_page = 0
+        collected = 0
+        
+        try:
+            while collected < limit:
+                # Keep the pool busy, but don't request pages the limit can't use
+                while (len(pending) < self.max_workers and next_page < MAX_SEARCH_PAGES
+                       and collected + len(pending) * RESULTS_PER_PAGE < limit):
+                    # Run in a copy of this context so per-request timings see the fetch
+                    pending.append(executor.submit(contextvars.copy_context().run, profiling.traced,
+                                                   self._fetch_search_page, company_name, next_page))
+                    next_page += 1
+                
+                if not pending:
+                    # Only MAX_SEARCH_PAGES stops scheduling while results are still wanted
+                    outcome['exhausted'] = True
+                    return
+                
+                page = next_page - len(pending)
+                try:
+                    employees = pending.popleft().result()
+                except (ThrottledError, CircuitOpenError) as e:
+                    self._record_page_end(outcome, page, None, e)
+                    return
+                if not employees:
+                    self._record_page_end(outcome, page, employees)
+                    return
+                collected += len(employees)
+                yield employees
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_search_page(self, company_name: str, page: int) -> Optional[List[Dict[str, Any]]]:
+        """Fetch and parse one page of search results.
+
+        None when LinkedIn answers with another non-200 status (e.g. 403);
+        throttled (429/999) and 5xx responses raise ThrottledError once
+        _get_search_page() has run out of retries.
+        """
+        response = self._get_search_page(company_name, page)
+        if response.status_code != 200:
+            response.close()
+            return None
+        
+        employees = self._parse_response(response)
+        self._observe(company_name, employees)
+        return employees
+    
+    def _observe(self, company_name: str, employees: List[Dict[str, Any]], verified: bool = True) -> None:
+        """Add a page of results to the intro graph as seen by this session's member (see IntroGraph.observe
+        for `verified`)."""
+        viewer = self.resolve_viewer()
+        if viewer:
+            get_intro_graph().observe(viewer, company_name, employees, verified)
+    
+    def _get_search_page(self, company_name: str, page: int) -> requests.Response:
+        """Fetch one page of search results; the only step that is rate limited.
+
+        Throttled (429/999), 5xx and failed requests are retried with jitter
+        up to max_retries times, then raise ThrottledError. With stream_parsing
+        the body is left unread for _parse_response().
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = self.rate_limiter.retry_delay(attempt - 1)
+                metrics.observe_sleep(delay)
+                time.sleep(delay)
+            
+            metrics.observe_sleep(self.rate_limiter.acquire())
+            started = time.perf_counter()
+            try:
+                response = self.session.get(SEARCH_URL, params=self._search_params(company_name, page),
+                                            stream=self.stream_parsing)
+            except requests.RequestException as e:
+                self.rate_limiter.record_failure()
+                outcome = str(e)
+                continue
+            # Streamed bodies are not read yet: time to headers, declared length
+            nbytes = int(response.headers.get('Content-Length') or 0) if self.stream_parsing else len(response.content)
+            metrics.observe_fetch(response.status_code, nbytes, time.perf_counter() - started)
+            
+            if not self.rate_limiter.record_response(response.status_code, response.headers.get('Retry-After')):
+                return response
+            response.close()
+            outcome = f'status {response.status_code}'
+        
+        raise ThrottledError(f'Search page {page} failed after {self.max_retries} retries ({outcome})')
+    
     def generate_ui_mockup(self, search_results: Dict[str, Any], user_logged_in: bool = False) -> str:
         """Generate UI mockup showing logged-in vs logged-out experience."""
         
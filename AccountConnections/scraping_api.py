@@ -4,13 +4,34 @@ LinkedIn Scraping API Server
 Provides HTTP API for the LinkedIn Company Connection Scraper
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, url_for
 from flask_cors import CORS
-from scraping import LinkedInCompanyConnectionScraper
-import json
+from scraping import cookie_fingerprint
+from result_cache import ResultCache, normalize_company_name, parse_cache_control
+from scrape_jobs import ScrapeJobManager, QueueFullError
+from employee_store import EmployeeStore, DEFAULT_PATH as EMPLOYEE_STORE_PATH
+from company_index import get_company_index
+from intro_graph import get_intro_graph
+from scraper_pool import ScraperPool
+from contextlib import nullcontext
+import metrics
+import profiling
+import records
+import os
 
 app = Flask(__name__)
+app.json = records.FastJSONProvider(app)
 CORS(app)  # Allow cross-origin requests from your frontend
+metrics.instrument_flask(app, 'scraping_api')
+profiling.instrument_flask(app, 'scraping_api')
+
+result_cache = ResultCache()
+job_manager = ScrapeJobManager()
+scraper_pool = ScraperPool()
+# Off unless EMPLOYEE_STORE_PATH is set
+employee_store = EmployeeStore() if EMPLOYEE_STORE_PATH else None
+
+MAX_BATCH_COMPANIES = int(os.environ.get('SCRAPE_BATCH_MAX_COMPANIES', '50'))
 
 @app.route('/api/scrape-company', methods=['POST'])
 def scrape_company():
@@ -33,11 +54,17 @@ def scrape_company():
                 'error': 'LinkedIn cookies are required'
             }), 400
         
-        # Initialize scraper with cookies
-        scraper = LinkedInCompanyConnectionScraper(cookies)
+        # Perform scraping (or serve a recent result for this session)
+        _, refresh = parse_cache_control(data.get('cache_control'))
+        def search():
+            scraper = scraper_pool.get(cookies)
+            if employee_store is None:
+                return scraper.search_company_employees(company_name, limit)
+            return employee_store.search(scraper, company_name, limit, refresh)
         
-        # Perform scraping
-        results = scraper.search_company_employees(company_name, limit)
+        with (metrics.request_timings() if data.get('debug') else nullcontext()) as timings:
+            results, cache_status = result_cache.get_or_search(cookies, company_name, limit, search,
+                                                               data.get('cache_control'))
         
         if 'error' in results:
             return jsonify({
@@ -48,13 +75,17 @@ def scrape_company():
             }), 500
         
         # Return results
-        return jsonify({
+        response = {
             'success': True,
             'company': results['company'],
             'total_found': results['total_found'],
             'employees': results['employees'],
-            'capabilities': results['capabilities']
-        })
+            'capabilities': results['capabilities'],
+            'cache': dict(result_cache.stats(), status=cache_status)
+        }
+        if timings is not None:
+            response['timings'] = timings.to_dict()
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({
@@ -64,13 +95,321 @@ def scrape_company():
             'employees': []
         }), 500
 
+@app.route('/api/scrape-company/stream', methods=['POST'])
+def scrape_company_stream():
+    """Stream employees page by page as NDJSON, or as SSE for Accept: text/event-stream."""
+    data = request.get_json()
+    
+    cookies = data.get('cookies', {})
+    company_name = data.get('company_name')
+    limit = data.get('limit', 50)
+    
+    if not company_name:
+        return jsonify({
+            'error': 'company_name is required'
+        }), 400
+    
+    if not cookies:
+        return jsonify({
+            'error': 'LinkedIn cookies are required'
+        }), 400
+    
+    use_sse = request.accept_mimetypes.best == 'text/event-stream'
+    bypass, refresh = parse_cache_control(data.get('cache_control'))
+    
+    def events():
+        cached = None if refresh else result_cache.get(cookies, company_name, limit)
+        if cached is not None:
+            yield {'event': 'complete', **cached, 'cache': dict(result_cache.stats(), status='hit')}
+            return
+        
+        scraper = scraper_pool.get(cookies)
+        for event in scraper.stream_company_employees(company_name, limit):
+            if event['event'] == 'complete':
+                results = {key: value for key, value in event.items() if key != 'event'}
+                if not bypass and result_cache.cacheable(results):
+                    result_cache.put(cookies, company_name, limit, results)
+                status = 'bypass' if bypass else 'refresh' if refresh else 'miss'
+                event = dict(event, cache=dict(result_cache.stats(), status=status))
+            yield event
+    
+    def encode(event):
+        if use_sse:
+            return f"event: {event['event']}\ndata: {records.dumps(event)}\n\n"
+        return records.dumps(event) + '\n'
+    
+    return Response(
+        stream_with_context(encode(event) for event in events()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def batch_request():
+    """Validate a batch request body; returns (params, None) or (None, error response)."""
+    data = request.get_json()
+    
+    cookies = data.get('cookies', {})
+    companies = [name for name in data.get('companies') or [] if isinstance(name, str) and name.strip()]
+    limit = data.get('limit', 50)
+    
+    if not companies:
+        return None, (jsonify({
+            'error': 'companies must be a non-empty list of company names'
+        }), 400)
+    
+    if len(companies) > MAX_BATCH_COMPANIES:
+        return None, (jsonify({
+            'error': f'At most {MAX_BATCH_COMPANIES} companies per batch'
+        }), 400)
+    
+    if not cookies:
+        return None, (jsonify({
+            'error': 'LinkedIn cookies are required'
+        }), 400)
+    
+    return (cookies, companies, limit, data.get('cache_control')), None
+
+def batch_results(cookies, companies, limit, cache_control):
+    """Yield each company's result as it completes: cached ones first, then the rest round-robin."""
+    bypass, refresh = parse_cache_control(cache_control)
+    
+    pending = []
+    for company_name in companies:
+        cached = None if refresh else result_cache.get(cookies, company_name, limit)
+        if cached is not None:
+            yield dict(cached, cache=dict(result_cache.stats(), status='hit'))
+        else:
+            pending.append(company_name)
+    
+    if not pending:
+        return
+    
+    status = 'bypass' if bypass else 'refresh' if refresh else 'miss'
+    for results in scraper_pool.get(cookies).search_companies(pending, limit):
+        if not bypass and result_cache.cacheable(results):
+            result_cache.put(cookies, results['company'], limit, results)
+        yield dict(results, cache=dict(result_cache.stats(), status=status))
+
+@app.route('/api/scrape-companies', methods=['POST'])
+def scrape_companies():
+    """Search many companies over one session and rate budget."""
+    params, error = batch_request()
+    if error:
+        return error
+    
+    results = {company['company']: company for company in batch_results(*params)}
+    
+    return jsonify({
+        'success': all('error' not in company for company in results.values()),
+        'total_companies': len(results),
+        'results': results
+    })
+
+@app.route('/api/scrape-companies/stream', methods=['POST'])
+def scrape_companies_stream():
+    """Stream each company's result as it completes (NDJSON, or SSE for Accept: text/event-stream)."""
+    params, error = batch_request()
+    if error:
+        return error
+    
+    use_sse = request.accept_mimetypes.best == 'text/event-stream'
+    
+    def events():
+        completed = 0
+        for results in batch_results(*params):
+            completed += 1
+            yield {'event': 'company', **results}
+        yield {'event': 'complete', 'total_companies': completed}
+    
+    def encode(event):
+        if use_sse:
+            return f"event: {event['event']}\ndata: {records.dumps(event)}\n\n"
+        return records.dumps(event) + '\n'
+    
+    return Response(
+        stream_with_context(encode(event) for event in events()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/jobs', methods=['POST'])
+def create_scrape_job():
+    """Queue a company scrape; identical in-flight requests join the same job."""
+    data = request.get_json()
+    
+    cookies = data.get('cookies', {})
+    company_name = data.get('company_name')
+    limit = data.get('limit', 50)
+    
+    if not company_name:
+        return jsonify({
+            'error': 'company_name is required'
+        }), 400
+    
+    if not cookies:
+        return jsonify({
+            'error': 'LinkedIn cookies are required'
+        }), 400
+    
+    def run(job):
+        scraper = scraper_pool.get(cookies)
+        for event in scraper.stream_company_employees(company_name, limit):
+            if event['event'] == 'page':
+                job.record_page(len(event['employees']))
+        
+        results = {key: value for key, value in event.items() if key != 'event'}
+        if result_cache.cacheable(results):
+            result_cache.put(cookies, company_name, limit, results)
+        return results
+    
+    try:
+        key = (cookie_fingerprint(cookies), normalize_company_name(company_name), limit)
+        job, joined = job_manager.submit(key, run)
+    except QueueFullError as e:
+        return jsonify({
+            'error': str(e)
+        }), 503
+    
+    return jsonify(dict(
+        job.to_status(),
+        joined=joined,
+        status_url=url_for('scrape_job_status', job_id=job.id),
+        result_url=url_for('scrape_job_result', job_id=job.id)
+    )), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def scrape_job_status(job_id):
+    """Progress of a queued scrape."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'error': 'Unknown job id'
+        }), 404
+    
+    return jsonify(job.to_status())
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def scrape_job_result(job_id):
+    """Result of a finished scrape; 202 with status while it is still running."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'error': 'Unknown job id'
+        }), 404
+    
+    if not job.finished:
+        return jsonify(job.to_status()), 202
+    
+    if job.status == 'failed':
+        return jsonify({
+            'error': job.error,
+            'company': (job.result or {}).get('company', 'Unknown'),
+            'total_found': 0,
+            'employees': []
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'company': job.result['company'],
+        'total_found': job.result['total_found'],
+        'employees': job.result['employees'],
+        'capabilities': job.result['capabilities']
+    })
+
+@app.route('/api/employees/query', methods=['POST'])
+def query_employees():
+    """Query stored employees across companies without scraping."""
+    data = request.get_json()
+    
+    cookies = data.get('cookies', {})
+    if not cookies:
+        return jsonify({
+            'error': 'LinkedIn cookies are required'
+        }), 400
+    
+    if employee_store is None:
+        return jsonify({
+            'error': 'The employee store is disabled (set EMPLOYEE_STORE_PATH)'
+        }), 404
+    
+    # Stored employees belong to the member, not the cookie set
+    viewer = scraper_pool.get(cookies).resolve_viewer()
+    if viewer is None:
+        return jsonify({
+            'error': 'Could not identify the LinkedIn member for these cookies'
+        }), 403
+    
+    try:
+        employees = employee_store.query(
+            viewer,
+            companies=data.get('companies'),
+            min_strength=int(data.get('min_strength', 0)),
+            degree=data.get('connection_degree'),
+            limit=int(data.get('limit', 50)),
+            offset=int(data.get('offset', 0))
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'error': f'Invalid query: {e}'
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'total_found': len(employees),
+        'employees': employees,
+        'store': employee_store.stats()
+    })
+
+@app.route('/api/intro-paths', methods=['POST'])
+def intro_paths():
+    """Best warm introduction paths to a company's people, from the caller's and their team's results."""
+    data = request.get_json()
+    
+    cookies = data.get('cookies', {})
+    company_name = data.get('company_name')
+    
+    if not company_name:
+        return jsonify({
+            'error': 'company_name is required'
+        }), 400
+    
+    if not cookies:
+        return jsonify({
+            'error': 'LinkedIn cookies are required'
+        }), 400
+    
+    try:
+        limit = int(data.get('limit', 20))
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'error': f'Invalid limit: {e}'
+        }), 400
+    
+    # Only a session LinkedIn recognises gets its member's (and team's) connections
+    viewer = scraper_pool.get(cookies).resolve_viewer()
+    if viewer is None:
+        return jsonify({
+            'error': 'Could not identify the LinkedIn member for these cookies'
+        }), 403
+    paths = get_intro_graph().intro_paths(viewer, company_name, limit)
+    
+    return jsonify({
+        'success': True,
+        'company': company_name,
+        'total_found': len(paths),
+        'paths': paths
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return jsonify({
         'status': 'healthy',
         'service': 'LinkedIn Scraping API',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'cache': result_cache.stats(),
+        'companies': get_company_index().stats(),
+        'intro_graph': get_intro_graph().stats()
     })
 
 @app.route('/api/test-scraper', methods=['POST'])
@@ -126,8 +465,16 @@ if __name__ == '__main__':
     print("🚀 Starting LinkedIn Scraping API Server...")
     print("📡 Endpoints:")
     print("   POST /api/scrape-company - Real LinkedIn scraping")
+    print("   POST /api/scrape-company/stream - Incremental results (NDJSON/SSE)")
+    print("   POST /api/scrape-companies[/stream] - Batch search across companies")
+    print("   POST /api/jobs - Queue a scrape in the background")
+    print("   GET  /api/jobs/<id> - Job progress")
+    print("   GET  /api/jobs/<id>/result - Job result")
+    print("   POST /api/employees/query - Query stored employees (no scraping)")
+    print("   POST /api/intro-paths - Warm introduction paths to a company's people")
     print("   POST /api/test-scraper - Test with mock data")
     print("   GET  /api/health - Health check")
+    print("   GET  /metrics - Prometheus metrics")
     print("🌐 Server running on http://localhost:5000")
     
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
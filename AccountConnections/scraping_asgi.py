@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Scraping ASGI Server
+asyncio entry point for the LinkedIn Company Connection Scraper.
+
+Serves the same /api/scrape-company and /api/health contract as
+scraping_api.py, but each scrape awaits network I/O instead of holding a
+worker, so one process handles many concurrent scrapes:
+
+    uvicorn scraping_asgi:app --host 0.0.0.0 --port 5000
+
+The request and response fields are the same (tests/test_asgi_contract.py
+checks them against scraping_api.py), but only the scrape itself is. Not
+supported here:
+- the result cache: cache_control is ignored, every request scrapes and
+  responses carry no 'cache' field
+- the employee store (EMPLOYEE_STORE_PATH)
+- "debug" timings, /metrics and request profiling
+- the stream, batch, jobs, employee query and intro-paths endpoints
+- scraper reuse: each request gets a new scraper, so a session's pacing
+  does not carry over from one request to the next
+"""
+
+import json
+from typing import Dict, Any, Tuple
+
+import records
+from async_scraping import AsyncLinkedInCompanyConnectionScraper, close_shared_connector
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+    (b'access-control-allow-headers', b'Content-Type'),
+]
+
+
+async def scrape_company(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """API endpoint for scraping company employees."""
+    try:
+        # Extract parameters
+        cookies = data.get('cookies', {})
+        company_name = data.get('company_name')
+        limit = data.get('limit', 50)
+
+        if not company_name:
+            return {'error': 'company_name is required'}, 400
+
+        if not cookies:
+            return {'error': 'LinkedIn cookies are required'}, 400
+
+        async with AsyncLinkedInCompanyConnectionScraper(cookies) as scraper:
+            results = await scraper.search_company_employees(company_name, limit)
+
+        if 'error' in results:
+            return {
+                'error': results['error'],
+                'company': company_name,
+                'total_found': 0,
+                'employees': []
+            }, 500
+
+        return {
+            'success': True,
+            'company': results['company'],
+            'total_found': results['total_found'],
+            'employees': results['employees'],
+            'capabilities': results['capabilities']
+        }, 200
+
+    except Exception as e:
+        return {
+            'error': str(e),
+            'company': data.get('company_name', 'Unknown'),
+            'total_found': 0,
+            'employees': []
+        }, 500
+
+
+async def health_check() -> Tuple[Dict[str, Any], int]:
+    """Health check endpoint."""
+    return {
+        'status': 'healthy',
+        'service': 'LinkedIn Scraping API (async)',
+        'version': '1.0.0'
+    }, 200
+
+
+async def app(scope, receive, send):
+    """ASGI application."""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    method = scope['method']
+    path = scope['path']
+
+    if method == 'OPTIONS':
+        await _send_response(send, 204, b'', [])
+    elif path == '/api/health' and method == 'GET':
+        await _send_json(send, *await health_check())
+    elif path == '/api/scrape-company' and method == 'POST':
+        try:
+            data = json.loads(await _read_body(receive) or b'null')
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            await _send_json(send, {'error': 'Request body must be a JSON object'}, 400)
+        else:
+            await _send_json(send, *await scrape_company(data))
+    else:
+        await _send_json(send, {'error': 'Not found'}, 404)
+
+
+async def _lifespan(receive, send):
+    """Close the shared connection pool when the server shuts down."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_shared_connector()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def _read_body(receive) -> bytes:
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+async def _send_json(send, payload: Dict[str, Any], status: int):
+    await _send_response(send, status, records.dumps(payload).encode('utf-8'),
+                         [(b'content-type', b'application/json')])
+
+
+async def _send_response(send, status: int, body: bytes, headers):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': headers + CORS_HEADERS + [(b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🚀 Starting async LinkedIn Scraping API Server...")
+    print("📡 Endpoints:")
+    print("   POST /api/scrape-company - Real LinkedIn scraping")
+    print("   GET  /api/health - Health check")
+    print("🌐 Server running on http://localhost:5000")
+
+    uvicorn.run(app, port=5000, host='0.0.0.0')
@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Shared Cache Backends
+Key/value storage with expiry and per-key compute locks, so caches can be
+shared by every gunicorn worker on a host instead of living in one:
+
+- memory: this process only (the default; what the caches always did)
+- sqlite: a SQLite file in WAL mode (SHARED_CACHE_PATH)
+- mmap:   a fixed-size memory-mapped file of 4-way slot buckets and a
+          table of per-key compute locks, guarded by fcntl record locks;
+          values too large for a slot are not cached
+
+get_or_compute() makes one worker compute a missing key while the others
+wait for its result. Locks expire after SHARED_CACHE_LOCK_TTL seconds, so a
+worker that dies mid-compute does not wedge the key; a waiter gives up
+after SHARED_CACHE_WAIT_TIMEOUT and computes the value itself.
+
+    SHARED_CACHE_BACKEND=sqlite SHARED_CACHE_PATH=/tmp/scraper-cache.db gunicorn ...
+"""
+
+import logging
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import metrics
+
+BACKENDS = ('memory', 'sqlite', 'mmap')
+DEFAULT_BACKEND = os.environ.get('SHARED_CACHE_BACKEND', 'memory')
+DEFAULT_PATH = os.environ.get('SHARED_CACHE_PATH', '')
+DEFAULT_MAX_ENTRIES = int(os.environ.get('SHARED_CACHE_MAX_ENTRIES', '4096'))
+DEFAULT_LOCK_TTL = float(os.environ.get('SHARED_CACHE_LOCK_TTL', '300'))
+DEFAULT_WAIT_TIMEOUT = float(os.environ.get('SHARED_CACHE_WAIT_TIMEOUT', '120'))
+DEFAULT_MMAP_SLOTS = int(os.environ.get('SHARED_CACHE_MMAP_SLOTS', '256'))
+DEFAULT_MMAP_SLOT_KB = int(os.environ.get('SHARED_CACHE_MMAP_SLOT_KB', '256'))
+
+# Polling interval while another worker computes a key: starts short, backs off
+WAIT_POLL_MIN = 0.02
+WAIT_POLL_MAX = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Storage interface: values with expiry plus per-key compute locks."""
+
+    name = 'base'
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """The unexpired value for key, or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store value for ttl seconds."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop key's value, if any."""
+
+    @abstractmethod
+    def try_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take key's compute lock for up to ttl seconds; a token for unlock(), or None if held."""
+
+    @abstractmethod
+    def unlock(self, key: str, token: str) -> None:
+        """Release a lock taken with try_lock(), if it is still ours."""
+
+    @abstractmethod
+    def entries(self) -> int:
+        """Number of unexpired values (approximate for shared backends)."""
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local LRU backend; values are stored as is, not copied."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._values = OrderedDict()
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    def try_lock(self, key: str, ttl: float) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            held = self._locks.get(key)
+            if held is not None and held[1] > now:
+                return None
+            if len(self._locks) >= self.max_entries:
+                # Locks whose holder never unlocked (it died, or its lock expired and was taken over)
+                for stale in [stale for stale, (_, expires_at) in self._locks.items() if expires_at <= now]:
+                    del self._locks[stale]
+            token = uuid.uuid4().hex
+            self._locks[key] = (token, now + ttl)
+            return token
+
+    def unlock(self, key: str, token: str) -> None:
+        with self._lock:
+            held = self._locks.get(key)
+            if held is not None and held[0] == token:
+                del self._locks[key]
+
+    def entries(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+
+class SQLiteBackend(CacheBackend):
+    """SQLite-file backend shared by every process that opens the same path."""
+
+    name = 'sqlite'
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL);
+    CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires_at);
+    CREATE TABLE IF NOT EXISTS cache_locks (key TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL);
+    """
+
+    def __init__(self, path: str = '', max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path or 'shared_cache.db'
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        # Autocommit; writes that must be atomic across processes use BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM cache WHERE key = ? AND expires_at > ?',
+                                     (key, time.time())).fetchone()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                                   (key, data, now + ttl))
+                self._conn.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+                # Over capacity: drop the entries closest to expiry
+                self._conn.execute('DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at '
+                                   'LIMIT max(0, (SELECT COUNT(*) FROM cache) - ?))', (self.max_entries,))
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def try_lock(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('DELETE FROM cache_locks WHERE key = ? AND expires_at <= ?', (key, now))
+                acquired = self._conn.execute('INSERT OR IGNORE INTO cache_locks (key, token, expires_at) '
+                                              'VALUES (?, ?, ?)', (key, token, now + ttl)).rowcount == 1
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return token if acquired else None
+
+    def unlock(self, key: str, token: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM cache_locks WHERE key = ? AND token = ?', (key, token))
+
+    def entries(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM cache WHERE expires_at > ?', (time.time(),)).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class MmapBackend(CacheBackend):
+    """Memory-mapped file of fixed-size slots shared by every process that maps the same path.
+
+    Slots are grouped into buckets of WAYS; a key may occupy any slot of its
+    bucket, evicting the entry closest to expiry when all are taken (this
+    is a cache). A slot holds its key's digest, expiry and the pickled
+    value. Compute locks live in a separate table keyed by digest (one lock
+    per key, found within LOCK_PROBES records of its hash), ahead of the
+    slots. Threads in a process serialize on a lock; processes on an fcntl
+    record lock over the bucket or the lock table.
+    """
+
+    name = 'mmap'
+
+    MAGIC = b'SCM3'
+    WAYS = 4
+    FILE_HEADER = struct.Struct('<4sIII')
+    # key digest, expires_at, value length
+    SLOT_HEADER = struct.Struct('<16sdI')
+    SLOT_HEADER_SIZE = 64
+    # key digest, lock token, lock expires_at
+    LOCK_RECORD = struct.Struct('<16s16sd')
+    LOCKS = 1024
+    LOCK_PROBES = 8
+
+    def __init__(self, path: str = '', slots: int = DEFAULT_MMAP_SLOTS, slot_kb: int = DEFAULT_MMAP_SLOT_KB):
+        if fcntl is None:
+            raise RuntimeError('The mmap cache backend needs fcntl (POSIX)')
+        self.path = path or 'shared_cache.mmap'
+        self.buckets = max(1, slots // self.WAYS)
+        self.slots = self.buckets * self.WAYS
+        self.slot_size = max(1, slot_kb) * 1024
+        self.bucket_size = self.slot_size * self.WAYS
+        self.max_value_size = self.slot_size - self.SLOT_HEADER_SIZE
+        self.too_large = 0
+        self._lock = threading.Lock()
+        self._lock_table = self.FILE_HEADER.size
+        self._lock_table_size = self.LOCKS * self.LOCK_RECORD.size
+        self._slots_start = self._lock_table + self._lock_table_size
+
+        size = self._slots_start + self.slots * self.slot_size
+        header = self.FILE_HEADER.pack(self.MAGIC, self.slots, self.slot_size, self.LOCKS)
+        self._fd = self._open_locked()
+        try:
+            existing = os.fstat(self._fd).st_size
+            if existing and os.pread(self._fd, self.FILE_HEADER.size, 0) != header:
+                # Another layout (or not ours). Processes may still map it, and truncating a mapped
+                # file kills them with SIGBUS, so a new file replaces it instead
+                fd = self._create_locked(size, header)
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = fd
+            elif existing < size:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, header, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+
+    def get(self, key: str) -> Optional[Any]:
+        digest, bucket = self._bucket(key)
+        with self._bucket_lock(bucket, fcntl.LOCK_SH):
+            offset = self._find(bucket, digest, time.time())
+            if offset is None:
+                return None
+            length = self.SLOT_HEADER.unpack_from(self._map, offset)[2]
+            start = offset + self.SLOT_HEADER_SIZE
+            data = self._map[start:start + length]
+        return pickle.loads(data)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_value_size:
+            self.too_large += 1
+            return
+
+        digest, bucket = self._bucket(key)
+        with self._bucket_lock(bucket, fcntl.LOCK_EX):
+            now = time.time()
+            offset = self._find(bucket, digest, now)
+            if offset is None:
+                # An empty or expired slot, else the one closest to expiry
+                offset = min(self._slot_offsets(bucket),
+                             key=lambda slot: self.SLOT_HEADER.unpack_from(self._map, slot)[1])
+            start = offset + self.SLOT_HEADER_SIZE
+            self._map[start:start + len(data)] = data
+            self.SLOT_HEADER.pack_into(self._map, offset, digest, now + ttl, len(data))
+
+    def delete(self, key: str) -> None:
+        digest, bucket = self._bucket(key)
+        with self._bucket_lock(bucket, fcntl.LOCK_EX):
+            offset = self._find(bucket, digest, time.time())
+            if offset is not None:
+                self.SLOT_HEADER.pack_into(self._map, offset, bytes(16), 0.0, 0)
+
+    def try_lock(self, key: str, ttl: float) -> Optional[str]:
+        digest, _ = self._bucket(key)
+        token = uuid.uuid4().bytes
+        now = time.time()
+        with self._table_lock():
+            free = None
+            for offset in self._lock_offsets(digest):
+                held, _, lock_expires = self.LOCK_RECORD.unpack_from(self._map, offset)
+                if lock_expires <= now:
+                    free = offset if free is None else free
+                elif held == digest:
+                    return None
+            if free is None:
+                # Every nearby lock is held: take over the one expiring first (at worst a duplicate compute)
+                free = min(self._lock_offsets(digest), key=lambda offset: self.LOCK_RECORD.unpack_from(
+                    self._map, offset)[2])
+            self.LOCK_RECORD.pack_into(self._map, free, digest, token, now + ttl)
+        return token.hex()
+
+    def unlock(self, key: str, token: str) -> None:
+        digest, _ = self._bucket(key)
+        with self._table_lock():
+            for offset in self._lock_offsets(digest):
+                held, held_token, _ = self.LOCK_RECORD.unpack_from(self._map, offset)
+                if held == digest and held_token.hex() == token:
+                    self.LOCK_RECORD.pack_into(self._map, offset, bytes(16), bytes(16), 0.0)
+                    return
+
+    def entries(self) -> int:
+        now = time.time()
+        count = 0
+        for slot in range(self.slots):
+            stored, expires_at = struct.unpack_from('<16sd', self._map, self._slots_start + slot * self.slot_size)
+            count += stored != bytes(16) and expires_at > now
+        return count
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def _open_locked(self) -> int:
+        """Open (or create) the file at path and lock all of it, reopening if it was replaced meanwhile."""
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                if os.stat(self.path).st_ino == os.fstat(fd).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _create_locked(self, size: int, header: bytes) -> int:
+        """Put a new, empty, locked file of `size` bytes at path; returns its descriptor."""
+        temp_path = f'{self.path}.{uuid.uuid4().hex}.tmp'
+        fd = os.open(temp_path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            os.ftruncate(fd, size)
+            os.pwrite(fd, header, 0)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.close(fd)
+            os.unlink(temp_path)
+            raise
+        return fd
+
+    def _bucket(self, key: str) -> Tuple[bytes, int]:
+        """Key digest and the byte offset of its bucket."""
+        digest = blake2b(key.encode('utf-8'), digest_size=16).digest()
+        bucket = int.from_bytes(digest[:8], 'little') % self.buckets
+        return digest, self._slots_start + bucket * self.bucket_size
+
+    def _slot_offsets(self, bucket: int) -> range:
+        return range(bucket, bucket + self.bucket_size, self.slot_size)
+
+    def _lock_offsets(self, digest: bytes) -> List[int]:
+        """Offsets of the lock records digest's lock may occupy."""
+        first = int.from_bytes(digest[8:], 'little')
+        return [self._lock_table + (first + probe) % self.LOCKS * self.LOCK_RECORD.size
+                for probe in range(self.LOCK_PROBES)]
+
+    def _find(self, bucket: int, digest: bytes, now: float) -> Optional[int]:
+        """Offset of the slot holding an unexpired value for digest, if any."""
+        for offset in self._slot_offsets(bucket):
+            stored, expires_at = struct.unpack_from('<16sd', self._map, offset)
+            if stored == digest and expires_at > now:
+                return offset
+        return None
+
+    def _bucket_lock(self, bucket: int, mode: int) -> '_RegionLock':
+        return _RegionLock(self, bucket, self.bucket_size, mode)
+
+    def _table_lock(self) -> '_RegionLock':
+        return _RegionLock(self, self._lock_table, self._lock_table_size, fcntl.LOCK_EX)
+
+
+class _RegionLock:
+    """Thread lock plus an fcntl record lock over one bucket or the lock table."""
+
+    __slots__ = ('backend', 'offset', 'length', 'mode')
+
+    def __init__(self, backend: MmapBackend, offset: int, length: int, mode: int):
+        self.backend = backend
+        self.offset = offset
+        self.length = length
+        self.mode = mode
+
+    def __enter__(self) -> None:
+        # fcntl locks are per process, so threads also take the backend's lock
+        self.backend._lock.acquire()
+        try:
+            fcntl.lockf(self.backend._fd, self.mode, self.length, self.offset)
+        except BaseException:
+            self.backend._lock.release()
+            raise
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            fcntl.lockf(self.backend._fd, fcntl.LOCK_UN, self.length, self.offset)
+        finally:
+            self.backend._lock.release()
+
+
+def open_backend(name: str = DEFAULT_BACKEND, path: str = DEFAULT_PATH,
+                 max_entries: int = DEFAULT_MAX_ENTRIES) -> CacheBackend:
+    """A backend by name; a shared backend that cannot be opened falls back to memory."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown cache backend '{name}', expected one of {', '.join(BACKENDS)}")
+    try:
+        if name == 'sqlite':
+            return SQLiteBackend(path, max_entries)
+        if name == 'mmap':
+            return MmapBackend(path)
+    except (OSError, RuntimeError, sqlite3.Error) as e:
+        logger.warning("Cache backend '%s' is unavailable (%s), falling back to memory", name, e)
+    return MemoryBackend(max_entries)
+
+
+class SharedCache:
+    """A namespace of keys in a backend, with single-flight get_or_compute() and per-worker counters."""
+
+    def __init__(self, namespace: str, backend: Optional[CacheBackend] = None,
+                 lock_ttl: float = DEFAULT_LOCK_TTL, wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
+        """Initialize with a key namespace, backend (default: SHARED_CACHE_BACKEND), compute lock
+        lifetime and how long to wait for another worker's compute (seconds)."""
+        self.namespace = namespace
+        self.backend = backend or open_backend()
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.backend.get(self._key(key))
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.backend.set(self._key(key), value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(self._key(key))
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: float,
+                       accept: Callable[[Any], bool] = lambda value: True,
+                       store: Callable[[Any], bool] = lambda value: True) -> Tuple[Any, str]:
+        """The cached value for key if `accept`able, else one worker computes it while others wait.
+
+        `store` decides whether a computed value is cached. Returns (value,
+        status): hit, shared (computed by another worker while we waited)
+        or miss (computed here).
+        """
+        full_key = self._key(key)
+        value = self.backend.get(full_key)
+        if value is not None and accept(value):
+            self._count('hit')
+            return value, 'hit'
+
+        token = self.backend.try_lock(full_key, self.lock_ttl)
+        status = 'hit'
+        if token is None:
+            value, token = self._wait_for(full_key, accept)
+            status = 'shared'
+            if value is not None:
+                self._count('shared')
+                return value, 'shared'
+
+        try:
+            if token is not None:
+                # The worker that held the lock may have stored the value just before releasing it
+                value = self.backend.get(full_key)
+                if value is not None and accept(value):
+                    self._count(status)
+                    return value, status
+            self._count('miss')
+            value = compute()
+            if store(value):
+                self.backend.set(full_key, value, ttl)
+            return value, 'miss'
+        finally:
+            if token is not None:
+                self.backend.unlock(full_key, token)
+
+    def record(self, status: str) -> None:
+        """Count a lookup made outside get_or_compute() (hit or miss)."""
+        self._count(status)
+
+    def stats(self) -> Dict[str, Any]:
+        """This worker's counters and hit rate, plus the backend's entry count."""
+        with self._counter_lock:
+            hits, shared_hits, misses = self.hits, self.shared_hits, self.misses
+        lookups = hits + shared_hits + misses
+        return {
+            'backend': self.backend.name,
+            'worker': os.getpid(),
+            'hits': hits,
+            'shared_hits': shared_hits,
+            'misses': misses,
+            'hit_rate': round((hits + shared_hits) / lookups, 4) if lookups else 0.0,
+            'entries': self.backend.entries()
+        }
+
+    def _wait_for(self, full_key: str, accept: Callable[[Any], bool]) -> Tuple[Optional[Any], Optional[str]]:
+        """Poll until another worker's value appears (value, None) or we get the lock (None, token).
+
+        (None, None) when the wait times out: the caller computes unlocked.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        delay = WAIT_POLL_MIN
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, WAIT_POLL_MAX)
+            value = self.backend.get(full_key)
+            if value is not None and accept(value):
+                return value, None
+            token = self.backend.try_lock(full_key, self.lock_ttl)
+            if token is not None:
+                return None, token
+        return None, None
+
+    def _count(self, status: str) -> None:
+        with self._counter_lock:
+            if status == 'hit':
+                self.hits += 1
+            elif status == 'shared':
+                self.shared_hits += 1
+            else:
+                self.misses += 1
+        metrics.observe_cache(self.namespace, status)
+
+    def _key(self, key: str) -> str:
+        return f'{self.namespace}:{key}'
@@ -0,0 +1,46 @@
+"""
+Test setup: every scraper talks to one benchmarks/mock_linkedin.py server,
+and the company index, intro graph, employee store and caches stay in
+memory. The environment is set here, before the modules that read it at
+import are imported by the tests.
+
+    cd AccountConnections && python -m pytest -q
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from mock_linkedin import MockLinkedInServer  # noqa: E402
+
+MOCK_LINKEDIN = MockLinkedInServer(pages=3, padding_kb=2).start()
+
+os.environ.update({
+    'LINKEDIN_BASE_URL': MOCK_LINKEDIN.url,
+    'COMPANY_INDEX_PATH': '',
+    'INTRO_GRAPH_PATH': '',
+    'EMPLOYEE_STORE_PATH': '',
+    'SHARED_CACHE_BACKEND': 'memory',
+    'SCRAPER_EXTRA_ACCOUNTS_FILE': '',
+    'SCRAPER_PARSE_PROCESSES': '0',
+    'SCRAPER_REQUESTS_PER_SECOND': '1000',
+    'SCRAPER_BURST': '1000',
+})
+
+
+@pytest.fixture
+def linkedin():
+    """The mock LinkedIn server, with throttling switched back off after the test."""
+    yield MOCK_LINKEDIN
+    MOCK_LINKEDIN.throttle_rate = 0.0
+    MOCK_LINKEDIN.throttle_status = 429
+    MOCK_LINKEDIN.retry_after = 1
+
+
+def pytest_sessionfinish(session, exitstatus):
+    MOCK_LINKEDIN.stop()
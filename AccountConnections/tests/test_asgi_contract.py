@@ -0,0 +1,60 @@
+"""scraping_asgi.py answers /api/scrape-company like scraping_api.py (see its docstring for the rest)."""
+
+import asyncio
+import json
+
+import pytest
+
+import scraping_api
+import scraping_asgi
+
+# Fields scraping_api.py adds that the ASGI server does not support
+FLASK_ONLY = {'cache', 'timings'}
+
+
+def post_asgi(body):
+    """(status, JSON body) of a POST /api/scrape-company to the ASGI app."""
+    messages = [{'type': 'http.request', 'body': json.dumps(body).encode('utf-8'), 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def request():
+        scope = {'type': 'http', 'method': 'POST', 'path': '/api/scrape-company', 'headers': []}
+        await scraping_asgi.app(scope, receive, send)
+        await scraping_asgi.close_shared_connector()
+
+    asyncio.run(request())
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+
+def post_flask(body):
+    response = scraping_api.app.test_client().post('/api/scrape-company', json=body)
+    payload = response.get_json()
+    return response.status_code, {key: value for key, value in payload.items() if key not in FLASK_ONLY}
+
+
+@pytest.mark.parametrize('body', [
+    {'cookies': {'li_at': 'contract'}, 'company_name': 'AllCode', 'limit': 20, 'cache_control': 'no-store'},
+    {'cookies': {'li_at': 'contract'}, 'company_name': 'AllCode', 'limit': 100, 'cache_control': 'no-store'},
+    {'cookies': {'li_at': 'contract'}, 'limit': 20},
+    {'company_name': 'AllCode'},
+])
+def test_same_responses(linkedin, body):
+    assert post_asgi(body) == post_flask(body)
+
+
+def test_same_error_when_throttled(linkedin):
+    linkedin.throttle_rate = 1.0
+    linkedin.retry_after = 3600
+    body = {'cookies': {'li_at': 'contract-throttled'}, 'company_name': 'AllCode', 'cache_control': 'no-store'}
+
+    asgi_status, asgi_body = post_asgi(body)
+    flask_status, flask_body = post_flask(body)
+    assert asgi_status == flask_status == 500
+    assert asgi_body.keys() == flask_body.keys()
+    assert asgi_body['employees'] == flask_body['employees'] == []
@@ -0,0 +1,66 @@
+"""Every parser backend extracts the same records as html.parser."""
+
+import pytest
+
+import fixtures
+from html_parsing import PARSER_BACKENDS, resolve_backend
+from scraping import LinkedInCompanyConnectionScraper
+
+CONFIGURATIONS = [(backend, restricted) for backend in PARSER_BACKENDS for restricted in (False, True)
+                  if not (backend == 'selectolax' and restricted)]
+
+SEARCH_PAGES = [fixtures.search_page_html(start=i * 10, seed=3, padding_kb=20) for i in range(5)]
+PROFILE_PAGES = [fixtures.profile_page_html(padding_kb=20),
+                 fixtures.profile_page_html(company='Müller & Söhne GmbH', title='CTO', padding_kb=20)]
+
+
+def scraper_for(backend, restricted=False, stream_parsing=False):
+    if resolve_backend(backend) != backend:
+        pytest.skip(f'{backend} is not installed')
+    return LinkedInCompanyConnectionScraper({}, parser_backend=backend, restricted_parsing=restricted,
+                                            stream_parsing=stream_parsing)
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    return LinkedInCompanyConnectionScraper({}, parser_backend='html.parser', restricted_parsing=False)
+
+
+@pytest.mark.parametrize('backend, restricted', CONFIGURATIONS)
+def test_search_pages_parse_alike(baseline, backend, restricted):
+    scraper = scraper_for(backend, restricted)
+    for html in SEARCH_PAGES:
+        expected = baseline._parse_search_results(html)
+        assert len(expected) == 10
+        assert scraper._parse_search_results(html) == expected
+
+
+@pytest.mark.parametrize('backend, restricted', CONFIGURATIONS)
+def test_profile_pages_parse_alike(baseline, backend, restricted):
+    scraper = scraper_for(backend, restricted)
+    for html in PROFILE_PAGES:
+        assert scraper._parse_user_company(html) == baseline._parse_user_company(html)
+
+
+@pytest.mark.parametrize('backend', PARSER_BACKENDS)
+def test_empty_page_has_no_results(backend):
+    assert scraper_for(backend)._parse_search_results(fixtures.empty_search_page_html(20)) == []
+
+
+@pytest.mark.parametrize('backend', PARSER_BACKENDS)
+def test_streamed_parsing_matches_whole_pages(baseline, backend):
+    scraper = scraper_for(backend)
+    for html in SEARCH_PAGES[:2]:
+        expected = baseline._parse_search_results(html)
+        for size in (97, 16384):
+            chunks = (html[i:i + size] for i in range(0, len(html), size))
+            assert scraper._parse_search_stream(chunks) == expected
+
+
+@pytest.mark.parametrize('backend, stream_parsing', [(backend, stream) for backend in PARSER_BACKENDS
+                                                     for stream in (False, True)])
+def test_fetched_pages_parse_alike(linkedin, baseline, backend, stream_parsing):
+    scraper = scraper_for(backend, stream_parsing=stream_parsing)
+    expected = baseline._parse_search_results(linkedin.search_page(0, 'AllCode').decode('utf-8'))
+    assert expected
+    assert scraper._fetch_search_page('AllCode', 0) == expected
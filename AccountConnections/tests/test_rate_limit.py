@@ -0,0 +1,122 @@
+"""AIMD pacing, Retry-After and the circuit breaker, alone and against the mock LinkedIn."""
+
+import time
+from email.utils import formatdate
+
+import pytest
+
+from rate_limit import AdaptivePacer, CircuitOpenError, ThrottledError, parse_retry_after
+from scraping import LinkedInCompanyConnectionScraper
+
+
+def test_slow_start_then_additive_increase():
+    pacer = AdaptivePacer(10, max_rate=100, slow_start=2.0, increase=1.0, backoff=0.5)
+    pacer.record_success()
+    assert pacer.rate == 20
+    pacer.record_throttle()
+    assert pacer.rate == 10
+    pacer.record_success()
+    assert pacer.rate == 11
+
+
+def test_rate_stays_between_min_and_max():
+    pacer = AdaptivePacer(10, max_rate=12, min_rate=5, failure_threshold=100)
+    for _ in range(20):
+        pacer.record_success()
+    assert pacer.rate == 12
+    for _ in range(20):
+        pacer.record_throttle()
+    assert pacer.rate == 5
+
+
+def test_responses_drive_the_pacer():
+    pacer = AdaptivePacer(10, failure_threshold=100)
+    assert pacer.record_response(200) is False
+    assert pacer.record_response(404) is False
+    assert pacer.record_response(429) is True
+    assert pacer.record_response(999) is True
+    assert pacer.record_response(503) is True
+    assert pacer.stats()['throttled'] == 2
+    assert pacer.stats()['failures'] == 1
+
+
+def test_retry_after_holds_requests():
+    pacer = AdaptivePacer(1000, burst=10)
+    pacer.record_throttle(0.2)
+    assert 0.1 < pacer.acquire() <= 0.2
+
+
+def test_retry_after_beyond_max_hold_opens_circuit():
+    pacer = AdaptivePacer(1000, burst=10, max_hold=60)
+    pacer.record_throttle(3600)
+    assert pacer.stats()['circuit_open']
+    with pytest.raises(CircuitOpenError):
+        pacer.acquire()
+
+
+def test_consecutive_failures_open_circuit_until_cooldown():
+    pacer = AdaptivePacer(1000, burst=10, failure_threshold=3, cooldown=0.1)
+    for _ in range(3):
+        pacer.record_failure()
+    with pytest.raises(CircuitOpenError):
+        pacer.acquire()
+    time.sleep(0.15)
+    pacer.acquire()
+    # Half-open: one more failure reopens it
+    pacer.record_failure()
+    with pytest.raises(CircuitOpenError):
+        pacer.acquire()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('5') == 5.0
+    assert parse_retry_after('-3') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def throttled_scraper(session):
+    scraper = LinkedInCompanyConnectionScraper({'li_at': session}, max_workers=1, requests_per_second=100)
+    scraper.max_retries = 2
+    scraper.rate_limiter.retry_base = 0.01
+    return scraper
+
+
+def test_throttled_fetch_backs_off_then_gives_up(linkedin):
+    linkedin.throttle_rate = 1.0
+    linkedin.retry_after = 0.05
+    scraper = throttled_scraper('throttled-fetch')
+
+    started = time.perf_counter()
+    with pytest.raises(ThrottledError):
+        scraper._fetch_search_page('AllCode', 0)
+
+    stats = scraper.rate_limiter.stats()
+    assert stats['throttled'] == 3
+    assert stats['requests_per_second'] < 100
+    # Each retry waited out the Retry-After
+    assert time.perf_counter() - started >= 0.1
+
+
+def test_throttled_page_ends_paging_with_partial_results(linkedin):
+    scraper = throttled_scraper('throttled-paging')
+    outcome = {}
+    pages = scraper._iter_search_pages('AllCode', 30, outcome)
+    assert len(next(pages)) == 10
+
+    linkedin.throttle_rate = 1.0
+    linkedin.retry_after = None
+    assert list(pages) == []
+    assert outcome['failed_page'] == 1
+    assert not outcome['exhausted']
+    assert 'error' in outcome
+
+
+def test_search_recovers_once_throttling_stops(linkedin):
+    scraper = throttled_scraper('recovers')
+    scraper.rate_limiter.record_throttle()
+    results = scraper.search_company_employees('AllCode', 100)
+    assert results['total_found'] == 30
+    assert results['exhausted']
+    assert results['failed_page'] is None
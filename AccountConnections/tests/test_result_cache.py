@@ -0,0 +1,90 @@
+"""Which cached search results answer which requests."""
+
+import pytest
+
+from result_cache import CacheEntry, ResultCache, parse_cache_control
+from scraping import LinkedInCompanyConnectionScraper
+from shared_cache import MemoryBackend
+
+COOKIES = {'li_at': 'result-cache'}
+
+
+@pytest.fixture
+def cache():
+    return ResultCache(ttl=60, backend=MemoryBackend())
+
+
+@pytest.fixture
+def scraper(linkedin):
+    return LinkedInCompanyConnectionScraper(COOKIES)
+
+
+def search(cache, scraper, company, limit):
+    return cache.get_or_search(COOKIES, company, limit, lambda: scraper.search_company_employees(company, limit))
+
+
+def test_covers():
+    cache = ResultCache(backend=MemoryBackend())
+    partial = CacheEntry(20, {'employees': [], 'exhausted': False})
+    exhausted = CacheEntry(100, {'employees': [], 'exhausted': True})
+    assert cache._covers(partial, 20)
+    assert cache._covers(partial, 10)
+    assert not cache._covers(partial, 21)
+    assert cache._covers(exhausted, 1000)
+
+
+def test_smaller_limit_is_sliced_from_a_larger_result(cache, scraper):
+    results, status = search(cache, scraper, 'AllCode', 20)
+    assert status == 'miss'
+    assert results['total_found'] == 20
+    assert not results['exhausted']
+
+    smaller = cache.get(COOKIES, 'AllCode', 10)
+    assert smaller['total_found'] == 10
+    assert smaller['employees'] == results['employees'][:10]
+    assert cache.get(COOKIES, 'AllCode', 25) is None
+
+
+def test_exhausted_result_answers_any_limit(cache, scraper):
+    results, _ = search(cache, scraper, 'AllCode', 100)
+    assert results['total_found'] == 30
+    assert results['exhausted']
+
+    larger = cache.get(COOKIES, 'AllCode', 500)
+    assert larger['total_found'] == 30
+    assert larger['exhausted']
+    # A slice that drops people is no longer every result
+    assert not cache.get(COOKIES, 'AllCode', 10)['exhausted']
+
+
+def test_spellings_share_an_entry_but_sessions_do_not(cache, scraper):
+    search(cache, scraper, 'AllCode', 20)
+    assert cache.get(COOKIES, 'allcode, Inc.', 20) is not None
+    assert cache.get({'li_at': 'someone-else'}, 'AllCode', 20) is None
+
+
+def test_failed_and_partial_results_are_not_cached(cache):
+    failed = {'error': 'boom', 'employees': []}
+    partial = {'employees': [{'name': 'A'}], 'total_found': 1, 'exhausted': False, 'failed_page': 1}
+    assert not cache.cacheable(failed)
+    assert not cache.cacheable(partial)
+
+    _, status = cache.get_or_search(COOKIES, 'Partial', 10, lambda: partial)
+    assert status == 'miss'
+    assert cache.get(COOKIES, 'Partial', 1) is None
+
+
+def test_cache_control_directives(cache, scraper):
+    assert parse_cache_control('no-store') == (True, True)
+    assert parse_cache_control('No-Cache, max-age=0') == (False, True)
+    assert parse_cache_control(None) == (False, False)
+
+    _, status = cache.get_or_search(COOKIES, 'AllCode', 10, lambda: scraper.search_company_employees('AllCode', 10),
+                                    'no-store')
+    assert status == 'bypass'
+    assert cache.get(COOKIES, 'AllCode', 10) is None
+
+    _, status = cache.get_or_search(COOKIES, 'AllCode', 10, lambda: scraper.search_company_employees('AllCode', 10),
+                                    'no-cache')
+    assert status == 'refresh'
+    assert cache.get(COOKIES, 'AllCode', 10) is not None
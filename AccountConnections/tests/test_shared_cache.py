@@ -0,0 +1,92 @@
+"""Single-flight get_or_compute() on every backend."""
+
+import threading
+import time
+
+import pytest
+
+from shared_cache import MemoryBackend, MmapBackend, SQLiteBackend, SharedCache
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'mmap'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryBackend()
+        return
+    if request.param == 'sqlite':
+        backend = SQLiteBackend(str(tmp_path / 'cache.db'))
+    else:
+        backend = MmapBackend(str(tmp_path / 'cache.mmap'), slots=16, slot_kb=4)
+    yield backend
+    backend.close()
+
+
+def test_concurrent_misses_compute_once(backend):
+    cache = SharedCache('test', backend, wait_timeout=10)
+    calls = []
+    statuses = []
+    barrier = threading.Barrier(6)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value'
+
+    def lookup():
+        barrier.wait()
+        value, status = cache.get_or_compute('key', compute, 60)
+        assert value == 'value'
+        statuses.append(status)
+
+    threads = [threading.Thread(target=lookup) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(statuses) == ['miss'] + ['shared'] * 5
+    assert cache.get_or_compute('key', compute, 60) == ('value', 'hit')
+
+
+def test_value_stored_while_taking_the_lock_is_reused(backend, monkeypatch):
+    cache = SharedCache('test', backend)
+    try_lock = backend.try_lock
+
+    def finish_then_lock(key, ttl):
+        # Another worker stores its result and unlocks just before we lock
+        backend.set(key, 'theirs', 60)
+        return try_lock(key, ttl)
+
+    monkeypatch.setattr(backend, 'try_lock', finish_then_lock)
+    assert cache.get_or_compute('key', lambda: 'ours', 60) == ('theirs', 'hit')
+
+
+def test_rejected_values_are_recomputed(backend):
+    cache = SharedCache('test', backend)
+    cache.set('key', 1, 60)
+    assert cache.get_or_compute('key', lambda: 2, 60, accept=lambda value: value >= 2) == (2, 'miss')
+    assert cache.get_or_compute('key', lambda: 3, 60, store=lambda value: False) == (2, 'hit')
+    assert cache.get_or_compute('other', lambda: 4, 60, store=lambda value: False) == (4, 'miss')
+    assert cache.get('other') is None
+
+
+def test_failed_compute_releases_the_lock(backend):
+    cache = SharedCache('test', backend, wait_timeout=5)
+
+    def fail():
+        raise RuntimeError('scrape failed')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('key', fail, 60)
+
+    started = time.monotonic()
+    assert cache.get_or_compute('key', lambda: 'value', 60) == ('value', 'miss')
+    assert time.monotonic() - started < 1
+
+
+def test_memory_backend_prunes_expired_locks():
+    backend = MemoryBackend(max_entries=4)
+    for i in range(20):
+        backend.try_lock(f'key{i}', -1)
+    assert len(backend._locks) <= 4